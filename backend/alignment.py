@@ -0,0 +1,70 @@
+"""Paragraph-to-line alignment for formatting-preserving DOCX output.
+
+The tailored resume comes back from the LLM as plain lines; to keep the
+original document's formatting each original paragraph is rewritten with the
+tailored line that best matches it.
+
+Both sides are tokenized once and the tailored lines are put in an inverted
+index (token -> lines), so each paragraph only looks at lines it actually
+shares words with. The assignment is one-to-one and order-aware: a tailored
+line is used for at most one paragraph, and among equally good matches the
+line closest after the previous match wins, since the LLM keeps the resume's
+order. Tokens shared by very many lines ("and", "the") carry no signal and are
+left out of the index lookup, which keeps the work proportional to document
+size.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Tokens appearing in more tailored lines than this are ignored when matching
+COMMON_TOKEN_LINES = 32
+
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct lowercase words, ignoring surrounding punctuation"""
+    return set(_TOKEN.findall(text.lower()))
+
+
+def align_lines(
+    paragraphs: Sequence[str],
+    lines: Sequence[str],
+    common_token_lines: int = COMMON_TOKEN_LINES,
+) -> List[Optional[int]]:
+    """Index into ``lines`` chosen for each paragraph, or None to leave it unchanged.
+
+    A paragraph is matched to the unused line sharing the most words with it;
+    ties go to the line nearest to (preferably after) the previous match.
+    """
+    index: Dict[str, List[int]] = defaultdict(list)
+    for line_number, line in enumerate(lines):
+        for token in tokenize(line):
+            index[token].append(line_number)
+
+    used = [False] * len(lines)
+    cursor = 0
+    assignment: List[Optional[int]] = []
+    for paragraph in paragraphs:
+        overlap: Dict[int, int] = defaultdict(int)
+        for token in tokenize(paragraph):
+            postings = index.get(token)
+            if not postings or len(postings) > common_token_lines:
+                continue
+            for line_number in postings:
+                if not used[line_number]:
+                    overlap[line_number] += 1
+
+        if not overlap:
+            assignment.append(None)
+            continue
+
+        best = max(
+            overlap,
+            key=lambda n: (overlap[n], n >= cursor, -abs(n - cursor)),
+        )
+        used[best] = True
+        cursor = best + 1
+        assignment.append(best)
+    return assignment
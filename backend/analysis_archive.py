@@ -0,0 +1,329 @@
+"""Retention for resume analyses: cold archival to local files and restore.
+
+The archiver moves analyses whose ``created_at`` is older than
+``ANALYSIS_ARCHIVE_AFTER_DAYS`` out of ``resume_analyses`` into gzip-compressed
+JSONL files, one file per batch. Each batch is written to a temporary file,
+fsynced and renamed before its records are deleted, so a crash can at worst
+leave a record both archived and still in the collection (restore is
+idempotent, keyed on ``id``). Documents are serialized with
+``bson.json_util`` so binary (compressed) fields, ObjectIds and dates
+round-trip exactly.
+
+Restored analyses get ``restored_at`` and are skipped by later archive runs.
+
+Separately, ``ANALYSIS_TTL_DAYS`` gives new analyses an ``expires_at`` so the
+TTL index on that field deletes them outright; use it when old analyses are
+not worth keeping at all.
+
+Analyses reference shared documents by content hash: the uploaded DOCX and
+rendered download in ``resume_blobs`` and the text in ``job_descriptions``.
+Each archived record carries copies of its original DOCX and job description
+(``archived_resume_blob``, ``archived_job_description``), which restore puts
+back. After archival and TTL deletes, ``sweep_orphans`` deletes blobs and job
+descriptions no remaining analysis references. A request or job that is
+about to create a reference first stamps the document as used (``stored_at``
+on blobs, ``last_used_at`` on job descriptions), and only documents unused for
+``ANALYSIS_ORPHAN_GRACE_HOURS`` are swept, so work in flight keeps what it
+needs. A resume swept after its upload went unused is simply uploaded again
+(the tailoring endpoints answer 404 "please re-upload"); a job description is
+written back by the next request that resolves it. The rendered download is
+not archived: after a restore it is rendered again on first download.
+
+Run from the backend directory:
+
+    python analysis_archive.py archive [--older-than-days N]
+    python analysis_archive.py restore FILE [FILE ...] [--id ANALYSIS_ID ...]
+    python analysis_archive.py list
+    python analysis_archive.py sweep
+"""
+import asyncio
+import glob
+import gzip
+import logging
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import json_util
+
+from blob_store import BLOB_REFERENCE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATTERN = "analyses-*.jsonl.gz"
+ARCHIVED_BLOB_FIELD = "archived_resume_blob"
+ARCHIVED_JOB_DESCRIPTION_FIELD = "archived_job_description"
+
+
+def analysis_expiry() -> Optional[datetime]:
+    """``expires_at`` for a new analysis, or None when ANALYSIS_TTL_DAYS is unset/0"""
+    ttl_days = float(os.environ.get('ANALYSIS_TTL_DAYS', 0))
+    if ttl_days <= 0:
+        return None
+    return datetime.now(timezone.utc) + timedelta(days=ttl_days)
+
+
+def read_archive(path: str) -> Iterable[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            if line.strip():
+                yield json_util.loads(line)
+
+
+class AnalysisArchiver:
+    """
+    Configuration (environment variables, overridable via constructor):
+        ANALYSIS_ARCHIVE_AFTER_DAYS       age at which analyses are archived, 0 to disable (default: 0)
+        ANALYSIS_ARCHIVE_DIR              directory for archive files (default: ./analysis_archive)
+        ANALYSIS_ARCHIVE_BATCH_SIZE       records per archive file (default: 1000)
+        ANALYSIS_ARCHIVE_INTERVAL_SECONDS time between background runs (default: 3600)
+        ANALYSIS_ORPHAN_GRACE_HOURS       time since a blob or job description was last used before
+                                          the orphan sweep may delete it; must exceed the longest
+                                          request and the job lease, JOB_LEASE_SECONDS (default: 24)
+
+    ``blobs`` and ``job_descriptions`` are the collections analyses reference;
+    without them records are archived alone and nothing is swept. The
+    background loop archives (when enabled) and then sweeps; it runs when
+    archival or ANALYSIS_TTL_DAYS is configured, since those are what delete
+    analyses. Enable it on one worker only; concurrent archivers would write
+    the same records to separate files.
+    """
+
+    def __init__(
+        self,
+        collection,
+        archive_after_days: Optional[float] = None,
+        archive_dir: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+        blobs=None,
+        job_descriptions=None,
+        orphan_grace_hours: Optional[float] = None,
+    ):
+        self.collection = collection
+        self.blobs = blobs
+        self.job_descriptions = job_descriptions
+        self.archive_after_days = archive_after_days if archive_after_days is not None else float(
+            os.environ.get('ANALYSIS_ARCHIVE_AFTER_DAYS', 0)
+        )
+        self.archive_dir = archive_dir or os.environ.get('ANALYSIS_ARCHIVE_DIR', 'analysis_archive')
+        self.batch_size = batch_size if batch_size is not None else int(
+            os.environ.get('ANALYSIS_ARCHIVE_BATCH_SIZE', 1000)
+        )
+        self.interval_seconds = interval_seconds if interval_seconds is not None else float(
+            os.environ.get('ANALYSIS_ARCHIVE_INTERVAL_SECONDS', 3600)
+        )
+        self.orphan_grace_hours = orphan_grace_hours if orphan_grace_hours is not None else float(
+            os.environ.get('ANALYSIS_ORPHAN_GRACE_HOURS', 24)
+        )
+        # A job holds its resume and job description for up to its lease without stamping them again
+        job_lease_hours = float(os.environ.get('JOB_LEASE_SECONDS', 600)) / 3600
+        if self.orphan_grace_hours <= job_lease_hours:
+            raise ValueError(f"ANALYSIS_ORPHAN_GRACE_HOURS must exceed the job lease ({job_lease_hours:g} hours)")
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.archive_after_days > 0
+
+    @property
+    def sweep_enabled(self) -> bool:
+        return self.blobs is not None and (self.enabled or analysis_expiry() is not None)
+
+    def _write_batch(self, docs: List[Dict[str, Any]]) -> str:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.archive_dir, f"analyses-{stamp}-{uuid.uuid4().hex[:8]}.jsonl.gz")
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+                for doc in docs:
+                    archive.write(json_util.dumps(doc).encode("utf-8"))
+                    archive.write(b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, path)
+        return path
+
+    async def archive_once(self, older_than_days: Optional[float] = None) -> Dict[str, Any]:
+        """Archive every analysis older than the cutoff, one file per batch"""
+        days = older_than_days if older_than_days is not None else self.archive_after_days
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        query = {"created_at": {"$lt": cutoff}, "restored_at": {"$exists": False}}
+        archived, files = 0, []
+        while True:
+            docs = await self.collection.find(query).sort(
+                [("created_at", 1), ("id", 1)]
+            ).limit(self.batch_size).to_list(length=None)
+            if not docs:
+                break
+            await self._attach_references(docs)
+            # File I/O off the event loop; records are only deleted once the file is durable
+            path = await asyncio.get_running_loop().run_in_executor(None, self._write_batch, docs)
+            await self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+            archived += len(docs)
+            files.append(path)
+            logger.info("Archived %d analyses to %s", len(docs), path)
+        return {"archived": archived, "files": files, "cutoff": cutoff}
+
+    async def _attach_references(self, docs: List[Dict[str, Any]]):
+        """Copy each analysis's original DOCX and job description into its archive record"""
+        if self.blobs is not None:
+            ids = list({doc["resume_id"] for doc in docs if doc.get("resume_id")})
+            blobs = {blob["_id"]: blob async for blob in self.blobs.find({"_id": {"$in": ids}})}
+            for doc in docs:
+                if doc.get("resume_id") in blobs:
+                    doc[ARCHIVED_BLOB_FIELD] = blobs[doc["resume_id"]]
+        if self.job_descriptions is not None:
+            ids = list({doc["job_description_id"] for doc in docs if doc.get("job_description_id")})
+            jds = {jd["_id"]: jd async for jd in self.job_descriptions.find({"_id": {"$in": ids}})}
+            for doc in docs:
+                if doc.get("job_description_id") in jds:
+                    doc[ARCHIVED_JOB_DESCRIPTION_FIELD] = jds[doc["job_description_id"]]
+
+    async def _restore_references(self, doc: Dict[str, Any]):
+        """Put an archived record's DOCX and job description back unless they already exist"""
+        for field, target in ((ARCHIVED_BLOB_FIELD, self.blobs),
+                              (ARCHIVED_JOB_DESCRIPTION_FIELD, self.job_descriptions)):
+            referenced = doc.pop(field, None)
+            if referenced is not None and target is not None:
+                referenced_id = referenced.pop("_id")
+                await target.update_one({"_id": referenced_id}, {"$setOnInsert": referenced}, upsert=True)
+
+    async def _unreferenced(self, ids: List[str], fields) -> List[str]:
+        referenced = set()
+        for field in fields:
+            referenced.update(await self.collection.distinct(field, {field: {"$in": ids}}))
+        return [doc_id for doc_id in ids if doc_id not in referenced]
+
+    async def sweep_orphans(self) -> Dict[str, int]:
+        """Delete old blobs and job descriptions that no analysis references any more"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=self.orphan_grace_hours)).isoformat()
+        deleted = {"blobs": 0, "job_descriptions": 0}
+        for name, target, fields, used_at in (
+            ("blobs", self.blobs, BLOB_REFERENCE_FIELDS, "stored_at"),
+            ("job_descriptions", self.job_descriptions, ("job_description_id",), "last_used_at"),
+        ):
+            if target is None:
+                continue
+            # Documents written before the use stamp was added only have created_at
+            cursor = target.find({"$or": [
+                {used_at: {"$lt": cutoff}},
+                {used_at: {"$exists": False}, "created_at": {"$lt": cutoff}},
+            ]}, {"_id": 1}).sort("_id", 1)
+            batch = []
+            async for doc in cursor:
+                batch.append(doc["_id"])
+                if len(batch) >= self.batch_size:
+                    deleted[name] += await self._delete_unreferenced(target, batch, fields)
+                    batch = []
+            if batch:
+                deleted[name] += await self._delete_unreferenced(target, batch, fields)
+        if any(deleted.values()):
+            logger.info("Swept %d orphaned blobs and %d job descriptions", deleted["blobs"],
+                        deleted["job_descriptions"])
+        return deleted
+
+    async def _delete_unreferenced(self, target, ids: List[str], fields) -> int:
+        orphans = await self._unreferenced(ids, fields)
+        if not orphans:
+            return 0
+        result = await target.delete_many({"_id": {"$in": orphans}})
+        return result.deleted_count
+
+    async def restore(self, paths: Iterable[str], analysis_ids: Optional[Iterable[str]] = None) -> int:
+        """Copy archived analyses back into the collection (all, or only ``analysis_ids``)"""
+        from pymongo import ReplaceOne
+
+        wanted = set(analysis_ids) if analysis_ids else None
+        restored_at = datetime.now(timezone.utc).isoformat()
+        restored = 0
+        for path in paths:
+            batch = []
+            for doc in read_archive(path):
+                if wanted is not None and doc.get("id") not in wanted:
+                    continue
+                doc["restored_at"] = restored_at
+                doc.pop("expires_at", None)
+                await self._restore_references(doc)
+                batch.append(ReplaceOne({"id": doc["id"]}, doc, upsert=True))
+                if len(batch) >= self.batch_size:
+                    await self.collection.bulk_write(batch, ordered=False)
+                    restored += len(batch)
+                    batch = []
+            if batch:
+                await self.collection.bulk_write(batch, ordered=False)
+                restored += len(batch)
+        return restored
+
+    def archive_files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.archive_dir, ARCHIVE_PATTERN)))
+
+    def start(self):
+        if (self.enabled or self.sweep_enabled) and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                if self.enabled:
+                    await self.archive_once()
+                if self.sweep_enabled:
+                    await self.sweep_orphans()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Analysis archival failed: %s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Archive old resume analyses to gzip JSONL, or restore them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="move old analyses to archive files")
+    archive.add_argument("--older-than-days", type=float, help="default: ANALYSIS_ARCHIVE_AFTER_DAYS")
+    restore = commands.add_parser("restore", help="copy archived analyses back into the collection")
+    restore.add_argument("files", nargs="+")
+    restore.add_argument("--id", dest="ids", action="append", help="restore only this analysis (repeatable)")
+    commands.add_parser("list", help="list archive files")
+    commands.add_parser("sweep", help="delete blobs and job descriptions no analysis references")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    load_dotenv()
+    db = AsyncIOMotorClient(os.environ.get('MONGO_URL')).career_assistant
+    archiver = AnalysisArchiver(db.resume_analyses, blobs=db.resume_blobs, job_descriptions=db.job_descriptions)
+
+    if args.command == "list":
+        for path in archiver.archive_files():
+            print(path)
+    elif args.command == "archive":
+        days = args.older_than_days if args.older_than_days is not None else archiver.archive_after_days
+        if days <= 0:
+            parser.error("set --older-than-days or ANALYSIS_ARCHIVE_AFTER_DAYS")
+        result = asyncio.run(archiver.archive_once(days))
+        print(f"archived {result['archived']} analyses created before {result['cutoff']} "
+              f"into {len(result['files'])} files")
+    elif args.command == "sweep":
+        deleted = asyncio.run(archiver.sweep_orphans())
+        print(f"deleted {deleted['blobs']} blobs and {deleted['job_descriptions']} job descriptions")
+    else:
+        print(f"restored {asyncio.run(archiver.restore(args.files, args.ids))} analyses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+"""Deterministic local ATS scoring.
+
+Scores a resume against a job description without any network call:
+
+1. Keywords and short phrases are extracted from the job description.
+   Unigrams and bigrams that don't cross stopwords or punctuation are
+   weighted by frequency, and by the section they appear in: requirements
+   count more than nice-to-haves, and "About us" boilerplate counts less.
+2. Each keyword is looked up in the resume. The credit depends on the resume
+   section it was found in, so a skill backed by experience counts more than
+   one that is only mentioned under education.
+3. The score is the weighted share of keyword credit, normalized to 0-100.
+
+The same inputs always give the same score, keywords and suggestions.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#]*(?:[./-][A-Za-z0-9+#]+)*")
+# Characters that end a phrase: two keywords on either side never form a bigram
+_PHRASE_BREAK = re.compile(r"[,;:()\[\]\n•|!?]|\.\s|\s-\s")
+
+STOPWORDS = frozenset("""
+a about above across after again against all also an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc every for from
+further had has have having he her here hers him his how i if in into is it its itself just least
+less like may me might more most must my no nor not now of off on once only or other our ours out
+over own per plus same she should so some such than that the their theirs them then there these
+they this those through to too under until up upon us very via was we well were what when where
+which while who whom why will with within without would you your yours
+ability able across apply applicant applicants benefits bonus candidate candidates closely company
+competitive culture day degree deliver demonstrated description desired develop environment equal
+excellent experience experienced familiarity familiar etc good great help highly ideal include
+includes including join key knowledge looking manage new nice opportunity passion passionate
+plus position preferred proficiency proficient proven qualifications related required requirement
+requirements responsibilities responsible role seeking skill skills strong team teams understanding
+using work working world year years
+build building collaborate create design designing drive implement implementing improve lead
+maintain mentor optimize support
+""".split())
+
+# Job-description section headings and how much their keywords count
+JD_SECTION_WEIGHTS = (
+    (re.compile(r"\b(required|requirements|must[- ]have|qualifications|what you.?ll need|minimum)\b", re.I), 1.5),
+    (re.compile(r"\b(nice[- ]to[- ]have|preferred|bonus|plus|desired)\b", re.I), 0.75),
+    (re.compile(r"\b(about us|about the company|benefits|perks|why join|equal opportunity)\b", re.I), 0.25),
+    (re.compile(r"\b(responsibilities|what you.?ll do|duties|the role)\b", re.I), 1.0),
+)
+
+# Resume section headings and the credit a keyword found there earns
+RESUME_SECTION_CREDIT = (
+    (re.compile(r"\b(experience|employment|work history|projects?)\b", re.I), 1.0),
+    (re.compile(r"\b(skills|technical|technologies|competencies|tools)\b", re.I), 0.9),
+    (re.compile(r"\b(summary|profile|objective|about)\b", re.I), 0.85),
+    (re.compile(r"\b(education|certifications?|training|courses?)\b", re.I), 0.7),
+)
+DEFAULT_RESUME_CREDIT = 0.8
+
+MAX_KEYWORDS = 40
+MAX_MISSING_REPORTED = 15
+
+
+class Keyword(NamedTuple):
+    term: str      # normalized form used for matching
+    display: str   # first spelling seen in the job description
+    weight: float
+
+
+def normalize_token(token: str) -> str:
+    """Lowercase and fold simple plurals so 'APIs' matches 'API'"""
+    token = token.lower().rstrip('.')
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss') and token[-2].isalpha():
+        token = token[:-1]
+    return token
+
+
+def _is_heading(line: str) -> bool:
+    words = line.split()
+    return 0 < len(words) <= 6 and (line.rstrip().endswith(':') or line.isupper() or len(words) <= 3)
+
+
+def _inline_heading_value(line: str, section_patterns):
+    """Value for a line opening with a heading, as in "Nice to have: GraphQL"; None otherwise"""
+    prefix, colon, rest = line.partition(':')
+    if not colon or not rest.strip() or not _is_heading(prefix + colon):
+        return None
+    # The heading must open the line, so "Experience with Go required: 5 years" stays body text
+    for pattern, pattern_value in section_patterns:
+        match = pattern.search(prefix)
+        if match and match.start() == 0:
+            return pattern_value
+    return None
+
+
+def split_sections(text: str, section_patterns, default) -> List[Tuple[float, str]]:
+    """Split text into (section value, segment) pairs based on heading lines and inline headings"""
+    sections = []
+    current_value = default
+    current_lines: List[str] = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        value = None
+        if _is_heading(stripped):
+            for pattern, pattern_value in section_patterns:
+                if pattern.search(stripped):
+                    value = pattern_value
+                    break
+        else:
+            value = _inline_heading_value(stripped, section_patterns)
+        if value is not None:
+            if current_lines:
+                sections.append((current_value, '\n'.join(current_lines)))
+            current_value, current_lines = value, [line]
+        else:
+            current_lines.append(line)
+    if current_lines:
+        sections.append((current_value, '\n'.join(current_lines)))
+    return sections
+
+
+def iter_phrases(text: str):
+    """Yield runs of (normalized, original) tokens that may form phrases"""
+    for chunk in _PHRASE_BREAK.split(text):
+        run = []
+        for match in _TOKEN.finditer(chunk):
+            token = match.group(0)
+            normalized = normalize_token(token)
+            # Check the unfolded form too: "qualifications" folds to "qualification"
+            if (normalized in STOPWORDS or token.lower().rstrip('.') in STOPWORDS or not any(ch.isalpha() for ch in normalized)
+                    or len(normalized) < 2 and normalized not in ('c', 'r')):
+                if run:
+                    yield run
+                run = []
+                continue
+            run.append((normalized, token.rstrip('.')))
+        if run:
+            yield run
+
+
+def text_terms(text: str) -> set:
+    """All unigram and bigram terms in ``text``, for matching"""
+    terms = set()
+    for run in iter_phrases(text):
+        for i, (normalized, _) in enumerate(run):
+            terms.add(normalized)
+            if i + 1 < len(run):
+                terms.add(f"{normalized} {run[i + 1][0]}")
+    return terms
+
+
+def extract_keywords(job_description: str, limit: int = MAX_KEYWORDS) -> List[Keyword]:
+    """Weighted keywords and phrases from a job description, highest weight first"""
+    weights: Dict[str, float] = {}
+    displays: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    for section_weight, segment in split_sections(job_description, JD_SECTION_WEIGHTS, 1.0):
+        for run in iter_phrases(segment):
+            for i, (normalized, original) in enumerate(run):
+                grams = [(normalized, original)]
+                if i + 1 < len(run):
+                    grams.append((f"{normalized} {run[i + 1][0]}", f"{original} {run[i + 1][1]}"))
+                for term, display in grams:
+                    weights[term] = weights.get(term, 0.0) + section_weight
+                    counts[term] = counts.get(term, 0) + 1
+                    displays.setdefault(term, display)
+
+    # A bigram seen once is usually incidental wording; keep repeated ones and
+    # capitalized names such as "Machine Learning" or "REST API"
+    candidates = [
+        term for term in weights
+        if ' ' not in term or counts[term] > 1 or all(word[0].isupper() for word in displays[term].split())
+    ]
+    # Phrases sort ahead of equally weighted unigrams so they can absorb them
+    candidates.sort(key=lambda term: (-weights[term], ' ' not in term, term))
+
+    keywords: List[Keyword] = []
+    selected = set()
+    for term in candidates:
+        if len(keywords) >= limit:
+            break
+        # Skip a unigram already covered by a selected phrase with at least its weight
+        if ' ' not in term and any(term in phrase.split() and weights[phrase] >= weights[term] for phrase in selected):
+            continue
+        keywords.append(Keyword(term, displays[term], round(weights[term], 4)))
+        selected.add(term)
+    return keywords
+
+
+def section_term_credits(sections: List[Tuple[float, str]]) -> Dict[str, float]:
+    """Best section credit earned by each term across (credit, segment) sections"""
+    credits: Dict[str, float] = {}
+    for credit, segment in sections:
+        for term in text_terms(segment):
+            if credit > credits.get(term, 0.0):
+                credits[term] = credit
+    return credits
+
+
+def resume_term_credits(resume_text: str) -> Dict[str, float]:
+    """Map every term in a resume to the credit a matching keyword would earn"""
+    return section_term_credits(split_sections(resume_text, RESUME_SECTION_CREDIT, DEFAULT_RESUME_CREDIT))
+
+
+def score_resume(
+    resume_text: str,
+    job_description: str,
+    keywords: Optional[List[Keyword]] = None
+) -> Dict[str, object]:
+    """Score ``resume_text`` against ``job_description`` (or precomputed ``keywords``).
+
+    Returns a dict with the ``ATSAnalysis`` fields: score, suggestions,
+    keyword_matches and missing_keywords.
+    """
+    if keywords is None:
+        keywords = extract_keywords(job_description)
+
+    sections = split_sections(resume_text, RESUME_SECTION_CREDIT, DEFAULT_RESUME_CREDIT)
+    credits = section_term_credits(sections)
+
+    earned = 0.0
+    total = 0.0
+    matches: List[Keyword] = []
+    missing: List[Keyword] = []
+    for keyword in keywords:
+        total += keyword.weight
+        credit = credits.get(keyword.term, 0.0)
+        if credit:
+            earned += keyword.weight * credit
+            matches.append(keyword)
+        else:
+            missing.append(keyword)
+
+    score = int(round(100 * earned / total)) if total else 0
+    score = max(0, min(100, score))
+    return {
+        "score": score,
+        "suggestions": build_suggestions(resume_text, len(sections), missing),
+        "keyword_matches": [k.display for k in matches],
+        "missing_keywords": [k.display for k in missing[:MAX_MISSING_REPORTED]],
+    }
+
+
+def build_suggestions(resume_text: str, section_count: int, missing: List[Keyword]) -> List[str]:
+    suggestions = []
+    if missing:
+        top = ', '.join(k.display for k in missing[:5])
+        suggestions.append(f"Add evidence of these job requirements where you have them: {top}")
+    if not re.search(r"\d+\s*(%|percent|\+|x\b|k\b|m\b)|\$\s*\d", resume_text, re.I):
+        suggestions.append("Quantify achievements with numbers (percentages, revenue, users, time saved)")
+    lowered = resume_text.lower()
+    if 'skills' not in lowered:
+        suggestions.append("Add a dedicated Skills section so ATS parsers can find your core competencies")
+    if section_count < 3:
+        suggestions.append("Use clear section headings (Summary, Experience, Skills, Education)")
+    if not suggestions:
+        suggestions.append("Strong keyword alignment; tailor bullet points to mirror the job's wording")
+    return suggestions
@@ -0,0 +1,75 @@
+"""Content-addressed storage for resume DOCX files.
+
+Each upload is stored once in the ``resume_blobs`` collection under the
+SHA-256 of its bytes, which doubles as the ``resume_id`` handed to the
+client. Analyses reference the blob by that id instead of embedding a base64
+copy, so tailoring one resume against many jobs costs no extra storage.
+Rendered downloads are stored the same way, and their hash serves as the
+download ETag.
+
+Blobs live as long as an analysis references them (``resume_id`` or
+``rendered_docx_id``). A download replaced by a re-render is released right
+away with ``delete_unreferenced``. ``stored_at`` records the latest upload or
+tailoring request that used a blob; the orphan sweep in analysis_archive
+leaves recently used blobs alone even before an analysis references them.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from bson.binary import Binary
+
+# Analysis fields that hold blob ids
+BLOB_REFERENCE_FIELDS = ("resume_id", "rendered_docx_id")
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResumeBlobStore:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def put(self, content: bytes) -> str:
+        """Store ``content`` if it isn't already present and return its resume_id"""
+        resume_id = content_hash(content)
+        now = datetime.now(timezone.utc).isoformat()
+        await self.collection.update_one(
+            {"_id": resume_id},
+            {
+                "$setOnInsert": {"content": Binary(content), "size": len(content), "created_at": now},
+                # Re-uploading an old resume restarts the orphan sweep's grace period
+                "$set": {"stored_at": now},
+            },
+            upsert=True,
+        )
+        return resume_id
+
+    async def get(self, resume_id: str) -> Optional[bytes]:
+        blob = await self.collection.find_one({"_id": resume_id}, {"content": 1})
+        if not blob:
+            return None
+        return bytes(blob["content"])
+
+    async def touch(self, resume_id: str) -> bool:
+        """Mark a blob as in use by a request, restarting the orphan sweep's grace period.
+
+        Returns False if it doesn't exist.
+        """
+        result = await self.collection.update_one(
+            {"_id": resume_id}, {"$set": {"stored_at": datetime.now(timezone.utc).isoformat()}}
+        )
+        return result.matched_count > 0
+
+    async def delete_unreferenced(self, blob_id: str, analyses, fields: Tuple[str, ...] = BLOB_REFERENCE_FIELDS) -> bool:
+        """Delete ``blob_id`` unless an analysis in ``analyses`` still references it.
+
+        A render racing this check may store the same bytes again just before
+        the delete; the download notices the missing blob and renders again.
+        """
+        for field in fields:
+            if await analyses.count_documents({field: blob_id}, limit=1):
+                return False
+        result = await self.collection.delete_one({"_id": blob_id})
+        return result.deleted_count > 0
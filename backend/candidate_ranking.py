@@ -0,0 +1,111 @@
+"""Bulk candidate ranking against a single job description.
+
+Scoring N resumes with ``ats_scorer.score_resume`` one at a time repeats the
+per-keyword loop N times. Here every resume becomes one row of a sparse
+candidates x keywords matrix whose values are the section credits from
+``ats_scorer.resume_term_credits``, and all scores come from a single
+sparse matrix-vector product with the keyword weights. The scores are the
+same as ``score_resume`` would give.
+
+Building rows (tokenizing resumes) is the expensive part and is independent
+per resume, so ``candidate_term_rows`` works on chunks that callers can fan
+out across processes; ``build_term_matrix`` stacks the chunks.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ats_scorer import Keyword, extract_keywords, resume_term_credits
+
+RowChunk = Tuple[np.ndarray, np.ndarray, np.ndarray]  # CSR indptr, indices, data
+
+
+def keyword_vocabulary(keywords: Sequence[Keyword]) -> Tuple[List[str], np.ndarray]:
+    terms = [k.term for k in keywords]
+    weights = np.array([k.weight for k in keywords], dtype=np.float64)
+    return terms, weights
+
+
+def candidate_term_rows(texts: Sequence[str], terms: Sequence[str]) -> RowChunk:
+    """CSR components for ``texts`` against the keyword ``terms`` (picklable for process pools)"""
+    column = {term: index for index, term in enumerate(terms)}
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for text in texts:
+        for term, credit in resume_term_credits(text).items():
+            index = column.get(term)
+            if index is not None:
+                indices.append(index)
+                data.append(credit)
+        indptr.append(len(indices))
+    return (
+        np.array(indptr, dtype=np.int64),
+        np.array(indices, dtype=np.int32),
+        np.array(data, dtype=np.float64),
+    )
+
+
+def build_term_matrix(chunks: Sequence[RowChunk], n_terms: int) -> sparse.csr_matrix:
+    blocks = [
+        sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_terms))
+        for indptr, indices, data in chunks
+    ]
+    if not blocks:
+        return sparse.csr_matrix((0, n_terms))
+    return sparse.vstack(blocks, format="csr")
+
+
+def score_term_matrix(matrix: sparse.csr_matrix, weights: np.ndarray) -> np.ndarray:
+    """0-100 integer scores for every row, identical to ats_scorer.score_resume"""
+    total = weights.sum()
+    if total <= 0:
+        return np.zeros(matrix.shape[0], dtype=np.int64)
+    scores = np.rint(100 * (matrix @ weights) / total)
+    return np.clip(scores, 0, 100).astype(np.int64)
+
+
+def shortlist(
+    candidate_ids: Sequence[str],
+    matrix: sparse.csr_matrix,
+    keywords: Sequence[Keyword],
+    top_k: Optional[int] = None,
+    max_missing: int = 15,
+) -> List[Dict[str, object]]:
+    """Candidates sorted by score (ties keep input order) with matched/missing keywords"""
+    _, weights = keyword_vocabulary(keywords)
+    scores = score_term_matrix(matrix, weights)
+    # Stable sort on the negated score keeps submission order among equal scores
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    results = []
+    for rank, row in enumerate(order, start=1):
+        matched = set(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]].tolist())
+        results.append({
+            "rank": rank,
+            "candidate_id": candidate_ids[row],
+            "score": int(scores[row]),
+            "keyword_matches": [k.display for i, k in enumerate(keywords) if i in matched],
+            "missing_keywords": [k.display for i, k in enumerate(keywords) if i not in matched][:max_missing],
+        })
+    return results
+
+
+def rank_candidates(
+    job_description: str,
+    candidates: Sequence[Tuple[str, str]],
+    top_k: Optional[int] = None,
+    keywords: Optional[List[Keyword]] = None,
+    chunk_size: int = 1000,
+) -> List[Dict[str, object]]:
+    """Rank ``(candidate_id, resume_text)`` pairs against ``job_description`` in-process"""
+    if keywords is None:
+        keywords = extract_keywords(job_description)
+    terms, _ = keyword_vocabulary(keywords)
+    texts = [text for _, text in candidates]
+    chunks = [candidate_term_rows(texts[i:i + chunk_size], terms) for i in range(0, len(texts), chunk_size)]
+    matrix = build_term_matrix(chunks, len(terms))
+    return shortlist([candidate_id for candidate_id, _ in candidates], matrix, keywords, top_k)
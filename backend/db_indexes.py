@@ -0,0 +1,204 @@
+"""Declared MongoDB indexes and the startup routine that ensures them.
+
+Every index the backend relies on is listed in ``DECLARED_INDEXES`` so the
+schema lives in one place. ``ensure_indexes`` creates any that are missing at
+startup (``create_index`` is a no-op for indexes that already exist) and logs
+build progress for long builds; ``verify_indexes`` compares the declaration
+with what the database actually has.
+
+Run from the backend directory to check or migrate a deployment:
+
+    python db_indexes.py verify
+    python db_indexes.py migrate [--rebuild-conflicting]
+
+``verify`` exits non-zero when an index is missing or differs from its
+declaration. ``migrate`` creates missing indexes and, with
+``--rebuild-conflicting``, drops and recreates ones whose options differ.
+"""
+import asyncio
+import logging
+import os
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Index options compared by verify_indexes
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+class IndexSpec(NamedTuple):
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    options: Mapping[str, Any] = MappingProxyType({})  # Read-only: the default is shared by every spec
+    purpose: str = ""
+
+    @property
+    def name(self) -> str:
+        # Mongo's default naming, so indexes created elsewhere are recognised
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+DECLARED_INDEXES: List[IndexSpec] = [
+    IndexSpec("resume_analyses", (("id", 1),), {"unique": True},
+              "download, status and detail lookups by analysis id"),
+    IndexSpec("resume_analyses", (("created_at", -1), ("id", -1), ("ats_score", 1)), {},
+              "newest-first listing, keyset cursor and score filters"),
+    IndexSpec("resume_analyses", (("resume_id", 1),), {},
+              "analyses sharing one uploaded resume (content hash)"),
+    IndexSpec("resume_analyses", (("rendered_docx_id", 1),), {},
+              "reference check before deleting a replaced rendered download"),
+    IndexSpec("resume_analyses", (("job_description_id", 1),), {},
+              "analyses tailored for one job description (normalized content hash)"),
+    IndexSpec("resume_analyses", (("expires_at", 1),), {"expireAfterSeconds": 0},
+              "TTL expiry of analyses saved with ANALYSIS_TTL_DAYS set"),
+    IndexSpec("tailor_jobs", (("id", 1),), {"unique": True},
+              "job status polling"),
+    IndexSpec("tailor_jobs", (("status", 1), ("created_at", 1)), {},
+              "workers claiming the oldest queued job"),
+    IndexSpec("tailor_jobs", (("expires_at", 1),), {"expireAfterSeconds": 0},
+              "TTL expiry of finished jobs after JOB_RETENTION_SECONDS"),
+    IndexSpec("llm_cache", (("expires_at", 1),), {"expireAfterSeconds": 0},
+              "TTL expiry of shared LLM cache entries"),
+]
+
+
+async def index_build_progress(db) -> List[Dict[str, Any]]:
+    """In-progress index builds reported by $currentOp (empty if unavailable)"""
+    try:
+        cursor = db.client.admin.aggregate([
+            {"$currentOp": {"allUsers": True, "idleConnections": False}},
+            {"$match": {"command.createIndexes": {"$exists": True}}},
+        ])
+        ops = await cursor.to_list(length=None)
+    except Exception:
+        return []
+    return [
+        {
+            "collection": op["command"]["createIndexes"],
+            "message": op.get("msg", ""),
+            "progress": op.get("progress", {}),
+            "seconds_running": op.get("secs_running"),
+        }
+        for op in ops
+    ]
+
+
+async def _create(db, spec: IndexSpec, progress_interval: float):
+    build = asyncio.ensure_future(
+        db[spec.collection].create_index(list(spec.keys), name=spec.name, **spec.options)
+    )
+    while True:
+        done, _ = await asyncio.wait({build}, timeout=progress_interval)
+        if done:
+            return build.result()
+        for op in await index_build_progress(db):
+            if op["collection"] == spec.collection:
+                progress = op["progress"]
+                logger.info(
+                    "Building index %s.%s: %s (%s/%s)", spec.collection, spec.name,
+                    op["message"], progress.get("done", "?"), progress.get("total", "?"),
+                )
+
+
+async def ensure_indexes(db, specs: Optional[List[IndexSpec]] = None, progress_interval: float = 5.0) -> List[str]:
+    """Create any declared index that is missing; returns the names that failed"""
+    failed = []
+    for spec in specs if specs is not None else DECLARED_INDEXES:
+        try:
+            await _create(db, spec, progress_interval)
+        except Exception as e:
+            logger.warning("Could not ensure index %s.%s: %s", spec.collection, spec.name, e)
+            failed.append(f"{spec.collection}.{spec.name}")
+    return failed
+
+
+def _index_options(info: Dict[str, Any]) -> Dict[str, Any]:
+    return {option: info[option] for option in COMPARED_OPTIONS if option in info}
+
+
+async def verify_indexes(db, specs: Optional[List[IndexSpec]] = None) -> List[Dict[str, Any]]:
+    """Compare declared indexes with the database.
+
+    Each entry has ``collection``, ``name`` and ``status``: "ok", "missing",
+    "conflict" (same name, different keys or options) or "undeclared" (present
+    in the database but not declared; reported only, never dropped).
+    """
+    specs = specs if specs is not None else DECLARED_INDEXES
+    report = []
+    existing_by_collection: Dict[str, Dict[str, Any]] = {}
+    for collection in sorted({spec.collection for spec in specs}):
+        try:
+            existing_by_collection[collection] = await db[collection].index_information()
+        except Exception:
+            existing_by_collection[collection] = {}  # Collection doesn't exist yet
+
+    for spec in specs:
+        info = existing_by_collection[spec.collection].get(spec.name)
+        entry = {"collection": spec.collection, "name": spec.name, "purpose": spec.purpose}
+        if info is None:
+            entry["status"] = "missing"
+        elif [tuple(key) for key in info["key"]] != list(spec.keys) or _index_options(info) != dict(spec.options):
+            entry["status"] = "conflict"
+            entry["found"] = {"key": [tuple(key) for key in info["key"]], **_index_options(info)}
+        else:
+            entry["status"] = "ok"
+        report.append(entry)
+
+    declared = {(spec.collection, spec.name) for spec in specs}
+    for collection, indexes in existing_by_collection.items():
+        for name in indexes:
+            if name != "_id_" and (collection, name) not in declared:
+                report.append({"collection": collection, "name": name, "status": "undeclared"})
+    return report
+
+
+async def migrate_indexes(db, rebuild_conflicting: bool = False) -> List[Dict[str, Any]]:
+    """Create missing indexes (and optionally rebuild conflicting ones); returns the new report"""
+    report = await verify_indexes(db)
+    specs = {(spec.collection, spec.name): spec for spec in DECLARED_INDEXES}
+    todo = []
+    for entry in report:
+        spec = specs.get((entry["collection"], entry["name"]))
+        if entry["status"] == "missing":
+            todo.append(spec)
+        elif entry["status"] == "conflict" and rebuild_conflicting:
+            logger.info("Dropping conflicting index %s.%s", spec.collection, spec.name)
+            await db[spec.collection].drop_index(spec.name)
+            todo.append(spec)
+    await ensure_indexes(db, todo)
+    return await verify_indexes(db)
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Verify or migrate the backend's MongoDB indexes")
+    parser.add_argument("command", choices=("verify", "migrate"))
+    parser.add_argument("--rebuild-conflicting", action="store_true",
+                        help="drop and recreate indexes whose keys or options differ from the declaration")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    load_dotenv()
+    db = AsyncIOMotorClient(os.environ.get('MONGO_URL')).career_assistant
+
+    if args.command == "verify":
+        report = asyncio.run(verify_indexes(db))
+    else:
+        report = asyncio.run(migrate_indexes(db, rebuild_conflicting=args.rebuild_conflicting))
+
+    for entry in report:
+        line = f"{entry['status']:<11} {entry['collection']}.{entry['name']}"
+        if "found" in entry:
+            line += f"  (found {entry['found']})"
+        print(line)
+    return 1 if any(entry["status"] in ("missing", "conflict") for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,136 @@
+"""Process-pool execution layer for CPU-bound document work.
+
+python-docx parsing and rendering hold the GIL for the whole call, so running
+them inside an ``async def`` handler stalls every other request on the worker.
+``DocumentPool`` moves that work into a ``ProcessPoolExecutor`` with a bounded
+number of pending tasks and a per-task timeout, and runs tiny inputs inline
+where the pickling round trip would cost more than the work itself.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+
+class DocumentTaskError(Exception):
+    """Picklable carrier for an HTTPException raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _invoke(fn: Callable, args: tuple) -> Any:
+    """Run ``fn`` in the worker, translating HTTPException so it survives pickling"""
+    try:
+        return fn(*args)
+    except HTTPException as e:
+        raise DocumentTaskError(e.status_code, e.detail)
+
+
+class DocumentPool:
+    """Bounded process pool for python-docx work.
+
+    Configuration (environment variables, overridable via constructor):
+        DOCX_POOL_WORKERS            worker processes; 0 disables the pool (default: min(4, CPUs))
+        DOCX_POOL_MAX_PENDING        tasks queued or running before new work is rejected with 503 (default: 32)
+        DOCX_TASK_TIMEOUT            seconds to wait for a single task before failing with 504 (default: 30)
+        DOCX_INLINE_THRESHOLD_BYTES  inputs smaller than this run inline on the event loop (default: 32768)
+        DOCX_POOL_START_METHOD       multiprocessing start method (default: platform default)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        inline_threshold: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        self.max_workers = max_workers if max_workers is not None else int(
+            os.environ.get('DOCX_POOL_WORKERS', min(4, os.cpu_count() or 1))
+        )
+        self.max_pending = max_pending if max_pending is not None else int(
+            os.environ.get('DOCX_POOL_MAX_PENDING', 32)
+        )
+        self.task_timeout = task_timeout if task_timeout is not None else float(
+            os.environ.get('DOCX_TASK_TIMEOUT', 30)
+        )
+        self.inline_threshold = inline_threshold if inline_threshold is not None else int(
+            os.environ.get('DOCX_INLINE_THRESHOLD_BYTES', 32 * 1024)
+        )
+        self.start_method = start_method or os.environ.get('DOCX_POOL_START_METHOD') or None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self):
+        """Create the executor. Safe to call more than once."""
+        if self.enabled and self._executor is None:
+            mp_context = multiprocessing.get_context(self.start_method) if self.start_method else None
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+
+    def _task_done(self, _future=None):
+        # Called from the executor's management thread once the worker is done with the task
+        with self._pending_lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable, *args, size: Optional[int] = None) -> Any:
+        """Run ``fn(*args)`` in the pool and return its result.
+
+        ``size`` is the input size in bytes; when it is below the inline threshold
+        (or the pool is disabled) the call runs directly on the event loop.
+        HTTPExceptions raised by ``fn`` are re-raised unchanged.
+        """
+        if not self.enabled or (size is not None and size < self.inline_threshold):
+            return fn(*args)
+
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Document processing queue is full, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.start()
+        with self._pending_lock:
+            self._pending += 1
+        executor = self._executor
+        future = None
+        try:
+            future = executor.submit(_invoke, fn, args)
+            # A timed-out task keeps its worker busy, so it stays pending until the worker is done
+            future.add_done_callback(self._task_done)
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.task_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Document processing timed out")
+        except DocumentTaskError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the executor for the next request,
+            # unless a caller that saw the same failure already has
+            if self._executor is executor:
+                self.shutdown()
+            raise HTTPException(status_code=503, detail="Document processing pool restarted, please retry")
+        finally:
+            if future is None:
+                self._task_done()
@@ -0,0 +1,161 @@
+"""Formatting-preserving DOCX rendering by patching ``word/document.xml`` only.
+
+``docx.Document`` loads every part of the package and re-serializes all of
+them on save, recompressing images, embedded fonts and themes that never
+change. Tailoring only rewrites run text in the main document part, so this
+module parses just that part (with python-docx's own oxml parser, so the text
+rules and run edits are identical), rewrites the paragraphs, and writes a new
+archive in which every other zip member is copied through as its original
+compressed bytes.
+
+The zip writer below covers what Word and python-docx produce: no
+encryption, no ZIP64, no multi-disk archives. Anything else makes
+``patch_tailored_docx`` return None so the caller can fall back to the
+python-docx renderer.
+"""
+import io
+import struct
+import zipfile
+import zlib
+from typing import Dict, List, Optional
+
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml.parser import parse_xml
+
+from alignment import align_lines
+from docx_text import find_main_document_part, paragraph_text
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IHHHHIIH")
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+_CENTRAL_HEADER_SIGNATURE = 0x02014B50
+_END_SIGNATURE = 0x06054B50
+
+_FLAG_ENCRYPTED = 0x01
+_FLAG_DATA_DESCRIPTOR = 0x08
+_ZIP32_LIMIT = 0xFFFFFFFF
+_ZIP32_MAX_ENTRIES = 0xFFFF
+
+
+def rewrite_paragraphs(body, tailored_text: str):
+    """Replace the text of each body paragraph with its aligned tailored line.
+
+    ``body`` is a python-docx ``CT_Body`` element. Paragraph formatting and the
+    first run's character formatting are kept; paragraphs with no matching
+    line are left unchanged.
+    """
+    tailored_lines = [line.strip() for line in tailored_text.split('\n') if line.strip()]
+    paragraphs = []
+    texts = []
+    for p in body.p_lst:
+        text = paragraph_text(p).strip()
+        if text:
+            paragraphs.append(p)
+            texts.append(text)
+    assignment = align_lines(texts, tailored_lines)
+
+    for p, line_number in zip(paragraphs, assignment):
+        if line_number is None:
+            continue
+        runs = p.r_lst
+        if runs:
+            # Clear existing runs, then put the new text in the first one
+            for r in runs:
+                r.text = ""
+            runs[0].text = tailored_lines[line_number]
+        else:
+            p.clear_content()
+            p.add_r().text = tailored_lines[line_number]
+
+
+def _dos_datetime(date_time) -> tuple:
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _is_supported(infos: List[zipfile.ZipInfo]) -> bool:
+    if len(infos) >= _ZIP32_MAX_ENTRIES:
+        return False
+    for info in infos:
+        if info.flag_bits & _FLAG_ENCRYPTED:
+            return False
+        if max(info.file_size, info.compress_size, info.header_offset) >= _ZIP32_LIMIT:
+            return False
+    return True
+
+
+def rewrite_zip(source: bytes, archive: zipfile.ZipFile, replacements: Dict[str, bytes]) -> bytes:
+    """Copy ``archive`` (opened over ``source``) member by member, deflating only ``replacements``.
+
+    Untouched members keep their compressed bytes, compression method, CRC and
+    timestamps; member order is preserved.
+    """
+    out = io.BytesIO()
+    central_directory = []
+    for info in archive.infolist():
+        header_offset = info.header_offset
+        (signature, _, _, _, _, _, _, _, _, name_length, extra_length) = _LOCAL_HEADER.unpack_from(
+            source, header_offset
+        )
+        if signature != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"bad local header for {info.filename}")
+        name_start = header_offset + _LOCAL_HEADER.size
+        name = source[name_start:name_start + name_length]
+        local_extra = source[name_start + name_length:name_start + name_length + extra_length]
+
+        if info.filename in replacements:
+            content = replacements[info.filename]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            data = compressor.compress(content) + compressor.flush()
+            method, crc, file_size = zipfile.ZIP_DEFLATED, zlib.crc32(content), len(content)
+        else:
+            data_start = name_start + name_length + extra_length
+            data = source[data_start:data_start + info.compress_size]
+            method, crc, file_size = info.compress_type, info.CRC, info.file_size
+
+        # Sizes and CRC are known up front, so no trailing data descriptor is written
+        flags = info.flag_bits & ~_FLAG_DATA_DESCRIPTOR
+        dos_time, dos_date = _dos_datetime(info.date_time)
+        offset = out.tell()
+        out.write(_LOCAL_HEADER.pack(
+            _LOCAL_HEADER_SIGNATURE, info.extract_version, flags, method, dos_time, dos_date,
+            crc, len(data), file_size, len(name), len(local_extra),
+        ))
+        out.write(name)
+        out.write(local_extra)
+        out.write(data)
+        central_directory.append(_CENTRAL_HEADER.pack(
+            _CENTRAL_HEADER_SIGNATURE, (info.create_system << 8) | info.create_version, info.extract_version,
+            flags, method, dos_time, dos_date, crc, len(data), file_size,
+            len(name), len(info.extra), len(info.comment), 0, info.internal_attr, info.external_attr, offset,
+        ) + name + info.extra + info.comment)
+
+    directory_offset = out.tell()
+    for entry in central_directory:
+        out.write(entry)
+    out.write(_END_OF_CENTRAL_DIRECTORY.pack(
+        _END_SIGNATURE, 0, 0, len(central_directory), len(central_directory),
+        out.tell() - directory_offset, directory_offset, 0,
+    ))
+    return out.getvalue()
+
+
+def patch_tailored_docx(original_docx_content: bytes, tailored_text: str) -> Optional[bytes]:
+    """Render the tailored DOCX by patching the main document part, or None if unsupported"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(original_docx_content)) as archive:
+            infos = archive.infolist()
+            if not _is_supported(infos) or len({info.filename for info in infos}) != len(infos):
+                return None
+            part_name = find_main_document_part(archive)
+            if part_name is None:
+                return None
+            document = parse_xml(archive.read(part_name))
+            body = document.body
+            if body is None:
+                return None
+            rewrite_paragraphs(body, tailored_text)
+            return rewrite_zip(original_docx_content, archive, {part_name: serialize_part_xml(document)})
+    except Exception:
+        return None
@@ -0,0 +1,136 @@
+"""Fast-path paragraph text extraction for DOCX files.
+
+``docx.Document`` parses every part of the package and builds the full object
+model just so we can read ``paragraph.text``. This module opens the zip
+directly and streams ``word/document.xml`` with ``lxml.etree.iterparse``,
+clearing each body element once its text has been collected, so images,
+fonts, headers and styles are never decompressed.
+
+The text rules mirror python-docx 1.1: only ``w:p`` elements that are direct
+children of ``w:body`` are paragraphs, and a paragraph's text is the
+concatenation of its ``w:r`` and ``w:hyperlink`` runs, with ``w:tab``/``w:ptab``
+mapped to ``\\t``, ``w:cr`` and text-wrapping ``w:br`` to ``\\n`` and
+``w:noBreakHyphen`` to ``-``. Anything this module doesn't recognise makes it
+return None so the caller can fall back to python-docx.
+"""
+import io
+import posixpath
+import zipfile
+from typing import Optional
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+WML_DOCUMENT_MAIN = "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+
+_DOCUMENT = f"{{{W_NS}}}document"
+_BODY = f"{{{W_NS}}}body"
+_P = f"{{{W_NS}}}p"
+_R = f"{{{W_NS}}}r"
+_HYPERLINK = f"{{{W_NS}}}hyperlink"
+_T = f"{{{W_NS}}}t"
+_TAB = f"{{{W_NS}}}tab"
+_PTAB = f"{{{W_NS}}}ptab"
+_CR = f"{{{W_NS}}}cr"
+_BR = f"{{{W_NS}}}br"
+_NO_BREAK_HYPHEN = f"{{{W_NS}}}noBreakHyphen"
+_BR_TYPE = f"{{{W_NS}}}type"
+
+
+def find_main_document_part(archive: zipfile.ZipFile) -> Optional[str]:
+    """Return the zip member name of the main document part, or None if it isn't a plain DOCX"""
+    rels = etree.fromstring(archive.read("_rels/.rels"))
+    target = None
+    for rel in rels.iter(f"{{{REL_NS}}}Relationship"):
+        if rel.get("Type") == OFFICE_DOCUMENT_REL and rel.get("TargetMode") != "External":
+            target = rel.get("Target")
+            break
+    if not target:
+        return None
+    part_name = posixpath.normpath(target.lstrip("/"))
+
+    # python-docx rejects anything that isn't a WordprocessingML document (e.g. .dotx/.docm)
+    content_types = etree.fromstring(archive.read("[Content_Types].xml"))
+    for override in content_types.iter(f"{{{CT_NS}}}Override"):
+        if override.get("PartName", "").lstrip("/") == part_name:
+            if override.get("ContentType") != WML_DOCUMENT_MAIN:
+                return None
+            return part_name if part_name in archive.NameToInfo else None
+    return None
+
+
+def run_text(r) -> str:
+    """Text of a ``w:r`` element, matching ``docx.oxml.text.run.CT_R.text``"""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _TAB or tag == _PTAB:
+            parts.append("\t")
+        elif tag == _CR:
+            parts.append("\n")
+        elif tag == _BR:
+            if child.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == _NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    """Text of a ``w:p`` element, matching ``docx.text.paragraph.Paragraph.text``"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(run_text(r) for r in child if r.tag == _R)
+    return "".join(parts)
+
+
+def iter_body_paragraph_texts(xml_stream):
+    """Yield the text of each body-level paragraph while streaming document.xml"""
+    # Same parser flags python-docx uses, so whitespace handling is identical
+    context = etree.iterparse(
+        xml_stream, events=("start", "end"), remove_blank_text=True, resolve_entities=False
+    )
+    depth = 0
+    body_seen = False
+    for event, elem in context:
+        if event == "start":
+            depth += 1
+            if depth == 1 and elem.tag != _DOCUMENT:
+                raise ValueError("unexpected root element")
+            if depth == 2 and elem.tag == _BODY:
+                body_seen = True
+            continue
+
+        if depth == 3:
+            if elem.getparent().tag == _BODY and elem.tag == _P:
+                yield paragraph_text(elem)
+            # Drop the finished body child and everything before it
+            elem.clear()
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+        depth -= 1
+    if not body_seen:
+        raise ValueError("document has no body")
+
+
+def extract_paragraph_text(file_content: bytes) -> Optional[str]:
+    """Return non-empty paragraph text joined by newlines, or None to request the python-docx fallback"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+            part_name = find_main_document_part(archive)
+            if part_name is None:
+                return None
+            with archive.open(part_name) as xml_stream:
+                text_parts = [text for text in iter_body_paragraph_texts(xml_stream) if text.strip()]
+        return '\n'.join(text_parts)
+    except Exception:
+        return None
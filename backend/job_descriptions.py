@@ -0,0 +1,150 @@
+"""Deduplicated job descriptions with precomputed features.
+
+Each distinct job posting is stored once in the ``job_descriptions``
+collection under the SHA-256 of its normalized text (whitespace collapsed
+within lines, blank lines dropped), together with the artifacts every
+tailoring request against it needs: the weighted keywords from
+``ats_scorer.extract_keywords``, the section split and a token count.
+Analyses reference the record by ``job_description_id`` instead of storing
+their own copy.
+
+Features carry a ``feature_version``; records written by an older version
+are recomputed the next time they are resolved. Resolving also stamps
+``last_used_at``, so the orphan sweep in analysis_archive leaves a job
+description alone while requests are still using it.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from ats_scorer import JD_SECTION_WEIGHTS, Keyword, extract_keywords, split_sections
+from text_compression import compress_fields, decompress_fields
+from tracing import span
+
+# Bump when keyword extraction or the stored features change
+FEATURE_VERSION = 2
+
+
+class JobDescriptionRecord(NamedTuple):
+    id: str
+    text: str
+    keywords: List[Keyword]
+    sections: List[Dict[str, Any]]
+    token_count: int
+
+
+def normalize_job_description(text: str) -> str:
+    """Collapse whitespace within lines and drop blank lines; line structure carries section headings"""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def job_description_hash(text: str) -> str:
+    return hashlib.sha256(normalize_job_description(text).encode("utf-8")).hexdigest()
+
+
+def compute_features(text: str) -> Dict[str, Any]:
+    sections = []
+    offset = 0
+    for weight, segment in split_sections(text, JD_SECTION_WEIGHTS, 1.0):
+        heading = next((line.strip() for line in segment.split("\n") if line.strip()), "")
+        sections.append({"heading": heading, "weight": weight, "start": offset, "end": offset + len(segment)})
+        offset += len(segment) + 1  # split_sections drops the newline between segments
+    return {
+        "keywords": [list(keyword) for keyword in extract_keywords(text)],
+        "sections": sections,
+        "token_count": len(text.split()),
+        "feature_version": FEATURE_VERSION,
+    }
+
+
+def _features(record: JobDescriptionRecord) -> Dict[str, Any]:
+    """The stored feature fields of a record, as ``compute_features`` returns them"""
+    return {
+        "keywords": [list(keyword) for keyword in record.keywords],
+        "sections": record.sections,
+        "token_count": record.token_count,
+        "feature_version": FEATURE_VERSION,
+    }
+
+
+def _stored_text(text: str, now: str) -> Dict[str, Any]:
+    return compress_fields({"text": text, "created_at": now}, ("text",))
+
+
+def _record(doc: Dict[str, Any]) -> JobDescriptionRecord:
+    return JobDescriptionRecord(
+        id=doc["_id"],
+        text=doc["text"],
+        keywords=[Keyword(term, display, weight) for term, display, weight in doc["keywords"]],
+        sections=doc["sections"],
+        token_count=doc["token_count"],
+    )
+
+
+class JobDescriptionStore:
+    """
+    Configuration (environment variables, overridable via constructor):
+        JOB_DESCRIPTION_CACHE_SIZE  resolved records kept in process (default: 256)
+    """
+
+    def __init__(self, collection, cache_size: Optional[int] = None):
+        self.collection = collection
+        self.cache_size = cache_size if cache_size is not None else int(
+            os.environ.get('JOB_DESCRIPTION_CACHE_SIZE', 256)
+        )
+        self._cache: "OrderedDict[str, JobDescriptionRecord]" = OrderedDict()
+
+    def _remember(self, record: JobDescriptionRecord) -> JobDescriptionRecord:
+        self._cache[record.id] = record
+        self._cache.move_to_end(record.id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return record
+
+    async def resolve(self, text: str) -> JobDescriptionRecord:
+        """Return the record for ``text``, creating it (or refreshing stale features) if needed.
+
+        Every call stamps ``last_used_at``, which the orphan sweep respects, and a
+        record served from memory is written back if it has been deleted since.
+        """
+        with span("job_description.resolve", chars=len(text)) as resolve_span:
+            jd_id = job_description_hash(text)
+            now = datetime.now(timezone.utc).isoformat()
+            cached = self._cache.get(jd_id)
+            if cached is not None:
+                self._cache.move_to_end(jd_id)
+                resolve_span.set(source="memory")
+                await self.collection.update_one(
+                    {"_id": jd_id},
+                    {"$setOnInsert": {**_stored_text(cached.text, now), **_features(cached)},
+                     "$set": {"last_used_at": now}},
+                    upsert=True,
+                )
+                return cached
+
+            doc = await self.collection.find_one_and_update({"_id": jd_id}, {"$set": {"last_used_at": now}})
+            if doc is not None and doc.get("feature_version") == FEATURE_VERSION:
+                resolve_span.set(source="stored")
+                return self._remember(_record(decompress_fields(doc, ("text",))))
+
+            stored_text = decompress_fields(doc, ("text",))["text"] if doc is not None else text
+            resolve_span.set(source="computed")
+            features = compute_features(stored_text)
+            await self.collection.update_one(
+                {"_id": jd_id},
+                {"$setOnInsert": _stored_text(stored_text, now), "$set": {**features, "last_used_at": now}},
+                upsert=True,
+            )
+            return self._remember(_record({"_id": jd_id, "text": stored_text, **features}))
+
+    async def texts(self, jd_ids: Iterable[str]) -> Dict[str, str]:
+        """Map job description ids to their text"""
+        wanted = set(jd_ids)
+        found = {jd_id: self._cache[jd_id].text for jd_id in wanted if jd_id in self._cache}
+        missing = list(wanted - set(found))
+        if missing:
+            async for doc in self.collection.find({"_id": {"$in": missing}}, {"text": 1}):
+                found[doc["_id"]] = decompress_fields(doc, ("text",))["text"]
+        return found
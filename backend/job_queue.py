@@ -0,0 +1,314 @@
+"""Asynchronous job queue for long-running tailoring work.
+
+Submitting a job stores it as ``queued`` and returns immediately; a fixed
+number of asyncio workers claim jobs one at a time, run the handler and record
+the result as ``done`` (or ``failed`` with an error detail).
+
+Two stores are provided. ``MongoJobStore`` persists jobs so queued work
+survives a restart: claiming is an atomic ``find_one_and_update``, and a
+running job whose lease has expired (its worker died) is handed to the next
+worker; jobs still running when the queue is stopped are requeued at once.
+Finished jobs carry an ``expires_at`` and are deleted by a TTL index once
+JOB_RETENTION_SECONDS have passed. ``InMemoryJobStore`` keeps everything in
+a dict for tests and local runs.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+from tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _new_job(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "status": JOB_QUEUED,
+        "payload": payload,
+        "result": None,
+        "error": None,
+        "attempts": 0,
+        "created_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "lease_expires_at": None,
+        "expires_at": None,
+    }
+
+
+class InMemoryJobStore:
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def _expire(self):
+        now = _now()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.get("expires_at") and job["expires_at"] < now]:
+            del self._jobs[job_id]
+
+    async def create(self, job: Dict[str, Any]):
+        self._expire()
+        self._jobs[job["id"]] = dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job and job.get("expires_at") and job["expires_at"] < _now():
+            del self._jobs[job_id]
+            return None
+        return dict(job) if job else None
+
+    async def claim_next(self, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        now = _now()
+        candidates = [
+            job for job in self._jobs.values()
+            if job["status"] == JOB_QUEUED
+            or (job["status"] == JOB_RUNNING and job["lease_expires_at"] < now)
+        ]
+        if not candidates:
+            return None
+        job = min(candidates, key=lambda j: j["created_at"])
+        job.update(
+            status=JOB_RUNNING,
+            started_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=job["attempts"] + 1,
+        )
+        return dict(job)
+
+    async def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None,
+                     expires_at: Optional[datetime] = None):
+        self._jobs[job_id].update(status=status, result=result, error=error, finished_at=_now(), lease_expires_at=None,
+                                  expires_at=expires_at)
+
+    async def requeue(self, job_id: str):
+        job = self._jobs[job_id]
+        job.update(status=JOB_QUEUED, lease_expires_at=None, attempts=job["attempts"] - 1)
+
+    async def count(self, status: str) -> int:
+        self._expire()
+        return sum(1 for job in self._jobs.values() if job["status"] == status)
+
+
+class MongoJobStore:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def create(self, job: Dict[str, Any]):
+        await self.collection.insert_one(dict(job))
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"id": job_id}, {"_id": 0})
+
+    async def claim_next(self, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        now = _now()
+        job = await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": JOB_QUEUED},
+                {"status": JOB_RUNNING, "lease_expires_at": {"$lt": now}},
+            ]},
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is not None:
+            job.pop("_id", None)
+        return job
+
+    async def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None,
+                     expires_at: Optional[datetime] = None):
+        await self.collection.update_one(
+            {"id": job_id},
+            {"$set": {
+                "status": status,
+                "result": result,
+                "error": error,
+                "finished_at": _now(),
+                "lease_expires_at": None,
+                # The TTL index on expires_at deletes the job, payload and result included
+                "expires_at": expires_at,
+            }},
+        )
+
+    async def requeue(self, job_id: str):
+        await self.collection.update_one(
+            {"id": job_id},
+            {"$set": {"status": JOB_QUEUED, "lease_expires_at": None}, "$inc": {"attempts": -1}},
+        )
+
+    async def count(self, status: str) -> int:
+        return await self.collection.count_documents({"status": status})
+
+
+class JobQueue:
+    """
+    Configuration (environment variables, overridable via constructor):
+        JOB_WORKER_CONCURRENCY  jobs processed at once by this process (default: 4)
+        JOB_LEASE_SECONDS       how long a running job may go without finishing before
+                                another worker may take it over (default: 600)
+        JOB_POLL_SECONDS        idle poll interval, to pick up jobs queued by other
+                                processes or left behind by a restart (default: 2)
+        JOB_MAX_ATTEMPTS        claims before a repeatedly abandoned job is failed (default: 3)
+        JOB_RETENTION_SECONDS   how long a finished job, with its payload and result, is kept
+                                for status polling; 0 keeps it forever (default: 604800)
+
+    With a ``tracer``, each run is traced as its own root span, continuing the
+    trace of the submitting request when the payload carries its ``traceparent``.
+    """
+
+    def __init__(
+        self,
+        store,
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+        kind: str = "job",
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retention_seconds: Optional[float] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        self.store = store
+        self.handler = handler
+        self.kind = kind
+        self.concurrency = concurrency if concurrency is not None else int(
+            os.environ.get('JOB_WORKER_CONCURRENCY', 4)
+        )
+        self.lease_seconds = lease_seconds if lease_seconds is not None else float(
+            os.environ.get('JOB_LEASE_SECONDS', 600)
+        )
+        self.poll_seconds = poll_seconds if poll_seconds is not None else float(
+            os.environ.get('JOB_POLL_SECONDS', 2)
+        )
+        self.max_attempts = max_attempts if max_attempts is not None else int(
+            os.environ.get('JOB_MAX_ATTEMPTS', 3)
+        )
+        self.retention_seconds = retention_seconds if retention_seconds is not None else float(
+            os.environ.get('JOB_RETENTION_SECONDS', 7 * 24 * 60 * 60)
+        )
+        self.tracer = tracer
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        job = _new_job(self.kind, payload)
+        await self.store.create(job)
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(job_id)
+
+    async def _finish(self, job_id: str, status: str, **fields):
+        expires_at = _now() + timedelta(seconds=self.retention_seconds) if self.retention_seconds > 0 else None
+        await self.store.finish(job_id, status, expires_at=expires_at, **fields)
+
+    async def run_next(self) -> bool:
+        """Claim and run one job. Returns False when nothing was queued."""
+        job = await self.store.claim_next(self.lease_seconds)
+        if job is None:
+            return False
+
+        if job["attempts"] > self.max_attempts:
+            await self._finish(job["id"], JOB_FAILED, error="Job abandoned too many times")
+            return True
+
+        try:
+            result = await self._run_handler(job)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back now rather than after its lease expires
+            try:
+                await self.store.requeue(job["id"])
+            except Exception:
+                logger.exception("Could not requeue %s job %s on shutdown", self.kind, job["id"])
+            raise
+        except HTTPException as e:
+            if e.status_code in (429, 503):
+                # Backpressure from a shared limiter: put the job back and pause this worker
+                await self.store.requeue(job["id"])
+                retry_after = float((e.headers or {}).get("Retry-After", self.poll_seconds))
+                await asyncio.sleep(retry_after)
+                return True
+            await self._finish(job["id"], JOB_FAILED, error=str(e.detail))
+        except Exception as e:
+            await self._finish(job["id"], JOB_FAILED, error=str(e))
+        else:
+            await self._record_result(job["id"], result)
+        return True
+
+    async def _record_result(self, job_id: str, result: Any):
+        """Store a finished job's result, retrying within its lease so the work isn't run again"""
+        deadline = asyncio.get_running_loop().time() + self.lease_seconds
+        while True:
+            try:
+                await self._finish(job_id, JOB_DONE, result=result)
+                return
+            except Exception:
+                if asyncio.get_running_loop().time() + self.poll_seconds >= deadline:
+                    raise
+                logger.exception("Could not record the result of %s job %s; retrying", self.kind, job_id)
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _run_handler(self, job: Dict[str, Any]) -> Any:
+        if self.tracer is None:
+            return await self.handler(job["payload"])
+        # attempts counts claims, so anything above 1 is a retry after backpressure or a lost lease
+        with self.tracer.start_trace(f"job {self.kind}", job["payload"].get("traceparent"), trust_sampled=True,
+                                     **{"job.id": job["id"], "job.attempts": job["attempts"]}):
+            return await self.handler(job["payload"])
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                if await self.run_next():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Store unavailable; back off and retry
+                logger.exception("%s job worker failed; retrying in %ss", self.kind, self.poll_seconds)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stats(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        return {
+            status: await self.store.count(status)
+            for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)
+        }
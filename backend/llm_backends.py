@@ -0,0 +1,192 @@
+"""Pluggable LLM backends behind ``get_llm_chat``.
+
+A backend hands out chat objects with ``async send_message(message) -> str``
+plus the message objects they accept. ``LLM_BACKEND`` selects one:
+
+    emergent  emergentintegrations LlmChat (default; imported on first use)
+    fake      deterministic offline responses with simulated latency and
+              generation time, for load tests and local development
+
+The fake recognises the tailoring, ATS, combined and suggestions prompts by
+their system message and answers each in the expected shape, derived from
+the resume and job description in the prompt. Its ``model`` is "fake", so
+its responses never share LLM cache entries with a real model's.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import re
+from typing import List, NamedTuple, Optional
+
+from fastapi import HTTPException
+
+LLM_BACKENDS = ("emergent", "fake")
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+class LatencyDistribution(NamedTuple):
+    """Seconds to the first token: ``fixed:S``, ``uniform:LOW:HIGH`` or ``lognormal:MEDIAN:SIGMA``"""
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(value) for value in params.split(":")] if params else []
+        except ValueError:
+            values = []
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(values) != expected[kind] or min(values) < 0:
+            raise ValueError(f"Invalid latency distribution {spec!r}; "
+                             "use fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.a
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        return rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+
+
+class FakeMessage(NamedTuple):
+    text: str
+
+
+def _section(prompt: str, start: str, ends: List[str]) -> str:
+    begin = prompt.find(start)
+    if begin < 0:
+        return ""
+    begin += len(start)
+    end = min((i for i in (prompt.find(marker, begin) for marker in ends) if i >= 0), default=len(prompt))
+    return prompt[begin:end].strip()
+
+
+class FakeChat:
+    def __init__(self, backend: "FakeLlmBackend", system_message: str):
+        self.backend = backend
+        if '"tailored_resume"' in system_message:
+            self.kind = "combined"
+        elif "JSON array" in system_message:
+            self.kind = "suggestions"
+        elif '"score"' in system_message:
+            self.kind = "ats"
+        else:
+            self.kind = "tailor"
+
+    def respond(self, prompt: str) -> str:
+        job_description = _section(prompt, "JOB DESCRIPTION:\n", ["\n\nORIGINAL RESUME:", "\n\nRESUME:"])
+        resume = _section(prompt, "RESUME:\n", ["\n\nPlease ", "\n\nMISSING KEYWORDS:"])
+        jd_words = list(dict.fromkeys(_WORD.findall(job_description.lower())))
+        resume_words = set(_WORD.findall(resume.lower()))
+        keywords = [word for word in jd_words if len(word) > 3][:12]
+        matched = [word for word in keywords if word in resume_words]
+        missing = [word for word in keywords if word not in resume_words]
+
+        if self.backend.rng.random() < self.backend.invalid_json_rate and self.kind != "tailor":
+            return "I'm sorry, here is the analysis you asked for."
+
+        suggestions = [f"Mention {word} where it reflects real experience" for word in missing[:3]] or \
+                      ["Quantify achievements with metrics"]
+        if self.kind == "suggestions":
+            return json.dumps(suggestions)
+
+        # Append one missing keyword to every third bullet, as a tailoring pass might
+        lines = resume.split("\n")
+        extra = iter(missing or keywords or ["impact"])
+        tailored = "\n".join(
+            f"{line}, applying {next(extra, 'impact')}" if line.startswith("•") and i % 3 == 0 else line
+            for i, line in enumerate(lines)
+        )
+        if self.kind == "tailor":
+            return tailored
+
+        score = 40 + (55 * len(matched) // len(keywords) if keywords else 30)
+        analysis = {"score": score, "suggestions": suggestions, "keyword_matches": matched, "missing_keywords": missing}
+        if self.kind == "combined":
+            return "```json\n" + json.dumps({"tailored_resume": tailored, **analysis}) + "\n```"
+        return json.dumps(analysis)
+
+    async def send_message(self, message: FakeMessage) -> str:
+        response = self.respond(message.text)
+        await asyncio.sleep(self.backend.latency.sample(self.backend.rng) + self.backend.generation_seconds(response))
+        return response
+
+
+class FakeLlmBackend:
+    """
+    Configuration (environment variables, overridable via constructor):
+        FAKE_LLM_LATENCY            time to first token (default: lognormal:1.5:0.5)
+        FAKE_LLM_TOKENS_PER_SECOND  generation speed, 0 for instant (default: 80)
+        FAKE_LLM_INVALID_JSON_RATE  share of structured responses that are not JSON (default: 0)
+        FAKE_LLM_SEED               seed for latency and invalid-response sampling (default: 0)
+    """
+    name = "fake"
+    model = "fake"
+
+    def __init__(
+        self,
+        latency: Optional[str] = None,
+        tokens_per_second: Optional[float] = None,
+        invalid_json_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = LatencyDistribution.parse(latency or os.environ.get('FAKE_LLM_LATENCY', 'lognormal:1.5:0.5'))
+        self.tokens_per_second = tokens_per_second if tokens_per_second is not None else float(
+            os.environ.get('FAKE_LLM_TOKENS_PER_SECOND', 80)
+        )
+        self.invalid_json_rate = invalid_json_rate if invalid_json_rate is not None else float(
+            os.environ.get('FAKE_LLM_INVALID_JSON_RATE', 0)
+        )
+        self.rng = random.Random(seed if seed is not None else int(os.environ.get('FAKE_LLM_SEED', 0)))
+
+    def generation_seconds(self, response: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return len(response.split()) / self.tokens_per_second
+
+    def chat(self, session_id: str, system_message: str) -> FakeChat:
+        return FakeChat(self, system_message)
+
+    def message(self, text: str) -> FakeMessage:
+        return FakeMessage(text)
+
+
+class EmergentLlmBackend:
+    name = "emergent"
+
+    def __init__(self, provider: str = "openai", model: str = "gpt-4o"):
+        self.provider = provider
+        self.model = model
+
+    def chat(self, session_id: str, system_message: str):
+        from emergentintegrations.llm.chat import LlmChat
+
+        api_key = os.environ.get('EMERGENT_LLM_KEY')
+        if not api_key:
+            raise HTTPException(status_code=500, detail="LLM API key not configured")
+        return LlmChat(
+            api_key=api_key,
+            session_id=session_id,
+            system_message=system_message
+        ).with_model(self.provider, self.model)
+
+    def message(self, text: str):
+        from emergentintegrations.llm.chat import UserMessage
+
+        return UserMessage(text=text)
+
+
+def load_llm_backend(name: Optional[str] = None, provider: str = "openai", model: str = "gpt-4o"):
+    """Backend named by ``name`` or LLM_BACKEND (default: emergent)"""
+    name = name or os.environ.get('LLM_BACKEND', 'emergent')
+    if name == "emergent":
+        return EmergentLlmBackend(provider, model)
+    if name == "fake":
+        return FakeLlmBackend()
+    raise ValueError(f"LLM_BACKEND must be one of: {', '.join(LLM_BACKENDS)}")
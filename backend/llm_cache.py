@@ -0,0 +1,195 @@
+"""Two-tier cache for LLM responses.
+
+Keys are a SHA-256 over the call kind, the resume and job description with
+whitespace normalized within each line, a version hash of the system prompt
+and the model name, so editing a prompt or switching models naturally
+invalidates old entries.
+
+Tier 1 is an in-process LRU with size and TTL eviction. Tier 2 is a Mongo
+collection shared by all workers, expired by a TTL index on ``expires_at``.
+Concurrent requests for the same key share a single in-flight LLM call.
+Failures in the shared tier are counted and treated as misses; the cache never
+fails a request on its own.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from tracing import span
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace within lines and drop blank lines so trivially different resubmits share a key.
+
+    Line breaks are kept: the tailored reply is rendered line by line onto the
+    resume's paragraphs, so resumes that differ only in where lines break must
+    not share a reply.
+    """
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def prompt_version(system_message: str) -> str:
+    return hashlib.sha256(system_message.encode('utf-8')).hexdigest()[:16]
+
+
+class _Abandoned(Exception):
+    """Set on an in-flight future whose computing caller was cancelled"""
+
+
+class LlmResponseCache:
+    """
+    Configuration (environment variables, overridable via constructor):
+        LLM_CACHE_MAX_ENTRIES  in-process entries before LRU eviction (default: 512)
+        LLM_CACHE_TTL_SECONDS  lifetime of an entry in both tiers (default: 86400)
+        LLM_CACHE_SHARED       set to "false" to disable the Mongo tier (default: true)
+    """
+
+    def __init__(
+        self,
+        collection=None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.environ.get('LLM_CACHE_MAX_ENTRIES', 512)
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.environ.get('LLM_CACHE_TTL_SECONDS', 24 * 60 * 60)
+        )
+        shared = os.environ.get('LLM_CACHE_SHARED', 'true').lower() != 'false'
+        self.collection = collection if shared else None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "memory_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+        }
+
+    @staticmethod
+    def key(kind: str, resume_text: str, job_description: str, system_message: str, model: str) -> str:
+        digest = hashlib.sha256()
+        for part in (kind, normalize_text(resume_text), normalize_text(job_description),
+                     prompt_version(system_message), model):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl_seconds), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._get_local(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({"_id": key})
+            except Exception:
+                self.stats["shared_errors"] += 1
+                doc = None
+            if doc:
+                expires_at = doc["expires_at"]
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+                # The TTL monitor only runs once a minute, so check expiry ourselves
+                if remaining > 0:
+                    self.stats["shared_hits"] += 1
+                    self._set_local(key, doc["value"], ttl=remaining)
+                    return doc["value"]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        self._set_local(key, value)
+        if self.collection is not None:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.replace_one(
+                    {"_id": key},
+                    {"value": value, "created_at": now, "expires_at": now + timedelta(seconds=self.ttl_seconds)},
+                    upsert=True,
+                )
+            except Exception:
+                self.stats["shared_errors"] += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """Return the cached value for ``key`` or compute it once for all concurrent callers.
+
+        If the caller computing the value is cancelled (e.g. its client
+        disconnected), the callers waiting on it start over and one of them
+        computes the value instead.
+        """
+        with span("llm.cache") as cache_span:
+            while True:
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    value = await self.get(key)
+                    if value is not None:
+                        cache_span.set(cache="hit")
+                        return value
+                    inflight = self._inflight.get(key)
+                if inflight is not None:
+                    self.stats["coalesced"] += 1
+                    cache_span.set(cache="coalesced")
+                    try:
+                        return await asyncio.shield(inflight)
+                    except _Abandoned:
+                        continue
+                break
+
+            cache_span.set(cache="miss")
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                value = await compute()
+            except asyncio.CancelledError:
+                future.set_exception(_Abandoned())
+                future.exception()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # Mark retrieved so a lone caller doesn't trigger "exception never retrieved"
+                future.exception()
+                raise
+            else:
+                future.set_result(value)
+                if should_store(value):
+                    await self.set(key, value)
+                return value
+            finally:
+                del self._inflight[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "memory_entries": len(self._entries)}
@@ -0,0 +1,157 @@
+"""Admission control for outbound LLM calls.
+
+Every LLM request takes a slot from ``LlmLimiter`` first. The limiter caps
+the number of calls in flight, paces call starts with a token bucket (requests
+per minute) and lets only a bounded number of callers wait. When the wait
+queue is full, or a caller has waited too long, it is rejected immediately
+with 429 and a Retry-After estimate instead of piling onto a rate-limited
+provider.
+"""
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def take(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class LlmLimiter:
+    """
+    Configuration (environment variables, overridable via constructor):
+        LLM_MAX_IN_FLIGHT        concurrent LLM calls per worker (default: 8)
+        LLM_REQUESTS_PER_MINUTE  call starts per minute, 0 for unlimited (default: 120)
+        LLM_MAX_QUEUE            callers allowed to wait for a slot (default: 32)
+        LLM_QUEUE_TIMEOUT        seconds a caller may wait before being rejected (default: 30)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        self.max_in_flight = max_in_flight if max_in_flight is not None else int(
+            os.environ.get('LLM_MAX_IN_FLIGHT', 8)
+        )
+        self.requests_per_minute = requests_per_minute if requests_per_minute is not None else float(
+            os.environ.get('LLM_REQUESTS_PER_MINUTE', 120)
+        )
+        self.max_queue = max_queue if max_queue is not None else int(
+            os.environ.get('LLM_MAX_QUEUE', 32)
+        )
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(
+            os.environ.get('LLM_QUEUE_TIMEOUT', 30)
+        )
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._bucket = None
+        if self.requests_per_minute > 0:
+            self._bucket = TokenBucket(self.requests_per_minute / 60, capacity=max(1, self.max_in_flight))
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        # Moving average of call duration, used for Retry-After estimates
+        self.avg_call_seconds = 10.0
+
+    def retry_after(self) -> int:
+        backlog = (self.queued + self.in_flight) / max(1, self.max_in_flight)
+        return max(1, math.ceil(backlog * self.avg_call_seconds))
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        raise HTTPException(
+            status_code=429,
+            detail=f"AI service is busy ({reason}), please retry shortly",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    async def acquire(self):
+        if self._slots.locked() and self.queued >= self.max_queue:
+            self._reject("queue full")
+
+        self.queued += 1
+        started = time.monotonic()
+        acquired = False
+
+        async def take_slot():
+            nonlocal acquired
+            await self._slots.acquire()
+            acquired = True
+
+        try:
+            try:
+                await asyncio.wait_for(take_slot(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                # wait_for can time out just as the slot is granted; use the slot rather than leak it
+                if not acquired:
+                    self._reject("queue timeout")
+            if self._bucket is not None:
+                await self._bucket.take()
+        except BaseException:
+            # Likewise a cancellation racing the grant must hand the slot back
+            if acquired:
+                self._slots.release()
+            raise
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.in_flight += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def release(self, call_seconds: float):
+        self.in_flight -= 1
+        self.avg_call_seconds = 0.8 * self.avg_call_seconds + 0.2 * call_seconds
+        self._slots.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold an LLM slot for the duration of the block"""
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "requests_per_minute": self.requests_per_minute,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.total_wait_seconds / self.admitted if self.admitted else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_call_seconds": self.avg_call_seconds,
+        }
@@ -0,0 +1,250 @@
+"""Opt-in per-request profiling, toggled by a request header.
+
+A request carrying ``X-Profile-Token: <PROFILE_TOKEN>`` is profiled while it
+runs:
+
+* a sampling thread records the event-loop thread's Python stack every
+  ``PROFILE_INTERVAL_MS``; each sample is rooted at ``[request]`` when the
+  profiled request's task was running and ``[other]`` otherwise, so time lost
+  to concurrent requests blocking the loop is visible too. Samples idling in
+  the selector are time spent awaiting I/O (LLM calls, Mongo). Work done in the
+  document process pool shows up as that wait, not as its own stacks;
+* tracemalloc reports the peak and the top allocation sites by growth.
+
+The profile is written to ``PROFILE_DIR/<profile id>.json`` (stacks in folded
+format, ready for flamegraph.pl or speedscope), the id is returned in the
+``X-Profile-Id`` response header, and ``GET /api/admin/profiles/<id>`` serves it
+to callers presenting the same token. Without ``PROFILE_TOKEN`` the middleware
+is not installed at all; with it, an unprofiled request costs one header scan.
+"""
+import asyncio
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+ADMIN_PATH_PREFIX = "/api/admin/"
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _running_task(loop):
+    try:
+        return asyncio.tasks._current_tasks.get(loop)
+    except AttributeError:  # Private API; attribution is best effort
+        return None
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float, loop=None, task=None, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.loop = loop
+        self.task = task
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            root = "[request]" if self.task is not None and _running_task(self.loop) is self.task else "[other]"
+            labels.append(root)
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+class RequestProfiler:
+    """
+    Configuration (environment variables, overridable via constructor):
+        PROFILE_TOKEN           shared secret the request header must carry; unset disables profiling
+        PROFILE_DIR             directory for profile files (default: ./profiles)
+        PROFILE_INTERVAL_MS     stack sampling interval (default: 5)
+        PROFILE_TOP_ALLOCATIONS allocation sites kept per profile (default: 25)
+        PROFILE_MAX_CONCURRENT  requests profiled at once; others run unprofiled (default: 1)
+        PROFILE_MAX_FILES       newest profiles kept on disk (default: 200)
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        profile_dir: Optional[str] = None,
+        interval_ms: Optional[float] = None,
+        top_allocations: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        max_files: Optional[int] = None,
+    ):
+        self.token = token if token is not None else os.environ.get('PROFILE_TOKEN', '')
+        self.profile_dir = profile_dir or os.environ.get('PROFILE_DIR', 'profiles')
+        self.interval = (interval_ms if interval_ms is not None else float(
+            os.environ.get('PROFILE_INTERVAL_MS', 5)
+        )) / 1000
+        self.top_allocations = top_allocations if top_allocations is not None else int(
+            os.environ.get('PROFILE_TOP_ALLOCATIONS', 25)
+        )
+        self.max_concurrent = max_concurrent if max_concurrent is not None else int(
+            os.environ.get('PROFILE_MAX_CONCURRENT', 1)
+        )
+        self.max_files = max_files if max_files is not None else int(
+            os.environ.get('PROFILE_MAX_FILES', 200)
+        )
+        self.active = 0
+        self._tracemalloc_owned = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, presented: Optional[str]) -> bool:
+        # compare_digest rejects non-ASCII str, and header values are any latin-1 text
+        return self.enabled and presented is not None and hmac.compare_digest(
+            presented.encode("utf-8"), self.token.encode("utf-8")
+        )
+
+    def profile_path(self, profile_id: str) -> Optional[str]:
+        # Ids are uuid hex; anything else cannot name a profile
+        if len(profile_id) != 32 or any(c not in "0123456789abcdef" for c in profile_id):
+            return None
+        return os.path.join(self.profile_dir, f"{profile_id}.json")
+
+    def load(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self.profile_path(profile_id)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.profile_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.profile_dir):
+            if name.endswith(".json"):
+                path = os.path.join(self.profile_dir, name)
+                entries.append({"id": name[:-5], "size_bytes": os.path.getsize(path), "mtime": os.path.getmtime(path)})
+        return sorted(entries, key=lambda entry: entry["mtime"], reverse=True)
+
+    def _write(self, profile: Dict[str, Any]):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = self.profile_path(profile["id"])
+        with open(path + ".tmp", "w") as f:
+            json.dump(profile, f)
+        os.replace(path + ".tmp", path)
+        for stale in self.list_profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.profile_dir, f"{stale['id']}.json"))
+            except OSError:
+                pass
+
+    def _start_tracemalloc(self):
+        if self.active == 1 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._tracemalloc_owned = True
+        tracemalloc.reset_peak()
+        return tracemalloc.take_snapshot()
+
+    def _stop_tracemalloc(self, before) -> Dict[str, Any]:
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self.active == 0 and self._tracemalloc_owned:
+            tracemalloc.stop()
+            self._tracemalloc_owned = False
+        top = after.compare_to(before, "lineno")[:self.top_allocations]
+        return {
+            "peak_kb": round(peak / 1024, 1),
+            "top_allocations": [
+                {"site": str(stat.traceback[0]), "size_diff_kb": round(stat.size_diff / 1024, 1),
+                 "count_diff": stat.count_diff}
+                for stat in top
+            ],
+        }
+
+    async def profile(self, app, scope, receive, send):
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (PROFILE_ID_HEADER, profile_id.encode("ascii"))]}
+            await send(message)
+
+        self.active += 1
+        loop = asyncio.get_running_loop()
+        sampler = StackSampler(threading.get_ident(), self.interval, loop, asyncio.current_task())
+        memory_before = self._start_tracemalloc()
+        started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await app(scope, receive, send_with_id)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            self.active -= 1
+            memory = self._stop_tracemalloc(memory_before)
+            profile = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "started_at": started_at,
+                "duration_ms": round(duration * 1e3, 2),
+                "sample_interval_ms": self.interval * 1e3,
+                "samples": sampler.samples,
+                "folded": dict(sampler.stacks.most_common()),
+                "memory": memory,
+            }
+            await loop.run_in_executor(None, self._write, profile)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; add it only when the profiler is enabled"""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    # The admin endpoints take the same header; fetching a profile is not worth profiling
+                    if (not scope["path"].startswith(ADMIN_PATH_PREFIX)
+                            and self.profiler.authorized(value.decode("latin-1"))
+                            and self.profiler.active < self.profiler.max_concurrent):
+                        await self.profiler.profile(self.app, scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
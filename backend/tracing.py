@@ -0,0 +1,408 @@
+"""Request tracing: nested spans exported to local JSONL files.
+
+``Tracer.start_trace`` opens a root span, continuing the caller's trace when
+given a W3C ``traceparent`` header. Inside it, ``span(name, **attributes)``
+opens a child of whatever span is current; the current span lives in a
+context variable, so it follows the request through awaits, ``gather`` and
+tasks it creates. Outside a trace ``span`` returns a shared no-op, so
+instrumented code costs next to nothing when tracing is off or a request was
+not sampled.
+
+``TracingMiddleware`` starts a root span per HTTP request and echoes the
+``traceparent`` of that span in the response. The frontend sends one trace id
+for a whole upload -> tailor -> download session, so the spans of all three
+requests share a trace. Finished spans are written by a background thread to
+``TRACE_DIR/spans-<date>-<pid>.jsonl``, one JSON object per line:
+
+    {"trace_id", "span_id", "parent_id", "name", "start", "duration_ms", "status", "error", "attributes"}
+
+The files are analysed offline with ``python tracing.py``: ``stages`` prints
+latency percentiles per span name, ``slow`` follows the longest child down
+from each request above a percentile and counts where it ends up (the usual
+cause of tail latency), and ``show <trace id>`` prints one trace as a timeline.
+"""
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+TRACEPARENT_HEADER = b"traceparent"
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class TraceParent(NamedTuple):
+    trace_id: str
+    parent_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceParent]:
+    """Parse a version-00 W3C traceparent; None if absent or malformed"""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return TraceParent(match.group(1), match.group(2), bool(int(match.group(3), 16) & 1))
+
+
+class Span:
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "attributes", "start", "_started",
+                 "duration_ms", "error")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self._started) * 1e3, 3)
+        self.tracer.exporter.export({
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": datetime.fromtimestamp(self.start, timezone.utc).isoformat(),
+            "duration_ms": self.duration_ms,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        })
+
+
+class _NoopSpan:
+    traceparent = None
+
+    def set(self, **attributes: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span():
+    return _current_span.get() or NOOP_SPAN
+
+
+def set_attributes(**attributes: Any):
+    """Add attributes to the current span, if any"""
+    current_span().set(**attributes)
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            pass  # A streaming generator finalized from another context; that context never saw the span
+        span.finish()
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """Child of the current span; a no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _activate(Span(parent.tracer, name, parent.trace_id, parent.span_id, attributes)) as child:
+        yield child
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a daily JSONL file per process from a background thread"""
+
+    def __init__(self, directory: str, flush_seconds: float = 1.0):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict[str, Any]):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(record)
+
+    def _write(self, records):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"spans-{datetime.now(timezone.utc):%Y%m%d}-{os.getpid()}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            records = []
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                try:
+                    record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                records.append(record)
+            if records:
+                try:
+                    self._write(records)
+                except OSError:
+                    pass  # Tracing must never take the app down; drop the batch
+
+    def shutdown(self):
+        """Flush queued spans and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class Tracer:
+    """
+    Configuration (environment variables, overridable via constructor):
+        TRACING             "true" to record traces (default: false)
+        TRACE_DIR           directory for span files (default: ./traces)
+        TRACE_SAMPLE_RATE   share of requests traced (default: 1.0)
+
+    Any client can send a traceparent, so a request's sampled flag is ignored and
+    each request is sampled on its own; below 1.0 a browser session's trace may
+    hold only some of its requests. Only callers passing ``trust_sampled`` (the
+    job queue, continuing a traceparent this server wrote) have the flag honoured.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        trace_dir: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        exporter=None,
+    ):
+        self.enabled = enabled if enabled is not None else os.environ.get('TRACING', 'false').lower() == 'true'
+        self.sample_rate = sample_rate if sample_rate is not None else float(
+            os.environ.get('TRACE_SAMPLE_RATE', 1.0)
+        )
+        self.exporter = exporter or JsonlSpanExporter(trace_dir or os.environ.get('TRACE_DIR', 'traces'))
+
+    @contextmanager
+    def start_trace(self, name: str, traceparent: Optional[str] = None, trust_sampled: bool = False,
+                    **attributes: Any):
+        """Root span for a request or job, continuing ``traceparent`` when valid"""
+        parent = parse_traceparent(traceparent) if self.enabled else None
+        if parent is not None and trust_sampled:
+            sampled = parent.sampled
+        else:
+            sampled = random.random() < self.sample_rate
+        if not self.enabled or not sampled:
+            yield NOOP_SPAN
+            return
+        trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        root = Span(self, name, trace_id, parent.parent_id if parent is not None else None, attributes)
+        with _activate(root):
+            yield root
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware: one root span per HTTP request, named after the route template"""
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = next((value.decode("latin-1") for name, value in scope["headers"]
+                            if name == TRACEPARENT_HEADER), None)
+        with self.tracer.start_trace(f"{scope['method']} {scope['path']}", traceparent,
+                                     **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+            async def send_with_traceparent(message):
+                if message["type"] == "http.response.start":
+                    root.set(**{"http.status_code": message["status"]})
+                    if root.traceparent:
+                        message = {**message, "headers": [*message.get("headers", []),
+                                                          (TRACEPARENT_HEADER, root.traceparent.encode("ascii"))]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_traceparent)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route and isinstance(root, Span):
+                    root.name = f"{scope['method']} {route}"
+                    root.set(**{"http.route": route})
+
+
+def read_spans(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def _children(spans: List[Dict[str, Any]]) -> Dict[Optional[str], List[Dict[str, Any]]]:
+    children = defaultdict(list)
+    for record in spans:
+        children[record["parent_id"]].append(record)
+    for siblings in children.values():
+        siblings.sort(key=lambda record: record["start"])
+    return children
+
+
+def _span_label(record: Dict[str, Any]) -> str:
+    stage = record["attributes"].get("llm.stage")
+    return f"{record['name']} [{stage}]" if stage else record["name"]
+
+
+def _end(record: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(record["start"]) + timedelta(milliseconds=record["duration_ms"])
+
+
+def _detached(record: Dict[str, Any], spans_by_id: Dict[str, Dict[str, Any]]) -> bool:
+    """True for request spans and for background work (jobs, pre-renders) that outlived its parent"""
+    parent = spans_by_id.get(record["parent_id"])
+    return parent is None or _end(record) > _end(parent) + timedelta(milliseconds=1)
+
+
+def critical_path(root: Dict[str, Any], children, spans_by_id) -> List[Dict[str, Any]]:
+    """Spans from ``root`` down through the longest attached child at each level"""
+    path = [root]
+    while True:
+        attached = [child for child in children.get(path[-1]["span_id"], []) if not _detached(child, spans_by_id)]
+        if not attached:
+            return path
+        path.append(max(attached, key=lambda record: record["duration_ms"]))
+
+
+def stage_latencies(spans: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    durations = defaultdict(list)
+    for record in spans:
+        durations[_span_label(record)].append(record["duration_ms"])
+    stats = {}
+    for label, values in durations.items():
+        values.sort()
+        stats[label] = {"count": len(values), "p50_ms": _percentile(values, 0.5),
+                        "p95_ms": _percentile(values, 0.95), "p99_ms": _percentile(values, 0.99)}
+    return stats
+
+
+def slow_request_causes(spans: Iterable[Dict[str, Any]], fraction: float = 0.95) -> Dict[str, Counter]:
+    """Per request span name, count the critical-path leaf of requests slower than the ``fraction`` percentile.
+
+    Requests are spans without a parent in the same files (browser-sent parent
+    ids are never exported) plus background work that outlived its parent, so
+    a queued job or pre-render is judged on its own rather than blamed on the
+    request that scheduled it.
+    """
+    spans = list(spans)
+    spans_by_id = {record["span_id"]: record for record in spans}
+    children = _children(spans)
+    requests = defaultdict(list)
+    for record in spans:
+        if _detached(record, spans_by_id):
+            requests[record["name"]].append(record)
+    causes = {}
+    for name, roots in requests.items():
+        threshold = _percentile(sorted(root["duration_ms"] for root in roots), fraction)
+        causes[name] = Counter(
+            _span_label(critical_path(root, children, spans_by_id)[-1])
+            for root in roots if root["duration_ms"] >= threshold
+        )
+    return causes
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="Summarize span files written by the JSONL exporter")
+    parser.add_argument("--dir", default=os.environ.get('TRACE_DIR', 'traces'), help="default: TRACE_DIR")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stages", help="latency percentiles per span name")
+    slow = commands.add_parser("slow", help="where the slowest requests spent their time")
+    slow.add_argument("--percentile", type=float, default=95)
+    show = commands.add_parser("show", help="print one trace as a timeline")
+    show.add_argument("trace_id")
+    args = parser.parse_args(argv)
+
+    spans = list(read_spans(sorted(glob.glob(os.path.join(args.dir, "spans-*.jsonl")))))
+    if args.command == "stages":
+        print(f"{'span':<48} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for label, stats in sorted(stage_latencies(spans).items()):
+            print(f"{label:<48} {stats['count']:>7} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+                  f"{stats['p99_ms']:>9.1f}")
+    elif args.command == "slow":
+        for name, causes in sorted(slow_request_causes(spans, args.percentile / 100).items()):
+            print(f"{name} (p{args.percentile:g} and slower: {sum(causes.values())} requests)")
+            for label, count in causes.most_common():
+                print(f"    {count:>6}  {label}")
+    else:
+        trace = [record for record in spans if record["trace_id"] == args.trace_id]
+        if not trace:
+            parser.error(f"no spans for trace {args.trace_id}")
+        span_ids = {record["span_id"] for record in trace}
+        children = _children(trace)
+        started = min(datetime.fromisoformat(record["start"]) for record in trace)
+
+        def print_tree(record, depth):
+            offset = (datetime.fromisoformat(record["start"]) - started).total_seconds() * 1e3
+            attributes = " ".join(f"{key}={value}" for key, value in record["attributes"].items())
+            print(f"{offset:>10.1f} {record['duration_ms']:>10.1f}  {'  ' * depth}{record['name']}  {attributes}"
+                  + (f"  ERROR {record['error']}" if record["error"] else ""))
+            for child in children.get(record["span_id"], []):
+                print_tree(child, depth + 1)
+
+        print(f"{'start ms':>10} {'took ms':>10}  span")
+        for root in sorted((r for r in trace if r["parent_id"] not in span_ids), key=lambda r: r["start"]):
+            print_tree(root, 0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark paragraph-to-line alignment against document size.
+
+Compares the indexed alignment engine (backend/alignment.py) with the previous
+all-pairs word-overlap matcher. Usage:
+
+    python benchmarks/bench_alignment.py [--sizes 50 100 200 ...] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from alignment import align_lines  # noqa: E402
+
+VOCABULARY = (
+    "python java sql aws gcp azure docker kubernetes terraform spark kafka airflow react node django flask "
+    "fastapi postgresql mongodb redis pipeline model latency throughput customers revenue platform service "
+    "migration dashboard analytics reporting testing automation security compliance onboarding mentoring"
+).split()
+FILLER = "and the of to with for in on by a".split()
+
+
+def synthetic_resume(paragraph_count: int, seed: int = 7):
+    """Paragraphs of a long resume and an LLM-style rewrite of each"""
+    rng = random.Random(seed)
+    paragraphs, lines = [], []
+    for i in range(paragraph_count):
+        words = rng.sample(VOCABULARY, 6) + rng.choices(FILLER, k=4) + [f"project{i}", f"{rng.randint(5, 95)}%"]
+        rng.shuffle(words)
+        paragraph = "• " + " ".join(words)
+        rewritten = words[:]
+        rewritten[rng.randrange(len(rewritten))] = rng.choice(VOCABULARY)
+        paragraphs.append(paragraph)
+        lines.append("• " + " ".join(rewritten))
+    return paragraphs, lines
+
+
+def legacy_align(paragraphs, lines):
+    """The matcher previously inlined in create_tailored_docx_with_formatting"""
+    result = []
+    for paragraph in paragraphs:
+        best_match, best_score = None, 0
+        for line in lines:
+            score = len(set(paragraph.lower().split()) & set(line.lower().split()))
+            if score > best_score:
+                best_score, best_match = score, line
+        result.append(best_match)
+    return result
+
+
+def best_time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400, 800, 1600, 3200])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-max', type=int, default=1600, help="largest size to run the legacy matcher on")
+    args = parser.parse_args()
+
+    print(f"{'paragraphs':>10} {'indexed ms':>11} {'us/para':>8} {'legacy ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        paragraphs, lines = synthetic_resume(size)
+        indexed = best_time(lambda: align_lines(paragraphs, lines), args.repeat)
+        row = f"{size:>10} {indexed * 1000:>11.2f} {indexed / size * 1e6:>8.1f}"
+        if size <= args.legacy_max:
+            legacy = best_time(lambda: legacy_align(paragraphs, lines), args.repeat)
+            row += f" {legacy * 1000:>10.2f} {legacy / indexed:>7.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
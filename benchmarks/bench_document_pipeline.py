@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark the DOCX pipeline offline over a synthetic resume corpus.
+
+Times text extraction, formatting-preserving rendering (both the XML patch
+path and the python-docx path) and simple rendering for every corpus case,
+with Python heap peaks (tracemalloc) and resident-set growth. Each case runs
+in a forked child so memory figures are not polluted by earlier cases.
+
+Writes a JSON report; compare it with one from another commit to catch
+regressions (exit status 1 when any operation got slower or hungrier than the
+threshold allows). Usage:
+
+    python benchmarks/bench_document_pipeline.py [--sizes small medium large] [--repeat 5] [--out report.json]
+    python benchmarks/bench_document_pipeline.py --compare baseline.json [--threshold 0.2]
+    python benchmarks/bench_document_pipeline.py --compare baseline.json --current report.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+# server.py reads these at import; nothing here touches the database
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+
+from resume_corpus import RICHNESS_LEVELS, SIZES, build_corpus, tailored_variant  # noqa: E402
+import server  # noqa: E402
+
+OPERATIONS = {
+    "extract_text": lambda case: server.extract_text_and_structure_from_docx(case["docx"]),
+    "render_patch": lambda case: server.patch_tailored_docx(case["docx"], case["tailored"]),
+    "render_python_docx": lambda case: server.create_tailored_docx_with_formatting(
+        case["docx"], case["text"], case["tailored"]),
+    "render_simple": lambda case: server.create_simple_formatted_docx(case["tailored"]),
+}
+
+# Differences below these are noise, whatever the ratio
+MIN_TIME_DELTA_MS = 0.5
+MIN_MEMORY_DELTA_KB = 256
+
+
+def max_rss_kb() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage  # bytes on macOS, KiB on Linux
+
+
+def measure(operation: str, case, repeat: int):
+    fn = OPERATIONS[operation]
+    rss_before = max_rss_kb()
+    output = fn(case)  # Warm-up; also the output size reported
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(case)
+        timings.append((time.perf_counter() - started) * 1e3)
+    rss_growth = max_rss_kb() - rss_before
+
+    tracemalloc.start()
+    fn(case)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if isinstance(output, tuple):
+        output = output[0]
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "tracemalloc_peak_kb": round(peak / 1024, 1),
+        "rss_growth_kb": rss_growth,
+        "output_bytes": len(output.encode("utf-8") if isinstance(output, str) else output or b""),
+    }
+
+
+def _child(conn, operation, case, repeat):
+    try:
+        conn.send(("ok", measure(operation, case, repeat)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def measure_isolated(operation: str, case, repeat: int):
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(sender, operation, case, repeat))
+    process.start()
+    sender.close()
+    status, result = receiver.recv()
+    process.join()
+    if status != "ok":
+        raise RuntimeError(f"{operation} failed: {result}")
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run(args):
+    isolate = not args.no_isolate and "fork" in multiprocessing.get_all_start_methods()
+    results = []
+    print(f"{'case':<20} {'input KB':>9} {'operation':<19} {'p50 ms':>9} {'min ms':>9} "
+          f"{'heap peak KB':>12} {'rss +KB':>8}")
+    for corpus_case in build_corpus(args.sizes, args.richness, include_seeds=not args.no_seeds):
+        text, _ = server.extract_text_and_structure_from_docx(corpus_case.docx)
+        case = {"docx": corpus_case.docx, "text": text, "tailored": tailored_variant(text, seed=len(results))}
+        for operation in args.operations:
+            stats = (measure_isolated if isolate else measure)(operation, case, args.repeat)
+            results.append({
+                "case": corpus_case.name,
+                "richness": corpus_case.richness,
+                "roles": corpus_case.roles,
+                "bullets_per_role": corpus_case.bullets_per_role,
+                "input_bytes": len(corpus_case.docx),
+                "operation": operation,
+                **stats,
+            })
+            print(f"{corpus_case.name:<20} {len(corpus_case.docx) / 1024:>9.1f} {operation:<19} "
+                  f"{stats['p50_ms']:>9.2f} {stats['min_ms']:>9.2f} {stats['tracemalloc_peak_kb']:>12.0f} "
+                  f"{stats['rss_growth_kb']:>8}")
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "isolated": isolate,
+            "docx_render_mode": server.DOCX_RENDER_MODE,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold: float) -> int:
+    """Print per-operation changes; return the number of regressions"""
+    def keyed(report):
+        return {(r["case"], r["operation"]): r for r in report["results"]}
+
+    before, after = keyed(baseline), keyed(current)
+    print(f"baseline {baseline['meta']['commit']} -> current {current['meta']['commit']} "
+          f"(threshold {threshold:.0%})")
+    print(f"{'case':<20} {'operation':<19} {'p50 ms':>17} {'change':>8} {'heap peak KB':>19} {'change':>8}")
+    regressions = 0
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        time_ratio = new["p50_ms"] / old["p50_ms"] if old["p50_ms"] else 1.0
+        memory_ratio = new["tracemalloc_peak_kb"] / old["tracemalloc_peak_kb"] if old["tracemalloc_peak_kb"] else 1.0
+        slower = time_ratio > 1 + threshold and new["p50_ms"] - old["p50_ms"] > MIN_TIME_DELTA_MS
+        hungrier = (memory_ratio > 1 + threshold
+                    and new["tracemalloc_peak_kb"] - old["tracemalloc_peak_kb"] > MIN_MEMORY_DELTA_KB)
+        flag = "  REGRESSION" if slower or hungrier else ""
+        regressions += bool(flag)
+        print(f"{key[0]:<20} {key[1]:<19} {old['p50_ms']:>8.2f}>{new['p50_ms']:<8.2f} {time_ratio - 1:>+8.0%} "
+              f"{old['tracemalloc_peak_kb']:>9.0f}>{new['tracemalloc_peak_kb']:<9.0f} {memory_ratio - 1:>+8.0%}{flag}")
+    for key in sorted(before.keys() - after.keys()):
+        print(f"{key[0]:<20} {key[1]:<19} missing from current report")
+    print(f"{regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=tuple(SIZES), default=["small", "medium", "large"])
+    parser.add_argument('--richness', nargs='+', choices=RICHNESS_LEVELS, default=list(RICHNESS_LEVELS))
+    parser.add_argument('--operations', nargs='+', choices=tuple(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-seeds', action='store_true', help="skip the test-suite seed documents")
+    parser.add_argument('--no-isolate', action='store_true', help="measure in-process instead of a child per case")
+    parser.add_argument('--out', help="write the JSON report here")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against a previous JSON report")
+    parser.add_argument('--current', help="with --compare: use this report instead of running the benchmark")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current requires --compare")
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run(args)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"report written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(baseline, report, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
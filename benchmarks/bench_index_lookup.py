@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark download lookups (find_one by analysis id) as resume_analyses grows.
+
+Seeds the collection to each size, measures lookup latency with the indexes
+declared in backend/db_indexes.py and, for sizes up to --scan-max, without
+them (a collection scan). Runs against the in-process Mongo stand-in by
+default; pass --mongo-url to run against a real server (a throwaway database
+is created and dropped). Usage:
+
+    python benchmarks/bench_index_lookup.py [--sizes 10000 100000 1000000] [--lookups 2000]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'backend'))
+
+from db_indexes import DECLARED_INDEXES, ensure_indexes  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+
+ANALYSIS_INDEXES = [spec for spec in DECLARED_INDEXES if spec.collection == "resume_analyses"]
+SEED_BATCH = 10000
+
+
+def synthetic_analysis(i: int, rng: random.Random, start: datetime):
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "original_text": f"Resume {i}",
+        "resume_id": hashlib.sha256(str(i % 5000).encode()).hexdigest(),
+        "job_description": f"Job description {i % 997}",
+        "tailored_resume": f"Tailored resume {i}",
+        "ats_score": rng.randint(30, 98),
+        "suggestions": ["Quantify achievements"],
+        "created_at": (start + timedelta(seconds=i)).isoformat(),
+    }
+
+
+async def grow(collection, ids, target, rng, start):
+    while len(ids) < target:
+        batch = [synthetic_analysis(len(ids) + n, rng, start) for n in range(min(SEED_BATCH, target - len(ids)))]
+        await collection.insert_many(batch, ordered=False)
+        ids.extend(doc["id"] for doc in batch)
+
+
+async def measure(collection, ids, lookups, rng):
+    timings = []
+    for analysis_id in rng.sample(ids, min(lookups, len(ids))):
+        started = time.perf_counter()
+        doc = await collection.find_one({"id": analysis_id})
+        timings.append(time.perf_counter() - started)
+        assert doc is not None
+    timings.sort()
+    return statistics.median(timings) * 1e3, timings[int(len(timings) * 0.99) - 1 if len(timings) > 1 else 0] * 1e3
+
+
+async def drop_declared(collection):
+    information = await collection.index_information()
+    for spec in ANALYSIS_INDEXES:
+        if spec.name in information:
+            await collection.drop_index(spec.name)
+
+
+async def run(args):
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongo_url)
+        await client.drop_database("bench_index_lookup")
+    else:
+        client = LocalMongoClient()
+    db = client["bench_index_lookup"]
+    collection = db.resume_analyses
+
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ids = []
+    print(f"{'analyses':>10} {'seed s':>7} {'index build s':>13} {'indexed p50 ms':>15} "
+          f"{'p99 ms':>8} {'scan p50 ms':>12}")
+    try:
+        for size in sorted(args.sizes):
+            seed_started = time.perf_counter()
+            await grow(collection, ids, size, rng, start)
+            seed_seconds = time.perf_counter() - seed_started
+
+            scan = ""
+            if size <= args.scan_max:
+                await drop_declared(collection)
+                scan_p50, _ = await measure(collection, ids, args.scan_lookups, rng)
+                scan = f"{scan_p50:>12.2f}"
+
+            build_started = time.perf_counter()
+            failed = await ensure_indexes(db, ANALYSIS_INDEXES)
+            if failed:
+                raise RuntimeError(f"index build failed: {failed}")
+            build_seconds = time.perf_counter() - build_started
+
+            p50, p99 = await measure(collection, ids, args.lookups, rng)
+            print(f"{size:>10} {seed_seconds:>7.1f} {build_seconds:>13.2f} {p50:>15.4f} {p99:>8.4f} {scan}")
+    finally:
+        if args.mongo_url:
+            await client.drop_database("bench_index_lookup")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--scan-max', type=int, default=100000, help="largest size to also measure without indexes")
+    parser.add_argument('--scan-lookups', type=int, default=20)
+    parser.add_argument('--mongo-url', help="benchmark a real MongoDB instead of the in-process stand-in")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
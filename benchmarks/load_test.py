@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+In-process load test of the FastAPI app with a fake LLM and local Mongo.
+
+Runs backend/server.py in this process with LLM_BACKEND=fake (simulated
+latency and generation time, see backend/llm_backends.py) and the in-process
+Mongo stand-in from local_mongo.py, then drives it through httpx's ASGI
+transport with concurrent virtual users. Each user uploads a synthetic
+resume, tailors it against a job description, downloads the result and lists
+recent analyses. Reports throughput and p50/p95/p99 latency per endpoint,
+status code counts (429 means the LLM limiter shed load) and event-loop lag:
+a probe task that should wake every 10ms, so large lag means something is
+blocking the loop. Requires httpx. Usage:
+
+    python benchmarks/load_test.py [--users 16] [--duration 30] [--llm-latency lognormal:1.5:0.5]
+                                   [--llm-tps 80] [--ats-engine llm] [--mode standard] [--repeat-resumes]
+                                   [--json-out report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'backend'))
+
+JOB_DESCRIPTIONS = [
+    "Senior Backend Engineer\nRequirements:\n- Python, FastAPI, PostgreSQL\n- Kubernetes, Terraform, AWS\n"
+    "- Event-driven architecture with Kafka\nNice to have:\n- GraphQL, observability tooling",
+    "Data Engineer\nResponsibilities:\n- Build data pipelines with Spark and Airflow\n- Model data in Snowflake\n"
+    "Requirements:\n- SQL, Python, dbt\n- Stakeholder communication",
+    "Machine Learning Engineer\nRequirements:\n- PyTorch or TensorFlow\n- MLOps, Docker, Kubernetes\n"
+    "- Experience shipping recommendation systems\nPreferred:\n- Feature stores, A/B testing",
+    "Full Stack Developer\nWhat you'll do:\n- React and TypeScript front ends\n- Node.js and Python services\n"
+    "Requirements:\n- REST API design, MongoDB, Redis\n- CI/CD with GitHub Actions",
+]
+LAG_PROBE_SECONDS = 0.01
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def configure_environment(args):
+    """Select the fake LLM and local Mongo before server.py is imported"""
+    os.environ['LLM_BACKEND'] = 'fake'
+    os.environ['FAKE_LLM_LATENCY'] = args.llm_latency
+    os.environ['FAKE_LLM_TOKENS_PER_SECOND'] = str(args.llm_tps)
+    os.environ['FAKE_LLM_INVALID_JSON_RATE'] = str(args.invalid_json_rate)
+    os.environ['FAKE_LLM_SEED'] = str(args.seed)
+    os.environ.setdefault('MONGO_URL', 'mongodb://load-test')
+    # Nothing to archive in a fresh in-process database
+    os.environ['ANALYSIS_ARCHIVE_AFTER_DAYS'] = '0'
+
+    import motor.motor_asyncio
+    from local_mongo import LocalMongoClient
+    motor.motor_asyncio.AsyncIOMotorClient = LocalMongoClient
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, seconds: float, status: int):
+        self.latencies[endpoint].append(seconds * 1e3)
+        self.statuses[endpoint][status] += 1
+
+
+async def timed(recorder: Recorder, endpoint: str, request):
+    started = time.perf_counter()
+    try:
+        response = await request
+    except Exception:
+        recorder.record(endpoint, time.perf_counter() - started, 0)  # 0 = transport error
+        return None
+    recorder.record(endpoint, time.perf_counter() - started, response.status_code)
+    return response
+
+
+async def virtual_user(client, recorder: Recorder, resumes, args, deadline: float, rng: random.Random):
+    while time.perf_counter() < deadline:
+        name, docx = rng.choice(resumes)
+        upload = await timed(recorder, "POST /api/upload-resume", client.post(
+            "/api/upload-resume", files={"file": (f"{name}.docx", docx, "application/octet-stream")}))
+        if upload is None or upload.status_code != 200:
+            continue
+        uploaded = upload.json()
+
+        resume_text = uploaded["text"]
+        if not args.repeat_resumes:
+            # Real traffic rarely repeats a resume/job pair; keep the LLM cache from absorbing the load
+            resume_text += f"\nReference: {rng.getrandbits(32):08x}"
+        tailor = await timed(recorder, "POST /api/tailor-resume", client.post("/api/tailor-resume", data={
+            "resume_text": resume_text,
+            "job_description": rng.choice(JOB_DESCRIPTIONS),
+            "resume_id": uploaded["resume_id"],
+            "mode": args.mode,
+            "ats_engine": args.ats_engine,
+        }))
+        if tailor is not None and tailor.status_code == 200:
+            analysis_id = tailor.json()["analysis_id"]
+            await timed(recorder, "GET /api/download-resume/{id}",
+                        client.get(f"/api/download-resume/{analysis_id}"))
+
+        await timed(recorder, "GET /api/analyses", client.get("/api/analyses", params={"limit": 20}))
+
+
+async def lag_probe(lags, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_SECONDS)
+        lags.append((time.perf_counter() - started - LAG_PROBE_SECONDS) * 1e3)
+
+
+async def run(args):
+    import httpx
+
+    from resume_corpus import SIZES, generate_resume
+    import server
+
+    resumes = []
+    for size in args.resume_sizes:
+        roles, bullets = SIZES[size]
+        for richness in ("plain", "rich"):
+            resumes.append((f"{size}-{richness}", generate_resume(roles, bullets, richness, seed=len(resumes))))
+
+    await server.app.router.startup()
+    recorder = Recorder()
+    lags = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(lag_probe(lags, stop))
+    transport = httpx.ASGITransport(app=server.app)
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                virtual_user(client, recorder, resumes, args, deadline, random.Random(args.seed + user))
+                for user in range(args.users)
+            ))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+        await server.app.router.shutdown()
+
+    report = {"config": {key: value for key, value in vars(args).items() if key != "json_out"},
+              "elapsed_seconds": round(elapsed, 2), "endpoints": {}}
+    print(f"{args.users} users for {elapsed:.1f}s, LLM latency {args.llm_latency} at {args.llm_tps} tokens/s")
+    print(f"{'endpoint':<32} {'requests':>8} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'max ms':>9}  statuses")
+    for endpoint, values in sorted(recorder.latencies.items()):
+        values.sort()
+        stats = {
+            "requests": len(values),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50), 2),
+            "p95_ms": round(percentile(values, 0.95), 2),
+            "p99_ms": round(percentile(values, 0.99), 2),
+            "max_ms": round(values[-1], 2),
+            "statuses": {str(code): count for code, count in sorted(recorder.statuses[endpoint].items())},
+        }
+        report["endpoints"][endpoint] = stats
+        statuses = " ".join(f"{code}:{count}" for code, count in stats["statuses"].items())
+        print(f"{endpoint:<32} {stats['requests']:>8} {stats['throughput_rps']:>7.2f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}  {statuses}")
+
+    lags.sort()
+    report["event_loop_lag_ms"] = {
+        "p50": round(percentile(lags, 0.50), 2),
+        "p99": round(percentile(lags, 0.99), 2),
+        "max": round(lags[-1], 2) if lags else 0.0,
+    }
+    print(f"event loop lag: p50 {report['event_loop_lag_ms']['p50']:.1f}ms, "
+          f"p99 {report['event_loop_lag_ms']['p99']:.1f}ms, max {report['event_loop_lag_ms']['max']:.1f}ms")
+    print(f"LLM limiter: {json.dumps(server.llm_limiter.snapshot())}")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.json_out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=16, help="concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=30, help="seconds to generate load")
+    parser.add_argument('--llm-latency', default='lognormal:1.5:0.5', help="fake LLM time to first token")
+    parser.add_argument('--llm-tps', type=float, default=80, help="fake LLM tokens per second, 0 for instant")
+    parser.add_argument('--invalid-json-rate', type=float, default=0.0, help="share of unparseable LLM responses")
+    parser.add_argument('--ats-engine', choices=('llm', 'local'), default='llm')
+    parser.add_argument('--mode', choices=('standard', 'combined'), default='standard')
+    parser.add_argument('--resume-sizes', nargs='+', choices=('small', 'medium', 'large', 'xlarge'),
+                        default=['small', 'medium'])
+    parser.add_argument('--repeat-resumes', action='store_true',
+                        help="reuse identical resume text so repeated pairs hit the LLM cache")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json-out', help="write the report as JSON")
+    args = parser.parse_args()
+
+    configure_environment(args)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
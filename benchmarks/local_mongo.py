@@ -0,0 +1,503 @@
+"""In-process stand-in for the subset of Motor the backend uses.
+
+Good enough to run the FastAPI app and benchmarks without a MongoDB server,
+and unlike mongomock it honours indexes: equality lookups on the leading field
+of an index go through a hash map, everything else is a full scan. That makes
+it useful for showing what an index buys as a collection grows, but it is not
+a model of Mongo's query planner or of its performance in absolute terms.
+
+Supported: find/find_one with projection, sort, skip and limit;
+insert_one/insert_many; update_one/update_many/find_one_and_update with $set,
+$setOnInsert, $inc and $unset; replace_one; bulk_write of ReplaceOne,
+UpdateOne and DeleteOne; delete_one/delete_many; count_documents; distinct;
+create_index (uniqueness enforced on the leading field,
+expireAfterSeconds recorded but not enforced); index_information; drop_index.
+Query operators: $eq, $ne, $lt, $lte, $gt, $gte, $in, $nin, $exists, $type
+(by alias), $and, $or, dotted paths.
+
+    client = LocalMongoClient()
+    server.db = client.career_assistant
+"""
+import copy
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+_MISSING = object()
+
+# $type aliases and the Python types the BSON codec produces for them
+_BSON_TYPES = {
+    "string": str, "binData": (bytes, bytearray), "objectId": ObjectId, "object": dict,
+    "array": list, "bool": bool, "date": datetime, "null": type(None),
+}
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _comparable(a: Any, b: Any) -> bool:
+    numbers = (int, float)
+    return (isinstance(a, numbers) and isinstance(b, numbers)) or type(a) is type(b)
+
+
+def _match_operator(value: Any, operator: str, operand: Any) -> bool:
+    if operator == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if operator == "$type":
+        if operand not in _BSON_TYPES:
+            raise OperationFailure(f"unsupported $type {operand!r}")
+        return value is not _MISSING and isinstance(value, _BSON_TYPES[operand])
+    if operator == "$eq":
+        return _match_value(value, operand)
+    if operator == "$ne":
+        return not _match_value(value, operand)
+    if operator == "$in":
+        return any(_match_value(value, candidate) for candidate in operand)
+    if operator == "$nin":
+        return not any(_match_value(value, candidate) for candidate in operand)
+    if operator in ("$lt", "$lte", "$gt", "$gte"):
+        if value is _MISSING or value is None or not _comparable(value, operand):
+            return False
+        return {
+            "$lt": value < operand, "$lte": value <= operand,
+            "$gt": value > operand, "$gte": value >= operand,
+        }[operator]
+    raise OperationFailure(f"unsupported query operator {operator}")
+
+
+def _match_value(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+        return all(_match_operator(value, op, operand) for op, operand in condition.items())
+    if value is _MISSING:
+        return condition is None
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, condition in query.items():
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif not _match_value(_get_path(doc, key), condition):
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(doc)
+    include_id = projection.get("_id", 1)
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+    if fields and all(fields.values()):
+        result = {}
+        for path in fields:
+            value = _get_path(doc, path)
+            if value is not _MISSING:
+                _set_path(result, path, copy.deepcopy(value))
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    result = copy.deepcopy(doc)
+    for path in fields:
+        _unset_path(result, path)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _sort_key(fields: List[Tuple[str, int]]):
+    class Key:
+        __slots__ = ("values",)
+
+        def __init__(self, doc):
+            self.values = [_get_path(doc, field) for field, _ in fields]
+
+        def __lt__(self, other):
+            for (field, direction), a, b in zip(fields, self.values, other.values):
+                if a == b:
+                    continue
+                # Missing and None sort before everything, like Mongo
+                if a is _MISSING or a is None:
+                    return direction > 0
+                if b is _MISSING or b is None:
+                    return direction < 0
+                return (a < b) if direction > 0 else (a > b)
+            return False
+    return Key
+
+
+def _normalize_keys(keys) -> List[Tuple[str, int]]:
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    return [(field, direction) for field, direction in keys]
+
+
+class LocalCursor:
+    def __init__(self, collection: "LocalCollection", query: Dict[str, Any], projection):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort: Optional[List[Tuple[str, int]]] = None
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[List[Dict[str, Any]]] = None
+
+    def sort(self, key_or_list, direction: Optional[int] = None) -> "LocalCursor":
+        self._sort = [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def skip(self, count: int) -> "LocalCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "LocalCursor":
+        self._limit = count
+        return self
+
+    def _evaluate(self) -> List[Dict[str, Any]]:
+        docs = self._collection._candidates(self._query)
+        if self._sort:
+            docs = sorted(docs, key=_sort_key(self._sort))
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        results = self._evaluate()
+        return results if length is None else results[:length]
+
+    def __aiter__(self):
+        self._results = self._evaluate()
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if not self._results:
+            raise StopAsyncIteration
+        return self._results.pop(0)
+
+
+class LocalCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: Dict[Any, Dict[str, Any]] = {}
+        # index name -> spec; hash maps exist for the leading field of every index
+        self._indexes: Dict[str, Dict[str, Any]] = {"_id_": {"key": [("_id", 1)], "v": 2}}
+        self._lookup: Dict[str, Dict[Any, set]] = {}
+
+    # -- indexes -------------------------------------------------------------
+
+    def _hashable(self, value: Any) -> Any:
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return repr(value)
+
+    def _index_add(self, doc: Dict[str, Any]):
+        for field, table in self._lookup.items():
+            value = _get_path(doc, field)
+            table.setdefault(self._hashable(None if value is _MISSING else value), set()).add(doc["_id"])
+
+    def _index_remove(self, doc: Dict[str, Any]):
+        for field, table in self._lookup.items():
+            value = _get_path(doc, field)
+            bucket = table.get(self._hashable(None if value is _MISSING else value))
+            if bucket is not None:
+                bucket.discard(doc["_id"])
+
+    def _check_unique(self, doc: Dict[str, Any], ignore_id: Any = _MISSING):
+        for name, spec in self._indexes.items():
+            if not spec.get("unique"):
+                continue
+            field = spec["key"][0][0]
+            value = _get_path(doc, field)
+            for other_id in self._lookup.get(field, {}).get(self._hashable(None if value is _MISSING else value), ()):
+                if other_id != ignore_id and other_id != doc["_id"]:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name}")
+
+    async def create_index(self, keys, name: Optional[str] = None, unique: bool = False, **options) -> str:
+        fields = _normalize_keys(keys)
+        name = name or "_".join(f"{field}_{direction}" for field, direction in fields)
+        spec = {"key": fields, "v": 2, **({"unique": True} if unique else {}), **options}
+        existing = self._indexes.get(name)
+        if existing is not None:
+            if existing != spec:
+                raise OperationFailure(f"An existing index has the same name as the requested index: {name}")
+            return name
+
+        leading = fields[0][0]
+        if leading not in self._lookup:
+            table: Dict[Any, set] = {}
+            for doc in self._docs.values():
+                value = _get_path(doc, leading)
+                table.setdefault(self._hashable(None if value is _MISSING else value), set()).add(doc["_id"])
+            self._lookup[leading] = table
+        if unique and any(len(ids) > 1 for ids in self._lookup[leading].values()):
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name}")
+        self._indexes[name] = spec
+        return name
+
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        return copy.deepcopy(self._indexes)
+
+    async def drop_index(self, name: str):
+        if name == "_id_" or name not in self._indexes:
+            raise OperationFailure(f"index not found with name [{name}]")
+        field = self._indexes.pop(name)["key"][0][0]
+        if field != "_id" and not any(spec["key"][0][0] == field for spec in self._indexes.values()):
+            del self._lookup[field]
+
+    def _candidates(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Documents matching ``query``, using a hash index for a top-level equality if possible"""
+        for field, condition in query.items():
+            if field.startswith("$") or field not in self._lookup and field != "_id":
+                continue
+            if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+                if set(condition) != {"$eq"}:
+                    continue
+                condition = condition["$eq"]
+            if field == "_id":
+                doc = self._docs.get(self._hashable(condition))
+                candidates: Iterable = [doc] if doc is not None else []
+            else:
+                ids = self._lookup[field].get(self._hashable(condition), ())
+                candidates = [self._docs[doc_id] for doc_id in ids]
+            return [doc for doc in candidates if matches(doc, query)]
+        return [doc for doc in self._docs.values() if matches(doc, query)]
+
+    # -- reads ---------------------------------------------------------------
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection=None, **kwargs) -> LocalCursor:
+        cursor = LocalCursor(self, query or {}, projection)
+        if "sort" in kwargs:
+            cursor.sort(kwargs["sort"])
+        if "limit" in kwargs:
+            cursor.limit(kwargs["limit"])
+        return cursor
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None, projection=None, sort=None):
+        cursor = self.find(query, projection)
+        if sort:
+            cursor.sort(sort)
+        results = await cursor.limit(1).to_list(1)
+        return results[0] if results else None
+
+    async def count_documents(self, query: Dict[str, Any], limit: int = 0, **kwargs) -> int:
+        count = len(self._candidates(query))
+        return min(count, limit) if limit else count
+
+    async def distinct(self, key: str, query: Optional[Dict[str, Any]] = None) -> List[Any]:
+        values: List[Any] = []
+        for doc in self._candidates(query or {}):
+            value = _get_path(doc, key)
+            for item in (value if isinstance(value, list) else [value]):
+                if item is not _MISSING and item not in values:
+                    values.append(item)
+        return values
+
+    # -- writes --------------------------------------------------------------
+
+    def _insert(self, doc: Dict[str, Any]) -> Any:
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_")
+        self._check_unique(doc)
+        stored = copy.deepcopy(doc)
+        self._docs[stored["_id"]] = stored
+        self._index_add(stored)
+        return stored["_id"]
+
+    async def insert_one(self, doc: Dict[str, Any]):
+        inserted_id = self._insert(doc)
+        return type("InsertOneResult", (), {"inserted_id": inserted_id, "acknowledged": True})()
+
+    async def insert_many(self, docs: List[Dict[str, Any]], ordered: bool = True):
+        inserted, error = [], None
+        for doc in docs:
+            try:
+                inserted.append(self._insert(doc))
+            except DuplicateKeyError as e:
+                error = error or e
+                if ordered:
+                    break
+        if error is not None:
+            raise error
+        return type("InsertManyResult", (), {"inserted_ids": inserted, "acknowledged": True})()
+
+    def _apply_update(self, doc: Dict[str, Any], update: Dict[str, Any], inserting: bool):
+        if not any(key.startswith("$") for key in update):
+            # Replacement document
+            replacement = copy.deepcopy(update)
+            replacement["_id"] = doc["_id"]
+            doc.clear()
+            doc.update(replacement)
+            return
+        for operator, fields in update.items():
+            for path, value in fields.items():
+                if operator == "$set" or (operator == "$setOnInsert" and inserting):
+                    _set_path(doc, path, copy.deepcopy(value))
+                elif operator == "$inc":
+                    current = _get_path(doc, path)
+                    _set_path(doc, path, (0 if current is _MISSING else current) + value)
+                elif operator == "$unset":
+                    _unset_path(doc, path)
+                elif operator != "$setOnInsert":
+                    raise OperationFailure(f"unsupported update operator {operator}")
+
+    def _update_doc(self, doc: Dict[str, Any], update: Dict[str, Any]):
+        updated = copy.deepcopy(doc)
+        self._apply_update(updated, update, inserting=False)
+        self._check_unique(updated, ignore_id=doc["_id"])
+        self._index_remove(doc)
+        doc.clear()
+        doc.update(updated)
+        self._index_add(doc)
+
+    def _upsert(self, query: Dict[str, Any], update: Dict[str, Any]) -> Any:
+        doc = {key: value for key, value in query.items()
+               if not key.startswith("$") and not (isinstance(value, dict) and any(k.startswith("$") for k in value))}
+        if "_id" not in doc:
+            # An upserted replacement keeps its own _id, as in Mongo
+            replacement = not any(key.startswith("$") for key in update)
+            doc["_id"] = update["_id"] if replacement and "_id" in update else ObjectId()
+        self._apply_update(doc, update, inserting=True)
+        return self._insert(doc)
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        return await self._update(query, update, upsert, many=False)
+
+    async def update_many(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        return await self._update(query, update, upsert, many=True)
+
+    async def replace_one(self, query: Dict[str, Any], replacement: Dict[str, Any], upsert: bool = False):
+        return await self._update(query, replacement, upsert, many=False)
+
+    async def _update(self, query, update, upsert, many):
+        targets = self._candidates(query)
+        if not many:
+            targets = targets[:1]
+        upserted_id = None
+        for doc in targets:
+            self._update_doc(doc, update)
+        if not targets and upsert:
+            upserted_id = self._upsert(query, update)
+        return type("UpdateResult", (), {
+            "matched_count": len(targets), "modified_count": len(targets),
+            "upserted_id": upserted_id, "acknowledged": True,
+        })()
+
+    async def find_one_and_update(self, query, update, projection=None, sort=None, upsert=False,
+                                  return_document=ReturnDocument.BEFORE):
+        targets = self._candidates(query)
+        if sort:
+            targets = sorted(targets, key=_sort_key(_normalize_keys(sort)))
+        if not targets:
+            if not upsert:
+                return None
+            doc_id = self._upsert(query, update)
+            return _project(self._docs[doc_id], projection) if return_document == ReturnDocument.AFTER else None
+        doc = targets[0]
+        before = _project(doc, projection)
+        self._update_doc(doc, update)
+        return _project(doc, projection) if return_document == ReturnDocument.AFTER else before
+
+    async def bulk_write(self, requests: List[Any], ordered: bool = True):
+        # pymongo keeps each operation's arguments in private attributes
+        counts = {"matched": 0, "upserted": 0, "deleted": 0}
+        for request in requests:
+            if isinstance(request, (ReplaceOne, UpdateOne)):
+                result = await self._update(request._filter, request._doc, request._upsert, many=False)
+                counts["matched"] += result.matched_count
+                counts["upserted"] += result.upserted_id is not None
+            elif isinstance(request, DeleteOne):
+                counts["deleted"] += (await self._delete(request._filter, many=False)).deleted_count
+            else:
+                raise OperationFailure(f"unsupported bulk operation {type(request).__name__}")
+        return type("BulkWriteResult", (), {
+            "matched_count": counts["matched"], "modified_count": counts["matched"],
+            "upserted_count": counts["upserted"], "deleted_count": counts["deleted"], "acknowledged": True,
+        })()
+
+    async def delete_one(self, query: Dict[str, Any]):
+        return await self._delete(query, many=False)
+
+    async def delete_many(self, query: Dict[str, Any]):
+        return await self._delete(query, many=True)
+
+    async def _delete(self, query, many):
+        targets = self._candidates(query)
+        if not many:
+            targets = targets[:1]
+        for doc in targets:
+            self._index_remove(doc)
+            del self._docs[doc["_id"]]
+        return type("DeleteResult", (), {"deleted_count": len(targets), "acknowledged": True})()
+
+
+class LocalDatabase:
+    def __init__(self, client: "LocalMongoClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, LocalCollection] = {}
+
+    def __getitem__(self, name: str) -> LocalCollection:
+        if name not in self._collections:
+            self._collections[name] = LocalCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> LocalCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def list_collection_names(self) -> List[str]:
+        return list(self._collections)
+
+
+class LocalMongoClient:
+    def __init__(self, *args, **kwargs):
+        self._databases: Dict[str, LocalDatabase] = {}
+
+    def __getitem__(self, name: str) -> LocalDatabase:
+        if name not in self._databases:
+            self._databases[name] = LocalDatabase(self, name)
+        return self._databases[name]
+
+    def __getattr__(self, name: str) -> LocalDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def close(self):
+        pass
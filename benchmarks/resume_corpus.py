@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Synthetic resume corpus for offline document pipeline benchmarks.
+
+Resumes are generated deterministically from a seed at a chosen size (roles x
+bullets per role) and formatting richness:
+
+    plain  headings and plain paragraphs, like BackendTester.create_sample_docx
+    rich   per-run fonts, sizes, bold/italic and centred header, like
+           FormattingTester.create_richly_formatted_docx
+    media  rich plus a skills table and an embedded logo image
+
+The two test-suite documents themselves are included as fixed seed cases. Write
+the corpus to disk with:
+
+    python benchmarks/resume_corpus.py --out corpus/ [--sizes small medium large]
+"""
+import argparse
+import io
+import os
+import random
+import struct
+import sys
+import zlib
+from typing import Dict, List, NamedTuple
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches, Pt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RICHNESS_LEVELS = ("plain", "rich", "media")
+# name -> (roles, bullets per role)
+SIZES = {
+    "small": (2, 4),
+    "medium": (6, 6),
+    "large": (20, 8),
+    "xlarge": (60, 10),
+}
+
+SKILLS = {
+    "Programming": ["Python", "Java", "Go", "TypeScript", "SQL", "Scala", "Rust", "C++"],
+    "Frameworks": ["React", "FastAPI", "Django", "Spring Boot", "Node.js", "Flask", "Angular"],
+    "Data": ["PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Airflow", "Snowflake"],
+    "Cloud": ["AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "Jenkins"],
+}
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "Data Engineer",
+          "Backend Developer", "Platform Engineer", "Machine Learning Engineer", "Tech Lead"]
+COMPANIES = ["TechCorp Inc.", "StartupXYZ", "DataTech Solutions", "Cloudworks", "Finlytics",
+             "RetailHub", "HealthStack", "Streamline Labs", "Northwind", "Contoso"]
+VERBS = ["Developed", "Built", "Led", "Designed", "Implemented", "Optimized", "Automated", "Migrated",
+         "Launched", "Mentored"]
+OBJECTS = ["REST APIs", "data pipelines", "recommendation system", "CI/CD pipelines", "ML models",
+           "microservices", "reporting dashboards", "search infrastructure", "billing platform",
+           "onboarding flow"]
+OUTCOMES = ["serving {n}K+ daily requests", "reducing deployment time by {n}%",
+            "increasing customer retention by {n}%", "cutting infrastructure cost by {n}%",
+            "improving query latency by {n}%", "for a team of {small} engineers"]
+JD_KEYWORDS = ["Kubernetes", "Terraform", "GraphQL", "observability", "event-driven", "stakeholders"]
+
+
+class CorpusCase(NamedTuple):
+    name: str
+    richness: str
+    roles: int
+    bullets_per_role: int
+    docx: bytes
+
+
+def logo_png(width: int = 120, height: int = 40, seed: int = 0) -> bytes:
+    """Deterministic RGB PNG with noisy rows, so it does not compress to nothing"""
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + bytes(rng.getrandbits(8) for _ in range(width * 3)) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def _bullet(rng: random.Random) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90), small=rng.randint(3, 12))
+    return f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS['Programming'])} " \
+           f"and {rng.choice(SKILLS['Cloud'])}, {outcome}"
+
+
+def _add_text(doc, text: str, richness: str, rng: random.Random, size: int = 10):
+    paragraph = doc.add_paragraph()
+    if richness == "plain":
+        paragraph.add_run(text)
+        return paragraph
+    # Split around a metric so it can carry its own run formatting, as in the rich test document
+    words = text.split(" ")
+    marker = next((i for i, word in enumerate(words) if any(c.isdigit() for c in word)), None)
+    pieces = [" ".join(words)] if marker is None else [
+        " ".join(words[:marker]) + " ", words[marker], " " + " ".join(words[marker + 1:])
+    ]
+    for i, piece in enumerate(pieces):
+        run = paragraph.add_run(piece)
+        run.font.size = Pt(size)
+        run.font.name = rng.choice(["Calibri", "Arial", "Georgia"])
+        if len(pieces) == 3 and i == 1:
+            run.bold = True
+    return paragraph
+
+
+def _add_heading(doc, text: str, richness: str, level: int = 1):
+    heading = doc.add_heading(text, level=level)
+    if richness != "plain" and heading.runs:
+        heading.runs[0].font.name = "Calibri"
+        heading.runs[0].font.size = Pt(14 if level else 18)
+    return heading
+
+
+def generate_resume(roles: int, bullets_per_role: int, richness: str = "plain", seed: int = 0) -> bytes:
+    if richness not in RICHNESS_LEVELS:
+        raise ValueError(f"richness must be one of: {', '.join(RICHNESS_LEVELS)}")
+    rng = random.Random(seed)
+    doc = Document()
+
+    name = _add_heading(doc, f"Candidate {seed:04d}", richness, level=0)
+    title = doc.add_paragraph()
+    title_run = title.add_run(f"{rng.choice(TITLES)} | Full Stack Developer")
+    contact = doc.add_paragraph()
+    contact.add_run(f"Email: candidate{seed}@email.com | ")
+    phone = contact.add_run(f"Phone: (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}")
+    if richness != "plain":
+        for paragraph in (name, title, contact):
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title_run.italic = True
+        title_run.font.size = Pt(12)
+        phone.bold = True
+    if richness == "media":
+        doc.add_picture(io.BytesIO(logo_png(seed=seed)), width=Inches(1.5))
+
+    _add_heading(doc, "Professional Summary", richness)
+    _add_text(doc, f"Engineer with {rng.randint(3, 15)}+ years of experience building "
+              f"{rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}. Proficient in "
+              f"{', '.join(rng.sample(SKILLS['Programming'], 3))} and cloud technologies.", richness, rng, 11)
+
+    _add_heading(doc, "Technical Skills", richness)
+    if richness == "media":
+        table = doc.add_table(rows=len(SKILLS), cols=2)
+        table.style = "Table Grid"
+        for row, (group, items) in zip(table.rows, SKILLS.items()):
+            row.cells[0].text = group
+            row.cells[1].text = ", ".join(rng.sample(items, 4))
+    else:
+        for group, items in SKILLS.items():
+            _add_text(doc, f"• {group}: {', '.join(rng.sample(items, 4))}", richness, rng)
+
+    _add_heading(doc, "Work Experience", richness)
+    year = 2025
+    for _ in range(roles):
+        start = year - rng.randint(1, 4)
+        header = doc.add_paragraph()
+        role = header.add_run(f"{rng.choice(TITLES)}")
+        company = header.add_run(f" | {rng.choice(COMPANIES)} | ")
+        dates = header.add_run(f"{start}-{year}")
+        if richness != "plain":
+            role.bold = True
+            role.font.size = Pt(12)
+            company.font.size = Pt(11)
+            dates.italic = True
+        for _ in range(bullets_per_role):
+            _add_text(doc, _bullet(rng), richness, rng)
+        year = start
+
+    _add_heading(doc, "Education", richness)
+    _add_text(doc, "Bachelor of Science in Computer Science", richness, rng, 11)
+    _add_text(doc, f"University of Technology | {year - 4}-{year}", richness, rng, 11)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def tailored_variant(text: str, seed: int = 0) -> str:
+    """LLM-style rewrite of resume text: reworded bullets, a few added keywords, one dropped and one new line"""
+    rng = random.Random(seed)
+    lines = [line for line in text.split("\n") if line.strip()]
+    rewritten: List[str] = []
+    dropped = rng.randrange(len(lines)) if len(lines) > 4 else -1
+    for i, line in enumerate(lines):
+        if i == dropped:
+            continue
+        if line.startswith("•") and rng.random() < 0.6:
+            words = line.split(" ")
+            words[rng.randrange(1, len(words))] = rng.choice(JD_KEYWORDS)
+            line = " ".join(words)
+            if rng.random() < 0.3:
+                line += f", collaborating with {rng.choice(JD_KEYWORDS)} stakeholders"
+        rewritten.append(line)
+    rewritten.insert(min(len(rewritten), 6), f"• Hands-on experience with {', '.join(JD_KEYWORDS[:3])}")
+    return "\n".join(rewritten)
+
+
+def seed_documents() -> Dict[str, bytes]:
+    """The sample and richly formatted resumes the API test scripts upload"""
+    sys.path.insert(0, ROOT)
+    from backend_test import BackendTester
+    from formatting_test import FormattingTester
+
+    return {
+        "sample": BackendTester().create_sample_docx(),
+        "richly_formatted": FormattingTester().create_richly_formatted_docx(),
+    }
+
+
+def build_corpus(sizes=tuple(SIZES), richness_levels=RICHNESS_LEVELS, include_seeds: bool = True) -> List[CorpusCase]:
+    cases = []
+    if include_seeds:
+        for name, docx in seed_documents().items():
+            cases.append(CorpusCase(name, "rich" if name == "richly_formatted" else "plain", 0, 0, docx))
+    for size in sizes:
+        roles, bullets = SIZES[size]
+        for richness in richness_levels:
+            seed = len(cases)
+            cases.append(CorpusCase(f"{size}-{richness}", richness, roles, bullets,
+                                    generate_resume(roles, bullets, richness, seed)))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', required=True, help="directory to write the .docx files to")
+    parser.add_argument('--sizes', nargs='+', choices=tuple(SIZES), default=list(SIZES))
+    parser.add_argument('--richness', nargs='+', choices=RICHNESS_LEVELS, default=list(RICHNESS_LEVELS))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for case in build_corpus(args.sizes, args.richness):
+        path = os.path.join(args.out, f"{case.name}.docx")
+        with open(path, "wb") as f:
+            f.write(case.docx)
+        print(f"{path} ({len(case.docx)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from docx.oxml.shared import OxmlElement, qn
 import io
 import time
 import base64
+import hashlib
 
 # Backend URL from frontend .env
 BACKEND_URL = "https://resumeai-29.preview.emergentagent.com/api"
@@ -24,7 +25,7 @@ class FormattingTester:
         self.session = requests.Session()
         self.test_results = []
         self.analysis_id = None
-        self.docx_content_base64 = None
+        self.resume_id = None
         self.resume_text = None
         
     def log_result(self, test_name, success, message, details=None):
@@ -187,7 +188,7 @@ class FormattingTester:
         return buffer.getvalue()
 
     def test_enhanced_upload_with_docx_content(self):
-        """Test that upload now returns base64 DOCX content"""
+        """Test that upload stores the DOCX and returns its content-hash resume_id"""
         try:
             # Create richly formatted DOCX
             docx_content = self.create_richly_formatted_docx()
@@ -200,31 +201,26 @@ class FormattingTester:
                 data = response.json()
                 
                 # Check for required fields
-                required_fields = ['success', 'text', 'filename', 'docx_content']
+                required_fields = ['success', 'text', 'filename', 'resume_id']
                 missing_fields = [field for field in required_fields if field not in data]
                 
                 if not missing_fields:
-                    # Verify docx_content is base64
-                    try:
-                        decoded_docx = base64.b64decode(data['docx_content'])
-                        # Verify it's valid DOCX by reading it
-                        test_doc = Document(io.BytesIO(decoded_docx))
-                        paragraphs = [p.text for p in test_doc.paragraphs if p.text.strip()]
-                        
-                        self.docx_content_base64 = data['docx_content']
+                    # resume_id is the SHA-256 of the uploaded bytes
+                    expected_id = hashlib.sha256(docx_content).hexdigest()
+                    if data['resume_id'] == expected_id:
+                        self.resume_id = data['resume_id']
                         self.resume_text = data['text']
                         
                         self.log_result("Enhanced Upload - DOCX Content", True, 
-                                      "Successfully returned base64 DOCX content",
+                                      "Successfully stored DOCX content",
                                       {
                                           "text_length": len(data['text']),
-                                          "docx_base64_length": len(data['docx_content']),
-                                          "decoded_docx_size": len(decoded_docx),
-                                          "paragraphs_in_docx": len(paragraphs)
+                                          "resume_id": data['resume_id'],
+                                          "docx_size": len(docx_content)
                                       })
-                    except Exception as decode_error:
+                    else:
                         self.log_result("Enhanced Upload - DOCX Content", False, 
-                                      f"Invalid base64 DOCX content: {str(decode_error)}")
+                                      f"Unexpected resume_id: {data['resume_id']}")
                 else:
                     self.log_result("Enhanced Upload - DOCX Content", False, 
                                   f"Missing required fields: {missing_fields}", data)
@@ -237,8 +233,8 @@ class FormattingTester:
                           f"Error during enhanced upload test: {str(e)}")
 
     def test_enhanced_tailor_with_docx_content(self):
-        """Test that tailor-resume accepts and stores original_docx_content"""
-        if not self.docx_content_base64 or not self.resume_text:
+        """Test that tailor-resume accepts a stored resume_id"""
+        if not self.resume_id or not self.resume_text:
             self.log_result("Enhanced Tailoring", False, "No DOCX content or resume text from upload test")
             return
             
@@ -266,11 +262,11 @@ class FormattingTester:
             • Drive AI strategy and technical roadmap
             """
             
-            # Test with original_docx_content parameter
+            # Test with resume_id parameter
             data = {
                 'resume_text': self.resume_text,
                 'job_description': job_description,
-                'original_docx_content': self.docx_content_base64
+                'resume_id': self.resume_id
             }
             
             response = self.session.post(f"{BACKEND_URL}/tailor-resume", data=data, timeout=60)
@@ -456,7 +452,11 @@ class FormattingTester:
             
         try:
             # Get the analysis from database to compare original vs tailored
-            analyses_response = self.session.get(f"{BACKEND_URL}/analyses", timeout=15)
+            analyses_response = self.session.get(
+                f"{BACKEND_URL}/analyses",
+                params={"fields": "original_text,tailored_resume", "limit": 100},
+                timeout=15
+            )
             
             if analyses_response.status_code == 200:
                 analyses_data = analyses_response.json()
@@ -3,9 +3,18 @@ import './App.css';
 
 const API_BASE_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 
+const randomHex = (bytes) =>
+  Array.from(crypto.getRandomValues(new Uint8Array(bytes)), (b) => b.toString(16).padStart(2, '0')).join('');
+
+// W3C trace context: one trace id per uploaded resume, a fresh parent span id per request.
+// Only sent when the backend traces (REACT_APP_TRACING=true): the custom header costs a CORS
+// preflight per request. Flags 00 leave the sampling decision to the server.
+const TRACING_ENABLED = process.env.REACT_APP_TRACING === 'true';
+const traceHeaders = (traceId) => (TRACING_ENABLED ? { traceparent: `00-${traceId}-${randomHex(8)}-00` } : {});
+
 function App() {
   const [resumeText, setResumeText] = useState('');
-  const [originalDocxContent, setOriginalDocxContent] = useState(''); // Store base64 DOCX
+  const [resumeId, setResumeId] = useState(''); // Content hash of the uploaded DOCX
   const [jobDescription, setJobDescription] = useState('');
   const [tailoredResume, setTailoredResume] = useState('');
   const [atsScore, setAtsScore] = useState(0);
@@ -16,6 +25,7 @@ function App() {
   const [analysisId, setAnalysisId] = useState('');
   const [uploadedFile, setUploadedFile] = useState(null);
   const fileInputRef = useRef(null);
+  const traceIdRef = useRef(randomHex(16)); // Ties upload, tailoring and download into one backend trace
 
   const handleFileUpload = async (event) => {
     const file = event.target.files[0];
@@ -27,12 +37,14 @@ function App() {
     }
 
     setLoading(true);
+    traceIdRef.current = randomHex(16);
     const formData = new FormData();
     formData.append('file', file);
 
     try {
       const response = await fetch(`${API_BASE_URL}/api/upload-resume`, {
         method: 'POST',
+        headers: traceHeaders(traceIdRef.current),
         body: formData,
       });
 
@@ -42,7 +54,7 @@ function App() {
 
       const data = await response.json();
       setResumeText(data.text);
-      setOriginalDocxContent(data.docx_content); // Store base64 DOCX content
+      setResumeId(data.resume_id); // Server keeps the DOCX, we only keep its id
       setUploadedFile(file.name);
     } catch (error) {
       alert('Error uploading resume: ' + error.message);
@@ -57,7 +69,7 @@ function App() {
       return;
     }
 
-    if (!originalDocxContent) {
+    if (!resumeId) {
       alert('Original resume formatting not available. Please re-upload your resume.');
       return;
     }
@@ -66,11 +78,12 @@ function App() {
     const formData = new FormData();
     formData.append('resume_text', resumeText);
     formData.append('job_description', jobDescription);
-    formData.append('original_docx_content', originalDocxContent); // Include base64 DOCX
+    formData.append('resume_id', resumeId); // Reference the stored DOCX
 
     try {
       const response = await fetch(`${API_BASE_URL}/api/tailor-resume`, {
         method: 'POST',
+        headers: traceHeaders(traceIdRef.current),
         body: formData,
       });
 
@@ -99,7 +112,9 @@ function App() {
     }
 
     try {
-      const response = await fetch(`${API_BASE_URL}/api/download-resume/${analysisId}`);
+      const response = await fetch(`${API_BASE_URL}/api/download-resume/${analysisId}`, {
+        headers: traceHeaders(traceIdRef.current),
+      });
       
       if (!response.ok) {
         throw new Error('Failed to download resume');
@@ -0,0 +1,48 @@
+"""The API in this process with the fake LLM and the in-process Mongo stand-in, as in benchmarks/load_test.py"""
+import contextlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# Before anything imports server.py, including tests that import it lazily
+os.environ['LLM_BACKEND'] = 'fake'
+os.environ['FAKE_LLM_LATENCY'] = 'fixed:0'
+os.environ['FAKE_LLM_TOKENS_PER_SECOND'] = '0'
+os.environ.setdefault('MONGO_URL', 'mongodb://tests')
+os.environ['ANALYSIS_ARCHIVE_AFTER_DAYS'] = '0'
+os.environ['DOCX_POOL_WORKERS'] = '0'
+
+import motor.motor_asyncio  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+
+motor.motor_asyncio.AsyncIOMotorClient = LocalMongoClient
+
+
+@pytest.fixture(scope="session")
+def server():
+    """backend/server.py with the fake LLM and local Mongo selected above"""
+    import server
+    return server
+
+
+@pytest.fixture
+def serve(server):
+    """Async context manager that starts the app and yields an httpx client for it"""
+    import httpx
+
+    @contextlib.asynccontextmanager
+    async def started():
+        await server.app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://tests") as client:
+                yield client
+        finally:
+            await server.app.router.shutdown()
+
+    return started
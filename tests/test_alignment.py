@@ -0,0 +1,88 @@
+"""Regression tests for the paragraph-to-line alignment used by the DOCX renderer"""
+import io
+import os
+import sys
+
+import pytest
+from docx import Document
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from alignment import align_lines  # noqa: E402
+from formatting_test import FormattingTester  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def rich_docx():
+    return FormattingTester().create_richly_formatted_docx()
+
+
+def paragraph_texts(docx_bytes):
+    return [p.text.strip() for p in Document(io.BytesIO(docx_bytes)).paragraphs if p.text.strip()]
+
+
+def tailor(paragraphs):
+    """Simulate an LLM rewrite: reword a few lines, keep the order"""
+    rewrites = {
+        'Innovative Data Scientist': 'Innovative Data Scientist with 7+ years building production machine learning '
+                                     'and deep learning systems on AWS that drive business value.',
+        '• Mentored team': '• Mentored team of 5 junior data scientists and ML engineers on MLOps practices',
+        '• Cloud:': '• Cloud: AWS (SageMaker, EC2, S3, Lambda), GCP, Azure ML',
+    }
+    lines = []
+    for text in paragraphs:
+        for prefix, rewritten in rewrites.items():
+            if text.startswith(prefix):
+                text = rewritten
+                break
+        lines.append(text)
+    return lines
+
+
+def test_identical_text_aligns_in_order(rich_docx):
+    paragraphs = paragraph_texts(rich_docx)
+    assert align_lines(paragraphs, paragraphs) == list(range(len(paragraphs)))
+
+
+def test_rewritten_lines_align_one_to_one(rich_docx):
+    paragraphs = paragraph_texts(rich_docx)
+    lines = tailor(paragraphs)
+    assignment = align_lines(paragraphs, lines)
+
+    assert assignment == list(range(len(paragraphs)))
+    matched = [n for n in assignment if n is not None]
+    assert len(matched) == len(set(matched))
+
+
+def test_tailored_line_is_not_reused():
+    paragraphs = ['Python developer', 'Python engineer', 'Python lead']
+    assert align_lines(paragraphs, ['Senior Python developer']) == [0, None, None]
+
+
+def test_unmatched_paragraph_is_left_alone():
+    assert align_lines(['Stanford University'], ['Python, SQL, Spark']) == [None]
+
+
+def test_repeated_heading_prefers_next_line_in_order():
+    paragraphs = ['Skills', '• Python', 'Skills', '• SQL']
+    lines = ['Skills', '• Python, Go', 'Skills', '• SQL, Spark']
+    assert align_lines(paragraphs, lines) == [0, 1, 2, 3]
+
+
+def test_rendered_docx_keeps_run_formatting(rich_docx):
+    from server import create_tailored_docx_with_formatting, extract_text_and_structure_from_docx
+
+    original_text, _ = extract_text_and_structure_from_docx(rich_docx)
+    lines = tailor(paragraph_texts(rich_docx))
+    rendered = Document(io.BytesIO(
+        create_tailored_docx_with_formatting(rich_docx, original_text, '\n'.join(lines))
+    ))
+
+    texts = [p.text.strip() for p in rendered.paragraphs if p.text.strip()]
+    assert texts == lines
+    name = next(p for p in rendered.paragraphs if p.text.strip() == 'Sarah Johnson')
+    assert name.runs[0].bold and name.runs[0].font.name == 'Arial'
+    cloud = next(p for p in rendered.paragraphs if p.text.startswith('• Cloud:'))
+    assert 'Lambda' in cloud.text
@@ -0,0 +1,73 @@
+"""Cursor pages cover every analysis exactly once, newest first, with summary fields by default"""
+import asyncio
+
+import pytest
+
+from local_mongo import LocalMongoClient
+
+
+@pytest.fixture
+def analyses(server, monkeypatch):
+    """60 analyses in a fresh database; some share a created_at, so pages must break ties by id"""
+    db = LocalMongoClient().career_assistant
+    monkeypatch.setattr(server, "db", db)
+    docs = [{
+        "id": f"analysis-{i:02d}",
+        "created_at": f"2026-01-01T00:00:{i // 6:02d}+00:00" if i % 3 == 0 else f"2026-01-01T00:01:{i:02d}+00:00",
+        "ats_score": i,
+        "suggestions": [],
+        "original_text": "Jane Doe",
+        "tailored_resume": "Jane Doe",
+    } for i in range(60)]
+    asyncio.run(db.resume_analyses.insert_many([dict(doc) for doc in docs]))
+    return sorted(docs, key=lambda doc: (doc["created_at"], doc["id"]), reverse=True)
+
+
+def list_pages(serve, **params):
+    async def run():
+        pages, cursor = [], None
+        async with serve() as client:
+            while True:
+                page_params = {**params, "cursor": cursor} if cursor else params
+                response = await client.get("/api/analyses", params=page_params)
+                assert response.status_code == 200
+                pages.append(response.json())
+                cursor = pages[-1]["next_cursor"]
+                if cursor is None:
+                    return pages
+
+    return asyncio.run(run())
+
+
+def test_cursor_pages_round_trip_every_analysis_once(serve, analyses):
+    pages = list_pages(serve, limit=7)
+    assert [len(page["analyses"]) for page in pages] == [7] * 8 + [4]
+    listed = [analysis["id"] for page in pages for analysis in page["analyses"]]
+    assert listed == [doc["id"] for doc in analyses]
+
+
+def test_default_page_is_fifty_summaries(serve, analyses):
+    first, second = list_pages(serve)
+    assert (len(first["analyses"]), len(second["analyses"])) == (50, 10)
+    assert "original_text" not in first["analyses"][0] and "tailored_resume" not in first["analyses"][0]
+    with_text, _ = list_pages(serve, fields="original_text")
+    assert with_text["analyses"][0]["original_text"] == "Jane Doe"
+
+
+def test_filters_apply_across_pages(serve, analyses):
+    pages = list_pages(serve, limit=4, min_score=10, max_score=29)
+    listed = [analysis["id"] for page in pages for analysis in page["analyses"]]
+    assert listed == [doc["id"] for doc in analyses if 10 <= doc["ats_score"] <= 29]
+
+
+@pytest.mark.parametrize("params, status_code", [
+    ({"cursor": "not-a-cursor"}, 400),
+    ({"fields": "password"}, 400),
+    ({"limit": 101}, 422),
+])
+def test_invalid_parameters_are_rejected(serve, analyses, params, status_code):
+    async def run():
+        async with serve() as client:
+            return await client.get("/api/analyses", params=params)
+
+    assert asyncio.run(run()).status_code == status_code
@@ -0,0 +1,110 @@
+"""Analyses expire, archive and restore intact, and the sweep only deletes long-unused orphans"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from analysis_archive import AnalysisArchiver, analysis_expiry, read_archive  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+from text_compression import compress_fields, decompress_fields  # noqa: E402
+
+
+def ago(**delta):
+    return (datetime.now(timezone.utc) - timedelta(**delta)).isoformat()
+
+
+def analysis(analysis_id, resume_id, jd_id, **fields):
+    return compress_fields({
+        "id": analysis_id,
+        "created_at": ago(days=90),
+        "resume_id": resume_id,
+        "job_description_id": jd_id,
+        "tailored_resume": "Jane Doe\nSenior Engineer building Python services\n" * 20,
+        **fields,
+    })
+
+
+def archiver(db, tmp_path):
+    return AnalysisArchiver(db.resume_analyses, archive_dir=str(tmp_path), batch_size=2,
+                            blobs=db.resume_blobs, job_descriptions=db.job_descriptions, orphan_grace_hours=24)
+
+
+def test_ttl_days_set_an_expiry(monkeypatch):
+    monkeypatch.delenv("ANALYSIS_TTL_DAYS", raising=False)
+    assert analysis_expiry() is None
+    monkeypatch.setenv("ANALYSIS_TTL_DAYS", "2")
+    expiry = analysis_expiry()
+    assert timedelta(days=2) - timedelta(minutes=1) < expiry - datetime.now(timezone.utc) <= timedelta(days=2)
+
+
+def test_archive_sweep_and_restore_round_trip(tmp_path):
+    async def run():
+        db = LocalMongoClient().career_assistant
+        await db.resume_blobs.insert_one({"_id": "blob-1", "content": b"PK docx", "stored_at": ago(days=90)})
+        await db.job_descriptions.insert_one({"_id": "jd-1", "text": "Python", "last_used_at": ago(days=90)})
+        originals = [analysis(f"a{i}", "blob-1", "jd-1") for i in range(3)]
+        await db.resume_analyses.insert_many(originals)  # Gives each original its _id
+        await db.resume_analyses.insert_one(analysis("recent", None, None, created_at=ago(days=1)))
+        archive = archiver(db, tmp_path)
+
+        result = await archive.archive_once(older_than_days=30)
+        records = [record for path in result["files"] for record in read_archive(path)]
+        swept = await archive.sweep_orphans()
+        emptied = (await db.resume_blobs.count_documents({}), await db.job_descriptions.count_documents({}))
+
+        restored = await archive.restore(archive.archive_files())
+        again = await archive.archive_once(older_than_days=30)
+        docs = {doc["id"]: doc async for doc in db.resume_analyses.find({})}
+        return (originals, result, records, swept, emptied, restored, again, docs,
+                await db.resume_blobs.find_one({"_id": "blob-1"}), await db.job_descriptions.find_one({"_id": "jd-1"}))
+
+    originals, result, records, swept, emptied, restored, again, docs, blob, jd = asyncio.run(run())
+    assert result["archived"] == 3 and len(result["files"]) == 2
+    assert all(record["archived_resume_blob"]["content"] == b"PK docx" for record in records)
+    assert swept == {"blobs": 1, "job_descriptions": 1} and emptied == (0, 0)
+
+    assert restored == 3 and again["archived"] == 0
+    assert set(docs) == {"a0", "a1", "a2", "recent"}
+    for original in originals:
+        doc = docs[original["id"]]
+        assert doc.pop("restored_at")
+        assert "archived_resume_blob" not in doc and "archived_job_description" not in doc
+        assert decompress_fields(doc) == decompress_fields(original)
+    assert blob["content"] == b"PK docx" and jd["text"] == "Python"
+
+
+def test_sweep_keeps_referenced_and_recently_used_documents(tmp_path):
+    async def run():
+        db = LocalMongoClient().career_assistant
+        await db.resume_blobs.insert_many([
+            {"_id": "referenced", "stored_at": ago(days=90)},
+            {"_id": "rendered", "stored_at": ago(days=90)},
+            {"_id": "just-uploaded", "stored_at": ago(hours=1)},
+            {"_id": "orphan", "stored_at": ago(days=90)},
+            {"_id": "legacy-orphan", "created_at": ago(days=90)},
+        ])
+        await db.job_descriptions.insert_many([
+            {"_id": "in-use", "created_at": ago(days=90), "last_used_at": ago(minutes=5)},
+            {"_id": "orphan", "created_at": ago(days=90), "last_used_at": ago(days=30)},
+        ])
+        await db.resume_analyses.insert_one(analysis("a1", "referenced", None, rendered_docx_id="rendered"))
+        deleted = await archiver(db, tmp_path).sweep_orphans()
+        return (deleted, sorted(await db.resume_blobs.distinct("_id")),
+                sorted(await db.job_descriptions.distinct("_id")))
+
+    deleted, blobs, jds = asyncio.run(run())
+    assert deleted == {"blobs": 2, "job_descriptions": 1}
+    assert blobs == ["just-uploaded", "referenced", "rendered"]
+    assert jds == ["in-use"]
+
+
+def test_grace_period_must_outlast_the_job_lease(monkeypatch):
+    monkeypatch.setenv("JOB_LEASE_SECONDS", "7200")
+    with pytest.raises(ValueError):
+        AnalysisArchiver(None, orphan_grace_hours=1)
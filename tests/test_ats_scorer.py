@@ -0,0 +1,57 @@
+"""Keyword extraction must skip boilerplate, fold plurals and weight keywords by JD section"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from ats_scorer import extract_keywords, normalize_token, score_resume  # noqa: E402
+
+JOB_DESCRIPTION = """Backend Engineer
+
+Responsibilities:
+- Build Kafka pipelines
+
+Qualifications:
+- Python and PostgreSQL
+
+Benefits:
+- Equity and a learning budget
+"""
+
+
+def weights(job_description):
+    return {keyword.term: keyword.weight for keyword in extract_keywords(job_description)}
+
+
+def test_plural_stopwords_are_not_keywords():
+    terms = weights(JOB_DESCRIPTION + "\nThis role does APIs. Bonus plus points.")
+    for boilerplate in ("qualification", "responsibility", "benefit", "thi", "doe", "plu", "bonu"):
+        assert boilerplate not in terms
+    assert {"python", "postgresql", "kafka", "api"} <= set(terms)
+
+
+def test_plurals_fold_onto_singulars():
+    assert normalize_token("APIs") == normalize_token("api") == "api"
+    assert normalize_token("class") == "class"
+    result = score_resume("Experience\nDesigned public API endpoints", "Requirements:\nDesign APIs")
+    assert "APIs" in result["keyword_matches"]
+
+
+def test_heading_lines_weight_their_sections():
+    terms = weights(JOB_DESCRIPTION)
+    assert terms["python"] == 1.5      # Qualifications
+    assert terms["kafka"] == 1.0       # Responsibilities
+    assert terms["equity"] == 0.25     # Benefits
+
+
+def test_inline_headings_weight_their_sections():
+    terms = weights("Requirements: Python, Terraform\nNice to have: GraphQL\nAbout us: a fintech startup")
+    assert terms["python"] == 1.5
+    assert terms["graphql"] == 0.75
+    assert terms["fintech"] == 0.25
+
+
+def test_colon_inside_a_sentence_is_not_a_heading():
+    terms = weights("Backend Engineer\nExperience with Go required: 5 years of Kubernetes")
+    assert terms[normalize_token("Kubernetes")] == 1.0
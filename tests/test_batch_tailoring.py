@@ -0,0 +1,60 @@
+"""A batch reports each job description's outcome in request order and one failure doesn't fail the rest"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+RESUME = "Jane Doe\n• Built Python services\n• Ran Docker deployments\n• Led migrations"
+JOB_DESCRIPTIONS = [
+    "Backend engineer with Python, Kubernetes and Terraform",
+    "Data engineer with Spark, Airflow and SQL",
+    "Platform engineer with Go and AWS",
+]
+
+
+def tailor(serve, job_descriptions, **form):
+    async def run():
+        async with serve() as client:
+            return await client.post("/api/tailor-resume/batch", data={
+                "resume_text": RESUME, "job_descriptions": job_descriptions, "ats_engine": "local", **form,
+            })
+
+    return asyncio.run(run())
+
+
+def test_a_failed_job_is_reported_in_place_and_the_rest_are_saved(serve, server, monkeypatch):
+    tailor_resume_with_ai = server.tailor_resume_with_ai
+
+    async def flaky(resume_text, job_description):
+        if "Spark" in job_description:
+            raise HTTPException(status_code=429, detail="LLM is busy")
+        if "Kubernetes" in job_description:
+            await asyncio.sleep(0.1)  # Finishes last but is still reported first
+        return await tailor_resume_with_ai(resume_text, job_description)
+
+    monkeypatch.setattr(server, "tailor_resume_with_ai", flaky)
+    response = tailor(serve, JOB_DESCRIPTIONS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert [result["success"] for result in body["results"]] == [True, False, True]
+    assert body["results"][1] == {"index": 1, "success": False, "status_code": 429, "error": "LLM is busy"}
+
+    async def saved():
+        return [await server.db.resume_analyses.find_one({"id": result["analysis_id"]})
+                for result in (body["results"][0], body["results"][2])]
+
+    first, third = asyncio.run(saved())
+    assert first["job_description_id"] == server.job_description_hash(JOB_DESCRIPTIONS[0])
+    assert third["job_description_id"] == server.job_description_hash(JOB_DESCRIPTIONS[2])
+
+
+@pytest.mark.parametrize("job_descriptions, detail", [
+    (["  ", ""], "At least one job description is required"),
+    (["Python engineer"] * 51, "At most 50 job descriptions per batch"),
+])
+def test_batch_size_is_limited(serve, job_descriptions, detail):
+    response = tailor(serve, job_descriptions)
+    assert (response.status_code, response.json()["detail"]) == (400, detail)
@@ -0,0 +1,39 @@
+"""Uploads are stored once by content hash and a blob is only deleted once no analysis references it"""
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from blob_store import ResumeBlobStore, content_hash  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+
+
+def test_identical_uploads_are_stored_once():
+    async def run():
+        db = LocalMongoClient().career_assistant
+        store = ResumeBlobStore(db.resume_blobs)
+        first, second = await store.put(b"PK resume"), await store.put(b"PK resume")
+        return first, second, await db.resume_blobs.count_documents({}), await store.get(first)
+
+    first, second, count, content = asyncio.run(run())
+    assert first == second == content_hash(b"PK resume")
+    assert (count, content) == (1, b"PK resume")
+
+
+def test_delete_unreferenced_keeps_blobs_an_analysis_still_uses():
+    async def run():
+        db = LocalMongoClient().career_assistant
+        store = ResumeBlobStore(db.resume_blobs)
+        upload, rendered, orphan = [await store.put(content) for content in (b"upload", b"rendered", b"orphan")]
+        await db.resume_analyses.insert_one({"id": "a1", "resume_id": upload, "rendered_docx_id": rendered})
+        deleted = [await store.delete_unreferenced(blob_id, db.resume_analyses)
+                   for blob_id in (upload, rendered, orphan, orphan)]
+        remaining = [await store.get(blob_id) for blob_id in (upload, rendered, orphan)]
+        return deleted, remaining
+
+    deleted, remaining = asyncio.run(run())
+    assert deleted == [False, False, True, False]
+    assert remaining == [b"upload", b"rendered", None]
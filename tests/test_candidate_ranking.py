@@ -0,0 +1,53 @@
+"""The sparse-matrix ranking must order candidates exactly as score_resume scores them"""
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from ats_scorer import Keyword, score_resume  # noqa: E402
+from candidate_ranking import (  # noqa: E402
+    build_term_matrix, candidate_term_rows, keyword_vocabulary, rank_candidates, shortlist,
+)
+
+KEYWORDS = [Keyword("python", "Python", 3.0), Keyword("kafka", "Kafka", 2.0), Keyword("graphql", "GraphQL", 1.0)]
+
+
+def test_shortlist_orders_by_weighted_score_and_keeps_ties_in_input_order():
+    # Rows: python+kafka, graphql, python, graphql (tie with row 1)
+    matrix = sparse.csr_matrix(np.array([
+        [1.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+        [1.0, 0.0, 0.0],
+        [0.0, 0.0, 1.0],
+    ]))
+    results = shortlist(["a", "b", "c", "d"], matrix, KEYWORDS)
+    assert [r["candidate_id"] for r in results] == ["a", "c", "b", "d"]
+    assert [r["score"] for r in results] == [83, 50, 17, 17]
+    assert results[0]["keyword_matches"] == ["Python", "Kafka"]
+    assert results[0]["missing_keywords"] == ["GraphQL"]
+    assert [r["rank"] for r in shortlist(["a", "b", "c", "d"], matrix, KEYWORDS, top_k=2)] == [1, 2]
+
+
+def test_matrix_rows_match_score_resume():
+    job_description = "Requirements:\nPython, Kafka and GraphQL"
+    candidates = [
+        ("skills-only", "Skills\nGraphQL"),
+        ("experienced", "Experience\nBuilt Python services on Kafka"),
+        ("none", "Experience\nSold insurance"),
+    ]
+    ranked = rank_candidates(job_description, candidates, chunk_size=2)
+    assert [r["candidate_id"] for r in ranked] == ["experienced", "skills-only", "none"]
+    for result in ranked:
+        text = dict(candidates)[result["candidate_id"]]
+        assert result["score"] == score_resume(text, job_description)["score"]
+
+
+def test_chunks_stack_into_one_matrix():
+    terms, _ = keyword_vocabulary(KEYWORDS)
+    chunks = [candidate_term_rows(["Python"], terms), candidate_term_rows(["Kafka", "GraphQL"], terms)]
+    assert build_term_matrix(chunks, len(terms)).shape == (3, 3)
+    assert build_term_matrix([], len(terms)).shape == (0, 3)
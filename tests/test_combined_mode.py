@@ -0,0 +1,66 @@
+"""Combined mode takes the tailored resume and ATS analysis from one reply, and falls back to two calls
+when the reply has no usable ATS analysis"""
+import asyncio
+import json
+
+import pytest
+
+from llm_cache import LlmResponseCache
+
+ANALYSIS = {
+    "score": 82,
+    "suggestions": ["Quantify the migration work"],
+    "keyword_matches": ["Python"],
+    "missing_keywords": ["Kubernetes"],
+}
+JOB_DESCRIPTION = "Backend engineer with Python and Kubernetes"
+
+
+@pytest.fixture
+def replies(server, monkeypatch):
+    """Answer each LLM stage with a canned reply and record the stages called, with an empty cache"""
+    canned, calls = {}, []
+
+    async def send_llm_message(chat, user_message, stage):
+        calls.append(stage)
+        return canned[stage]
+
+    monkeypatch.setattr(server, "send_llm_message", send_llm_message)
+    monkeypatch.setattr(server, "llm_cache", LlmResponseCache())
+    return canned, calls
+
+
+def tailor(server, resume_text):
+    return asyncio.run(server.run_tailoring_pipeline(resume_text, JOB_DESCRIPTION, "combined", "llm"))
+
+
+def test_combined_reply_is_parsed_from_a_fenced_json_object(server, replies):
+    canned, calls = replies
+    reply = {"tailored_resume": "Jane Doe\n• Built Python services", **ANALYSIS}
+    canned["llm_combined"] = f"```json\n{json.dumps(reply)}\n```"
+
+    tailored_resume, ats_analysis = tailor(server, "Jane Doe\n• Built services in Python")
+
+    assert calls == ["llm_combined"]
+    assert tailored_resume == "Jane Doe\n• Built Python services"
+    assert ats_analysis.dict() == ANALYSIS
+
+
+@pytest.mark.parametrize("reply", [
+    "Jane Doe\n• Built Python services",  # Plain text, no JSON at all
+    json.dumps({"tailored_resume": "Jane Doe\n• Built Python services"}),  # No ATS fields
+    json.dumps({"tailored_resume": "  ", **ANALYSIS}),
+])
+def test_reply_without_an_ats_analysis_falls_back_to_two_calls(server, replies, reply):
+    canned, calls = replies
+    canned.update({
+        "llm_combined": reply,
+        "llm_tailor": "Jane Doe\n• Built Python and Kubernetes services",
+        "llm_ats": json.dumps(ANALYSIS),
+    })
+
+    tailored_resume, ats_analysis = tailor(server, "Jane Doe\n• Built services in Python")
+
+    assert calls == ["llm_combined", "llm_tailor", "llm_ats"]
+    assert tailored_resume == "Jane Doe\n• Built Python and Kubernetes services"
+    assert ats_analysis.dict() == ANALYSIS
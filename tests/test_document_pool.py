@@ -0,0 +1,108 @@
+"""Small inputs run inline; a full pool answers 503, a slow task 504; a timed-out task keeps its slot
+and a crashed worker only resets the executor it ran in"""
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from document_pool import DocumentPool  # noqa: E402
+
+
+def pid():
+    return os.getpid()
+
+
+def slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def crash(seconds):
+    time.sleep(seconds)
+    os._exit(1)
+
+
+def rejected():
+    raise HTTPException(status_code=400, detail="Invalid DOCX file")
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = DocumentPool(start_method="fork", **{"max_workers": 1, "inline_threshold": 0, **kwargs})
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_small_inputs_and_a_disabled_pool_run_inline(make_pool):
+    assert asyncio.run(make_pool(inline_threshold=100).run(pid, size=10)) == os.getpid()
+    assert asyncio.run(make_pool(max_workers=0).run(pid, size=10_000)) == os.getpid()
+    assert asyncio.run(make_pool().run(pid, size=10_000)) != os.getpid()
+
+
+def test_worker_http_errors_are_reraised(make_pool):
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(make_pool().run(rejected))
+    assert (excinfo.value.status_code, excinfo.value.detail) == (400, "Invalid DOCX file")
+
+
+def test_full_pool_rejects_with_503(make_pool):
+    pool = make_pool(max_pending=1)
+
+    async def run():
+        busy = asyncio.ensure_future(pool.run(slow, 0.5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as excinfo:
+            await pool.run(slow, 0)
+        assert await busy == 0.5
+        return excinfo.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+
+
+def test_timed_out_task_holds_its_slot_until_the_worker_finishes(make_pool):
+    pool = make_pool(task_timeout=0.1)
+
+    async def run():
+        with pytest.raises(HTTPException) as excinfo:
+            await pool.run(slow, 0.5)
+        assert excinfo.value.status_code == 504
+        assert pool.pending == 1
+        await asyncio.sleep(1)
+        assert pool.pending == 0
+
+    asyncio.run(run())
+
+
+def test_a_late_crash_does_not_shut_down_the_replacement_executor(make_pool):
+    pool = make_pool()
+
+    async def run():
+        crashing = asyncio.ensure_future(pool.run(crash, 0.3))
+        await asyncio.sleep(0.1)
+        # Another caller already replaced the executor while this task was running
+        broken, pool._executor = pool._executor, ProcessPoolExecutor(max_workers=1)
+        replacement = pool._executor
+        with pytest.raises(HTTPException) as excinfo:
+            await crashing
+        broken.shutdown(wait=False)
+        assert excinfo.value.status_code == 503
+        assert pool._executor is replacement
+        assert await pool.run(pid) != os.getpid()
+
+    asyncio.run(run())
@@ -0,0 +1,78 @@
+"""The XML-patching renderer must match the python-docx renderer and leave other parts untouched"""
+import io
+import os
+import struct
+import sys
+import zipfile
+import zlib
+
+import pytest
+from docx import Document
+from docx.shared import Inches
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from docx_patch import patch_tailored_docx, rewrite_paragraphs  # noqa: E402
+from formatting_test import FormattingTester  # noqa: E402
+
+
+def png_1x1():
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(b"\x00\xff\xff\xff")) + chunk(b"IEND", b""))
+
+
+@pytest.fixture(scope="module")
+def rich_docx():
+    doc = Document(io.BytesIO(FormattingTester().create_richly_formatted_docx()))
+    doc.add_picture(io.BytesIO(png_1x1()), width=Inches(1))
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def tailored_text(docx_bytes):
+    lines = [p.text.strip() for p in Document(io.BytesIO(docx_bytes)).paragraphs if p.text.strip()]
+    return '\n'.join(line.replace('Python', 'Python 3.12').replace('25%', '30%') for line in lines)
+
+
+def render_with_python_docx(docx_bytes, text):
+    doc = Document(io.BytesIO(docx_bytes))
+    rewrite_paragraphs(doc.element.body, text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_document_part_matches_python_docx(rich_docx):
+    text = tailored_text(rich_docx)
+    patched = patch_tailored_docx(rich_docx, text)
+    expected = render_with_python_docx(rich_docx, text)
+
+    with zipfile.ZipFile(io.BytesIO(patched)) as out, zipfile.ZipFile(io.BytesIO(expected)) as ref:
+        assert out.testzip() is None
+        assert out.read('word/document.xml') == ref.read('word/document.xml')
+    assert 'Python 3.12' in '\n'.join(p.text for p in Document(io.BytesIO(patched)).paragraphs)
+
+
+def test_other_parts_are_copied_verbatim(rich_docx):
+    patched = patch_tailored_docx(rich_docx, tailored_text(rich_docx))
+
+    with zipfile.ZipFile(io.BytesIO(rich_docx)) as src, zipfile.ZipFile(io.BytesIO(patched)) as out:
+        assert out.namelist() == src.namelist()
+        for info in out.infolist():
+            if info.filename == 'word/document.xml':
+                continue
+            original = src.getinfo(info.filename)
+            assert (info.CRC, info.compress_type, info.compress_size, info.date_time) == (
+                original.CRC, original.compress_type, original.compress_size, original.date_time
+            )
+        assert any(name.startswith('word/media/') for name in out.namelist())
+
+
+def test_unsupported_input_falls_back():
+    assert patch_tailored_docx(b'not a zip', 'text') is None
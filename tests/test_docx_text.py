@@ -0,0 +1,98 @@
+"""The streaming extractor must return exactly what python-docx does, or None to ask for the fallback"""
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from docx_text import extract_paragraph_text  # noqa: E402
+
+
+def python_docx_text(docx_bytes):
+    paragraphs = Document(io.BytesIO(docx_bytes)).paragraphs
+    return '\n'.join(p.text for p in paragraphs if p.text.strip())
+
+
+def save(doc):
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def add_hyperlink(paragraph, text):
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("w:anchor"), "contact")
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+@pytest.fixture(scope="module")
+def resume_docx():
+    doc = Document()
+    doc.add_heading("Jane Doe", level=1)
+    doc.add_paragraph("Engineer\tLondon\t2019 – 2024")
+    bullet = doc.add_paragraph("Built ", style="List Bullet")
+    bullet.add_run("payment APIs").bold = True
+    bullet.add_run(" in Python")
+    broken = doc.add_paragraph("Line one")
+    broken.runs[0].add_break()
+    broken.add_run("line two")
+    broken.runs[-1].add_break(WD_BREAK.PAGE)
+    broken.add_run("after a page break")
+    hyphen = doc.add_paragraph().add_run("e")
+    hyphen._r.append(OxmlElement("w:noBreakHyphen"))
+    hyphen._r.append(OxmlElement("w:cr"))
+    hyphen.add_text("mail")
+    add_hyperlink(doc.add_paragraph("Portfolio: "), "jane.example.com")
+    doc.add_paragraph("   ")
+    doc.add_paragraph("")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Skills in a table"
+    table.cell(0, 1).text = "are not body paragraphs"
+    doc.add_paragraph("Education")
+    return save(doc)
+
+
+def test_matches_python_docx_on_tabs_breaks_hyperlinks_and_tables(resume_docx):
+    text = extract_paragraph_text(resume_docx)
+    assert text == python_docx_text(resume_docx)
+    assert "Engineer\tLondon" in text
+    assert "Line one\nline two" in text
+    assert "e-\nmail" in text
+    assert "Portfolio: jane.example.com" in text
+    assert "Skills in a table" not in text
+
+
+def rewrite(docx_bytes, name, replace):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as source, zipfile.ZipFile(buffer, "w") as target:
+        for item in source.infolist():
+            data = source.read(item)
+            target.writestr(item, replace(data) if item.filename == name else data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("name,replace", [
+    # A macro-enabled template, which python-docx refuses to open
+    ("[Content_Types].xml", lambda xml: xml.replace(b"document.main+xml", b"template.macroEnabledTemplate.main+xml")),
+    ("word/document.xml", lambda xml: xml.replace(b"<w:body>", b"<w:bodyx>").replace(b"</w:body>", b"</w:bodyx>")),
+    ("word/document.xml", lambda xml: xml[:len(xml) // 2]),
+])
+def test_unusual_documents_fall_back(resume_docx, name, replace):
+    assert extract_paragraph_text(rewrite(resume_docx, name, replace)) is None
+
+
+def test_non_zip_input_falls_back():
+    assert extract_paragraph_text(b"not a docx") is None
@@ -0,0 +1,74 @@
+"""Downloads are served from memory, rendered once per analysis and revalidated with the rendered blob's ETag"""
+import asyncio
+import io
+
+from docx import Document
+
+from blob_store import content_hash
+
+JOB_DESCRIPTION = "Backend engineer with Python, Kubernetes and Terraform"
+
+
+def resume_docx() -> bytes:
+    document = Document()
+    for text in ("Jane Doe", "• Built Python services", "• Ran Docker deployments", "• Led migrations"):
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def tailored_analysis(client) -> str:
+    upload = (await client.post("/api/upload-resume", files={"file": ("resume.docx", resume_docx())})).json()
+    tailored = await client.post("/api/tailor-resume", data={
+        "resume_text": upload["text"], "job_description": JOB_DESCRIPTION,
+        "resume_id": upload["resume_id"], "ats_engine": "local",
+    })
+    return tailored.json()["analysis_id"]
+
+
+def test_repeat_downloads_are_not_modified(serve):
+    async def run():
+        async with serve() as client:
+            url = f"/api/download-resume/{await tailored_analysis(client)}"
+            first = await client.get(url)
+            etag = first.headers["ETag"]
+            revalidated = [await client.get(url, headers={"If-None-Match": value})
+                           for value in (etag, f"W/{etag}", f'"stale", {etag}', '"stale"')]
+            return first, revalidated
+
+    first, (same, weak, listed, stale) = asyncio.run(run())
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "private, no-cache"
+    assert first.headers["ETag"] == f'"{content_hash(first.content)}"'
+    assert [response.status_code for response in (same, weak, listed)] == [304, 304, 304]
+    assert same.content == b"" and same.headers["ETag"] == first.headers["ETag"]
+    assert stale.status_code == 200 and stale.content == first.content
+
+
+def test_downloads_are_served_from_memory(serve, server, monkeypatch):
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("downloads must not write temporary files")
+
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", no_temp_files)
+    monkeypatch.setattr("tempfile.mkstemp", no_temp_files)
+
+    async def run():
+        async with serve() as client:
+            analysis_id = await tailored_analysis(client)
+            first = await client.get(f"/api/download-resume/{analysis_id}")
+            # Losing the stored render only costs a re-render
+            analysis = await server.db.resume_analyses.find_one({"id": analysis_id})
+            await server.db.resume_blobs.delete_one({"_id": analysis["rendered_docx_id"]})
+            rendered_again = await client.get(f"/api/download-resume/{analysis_id}")
+            missing = await client.get("/api/download-resume/unknown")
+            return analysis_id, first, rendered_again, missing
+
+    analysis_id, first, rendered_again, missing = asyncio.run(run())
+    assert first.status_code == 200
+    assert first.headers["Content-Length"] == str(len(first.content))
+    assert first.headers["Content-Disposition"] == f'attachment; filename="tailored_resume_{analysis_id[:8]}.docx"'
+    paragraphs = [p.text for p in Document(io.BytesIO(first.content)).paragraphs]
+    assert paragraphs[:3] == ["Jane Doe", "• Built Python services", "• Ran Docker deployments"]
+    assert paragraphs[3].startswith("• Led migrations, applying ")
+    assert (rendered_again.status_code, rendered_again.content) == (200, first.content)
+    assert missing.status_code == 404
@@ -0,0 +1,48 @@
+"""Resolved job descriptions are persisted and stamped as used, even when served from memory"""
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from job_descriptions import JobDescriptionStore, job_description_hash  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+from text_compression import decompress_fields  # noqa: E402
+
+JOB_DESCRIPTION = "Backend Engineer\n\nRequirements:\n- Python and Kafka"
+
+
+def test_memory_hits_write_back_a_deleted_record():
+    async def run():
+        collection = LocalMongoClient().career_assistant.job_descriptions
+        store = JobDescriptionStore(collection)
+        first = await store.resolve(JOB_DESCRIPTION)
+        stored = await collection.find_one({"_id": first.id})
+        # The orphan sweep deletes it while this worker still has it cached
+        await collection.delete_many({})
+        again = await store.resolve(JOB_DESCRIPTION)
+        return first, stored, again, await collection.find_one({"_id": first.id})
+
+    first, stored, again, restored = asyncio.run(run())
+    assert again == first and first.id == job_description_hash(JOB_DESCRIPTION)
+    assert restored is not None
+    assert decompress_fields(restored, ("text",))["text"] == JOB_DESCRIPTION
+    assert restored["keywords"] == stored["keywords"]
+    assert restored["feature_version"] == stored["feature_version"]
+    assert restored["last_used_at"] >= stored["last_used_at"]
+
+
+def test_every_resolve_refreshes_last_used_at():
+    async def run():
+        collection = LocalMongoClient().career_assistant.job_descriptions
+        record = await JobDescriptionStore(collection).resolve(JOB_DESCRIPTION)
+        await collection.update_one({"_id": record.id}, {"$set": {"last_used_at": "2000-01-01T00:00:00+00:00"}})
+        # A second worker, with nothing cached, reads the stored record
+        await JobDescriptionStore(collection).resolve(JOB_DESCRIPTION)
+        return await collection.find_one({"_id": record.id})
+
+    doc = asyncio.run(run())
+    assert doc["last_used_at"] > "2000-01-01T00:00:00+00:00"
+    assert doc["created_at"] <= doc["last_used_at"]
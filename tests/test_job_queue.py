@@ -0,0 +1,88 @@
+"""Stopping the queue hands running jobs back, a finished job's result is not lost to a store blip,
+and finished jobs expire after the retention period"""
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from job_queue import JOB_DONE, JOB_FAILED, JOB_QUEUED, InMemoryJobStore, JobQueue  # noqa: E402
+
+
+def test_stop_requeues_running_jobs():
+    started = asyncio.Event()
+
+    async def handler(payload):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def run():
+        store = InMemoryJobStore()
+        queue = JobQueue(store, handler, concurrency=1, poll_seconds=0.01)
+        job = await queue.submit({})
+        queue.start()
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await queue.stop()
+        return await store.get(job["id"]), await queue.stats()
+
+    job, stats = asyncio.run(run())
+    assert job["status"] == JOB_QUEUED
+    assert job["attempts"] == 0
+    assert stats == {"queued": 1, "running": 0, "done": 0, "failed": 0}
+
+
+class FlakyFinishStore(InMemoryJobStore):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    async def finish(self, job_id, status, **fields):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store unavailable")
+        await super().finish(job_id, status, **fields)
+
+
+def test_result_is_recorded_once_the_store_recovers():
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload)
+        return "tailored"
+
+    async def run():
+        store = FlakyFinishStore(failures=2)
+        queue = JobQueue(store, handler, concurrency=0, poll_seconds=0.01)
+        job = await queue.submit({})
+        await queue.run_next()
+        return await store.get(job["id"])
+
+    job = asyncio.run(run())
+    assert len(calls) == 1
+    assert (job["status"], job["result"]) == (JOB_DONE, "tailored")
+
+
+def test_finished_jobs_expire_after_the_retention_period():
+    async def handler(payload):
+        if payload.get("fail"):
+            raise ValueError("bad resume")
+        return "tailored"
+
+    async def run():
+        store = InMemoryJobStore()
+        kept = JobQueue(store, handler, concurrency=0, retention_seconds=0)
+        brief = JobQueue(store, handler, concurrency=0, retention_seconds=0.05)
+        forever = await kept.submit({})
+        await kept.run_next()
+        done, failed = await brief.submit({}), await brief.submit({"fail": True})
+        await brief.run_next()
+        await brief.run_next()
+        finished = [(await store.get(job["id"]))["status"] for job in (done, failed)]
+        await asyncio.sleep(0.1)
+        return finished, await store.get(done["id"]), await store.get(failed["id"]), await store.get(forever["id"])
+
+    finished, done, failed, forever = asyncio.run(run())
+    assert finished == [JOB_DONE, JOB_FAILED]
+    assert done is None and failed is None
+    assert forever["status"] == JOB_DONE and forever["expires_at"] is None
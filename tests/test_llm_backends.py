@@ -0,0 +1,69 @@
+"""The fake LLM backend must answer each prompt kind in the shape server.py parses"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from llm_backends import FakeLlmBackend, LatencyDistribution, load_llm_backend  # noqa: E402
+
+PROMPT = """Please tailor this resume for the following job description:
+
+JOB DESCRIPTION:
+Backend engineer with Python, Kubernetes and Terraform
+
+ORIGINAL RESUME:
+Jane Doe
+• Built Python services
+• Ran Docker deployments
+• Led migrations
+
+Please rewrite the resume to better match the job requirements."""
+
+
+def ask(system_message: str, backend=None) -> str:
+    backend = backend or FakeLlmBackend(latency="fixed:0", tokens_per_second=0)
+    chat = backend.chat("session", system_message)
+    return asyncio.run(chat.send_message(backend.message(PROMPT)))
+
+
+def test_tailor_response_keeps_resume_lines():
+    lines = ask("Return only the tailored resume text without any additional commentary.").split("\n")
+    assert lines[0] == "Jane Doe"
+    assert len(lines) == 4
+    assert lines[1] == "• Built Python services"
+    assert lines[3].startswith("• Led migrations, applying ")
+
+
+def test_ats_response_is_analysis_json():
+    analysis = json.loads(ask('Provide your response in the following JSON format: {"score": 85}'))
+    assert set(analysis) == {"score", "suggestions", "keyword_matches", "missing_keywords"}
+    assert "python" in analysis["keyword_matches"]
+    assert "kubernetes" in analysis["missing_keywords"]
+
+
+def test_combined_response_is_fenced_json_with_tailored_resume():
+    response = ask('{"tailored_resume": "...", "score": 85}')
+    assert response.startswith("```json\n")
+    assert json.loads(response[len("```json\n"):-len("\n```")])["tailored_resume"].startswith("Jane Doe")
+
+
+def test_invalid_json_rate_breaks_structured_responses():
+    backend = FakeLlmBackend(latency="fixed:0", tokens_per_second=0, invalid_json_rate=1.0)
+    with pytest.raises(ValueError):
+        json.loads(ask('{"score": 85}', backend))
+
+
+@pytest.mark.parametrize("spec", ["fixed", "uniform:1", "lognormal:a:b", "gamma:1:2", "fixed:-1"])
+def test_invalid_latency_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse(spec)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_llm_backend("gpt-local")
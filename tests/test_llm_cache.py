@@ -0,0 +1,104 @@
+"""Cache keys ignore incidental whitespace but never line structure; concurrent misses share one call"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from llm_cache import LlmResponseCache  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+
+RESUME = "Jane Doe\nSenior Engineer\n• Built payment APIs in Python"
+
+
+def key(resume_text, job_description="Python"):
+    return LlmResponseCache.key("tailor", resume_text, job_description, "system", "model")
+
+
+def test_whitespace_within_lines_and_blank_lines_share_a_key():
+    assert key("  Jane   Doe \r\n\nSenior\tEngineer\n• Built payment APIs in Python\n") == key(RESUME)
+
+
+def test_line_breaks_are_part_of_the_key():
+    assert key(RESUME.replace("\n", " ")) != key(RESUME)
+    assert key("Jane Doe Senior\nEngineer\n• Built payment APIs in Python") != key(RESUME)
+    assert key(RESUME, "Requirements:\nPython") != key(RESUME, "Requirements: Python")
+
+
+class Compute:
+    """Counts calls; each one waits for ``release`` before replying"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"reply {self.calls}"
+
+
+def test_hits_come_from_memory_then_from_the_shared_tier():
+    async def run():
+        collection = LocalMongoClient().career_assistant.llm_cache
+        compute = Compute()
+        compute.release.set()
+        first = LlmResponseCache(collection)
+        values = [await first.get_or_compute("k", compute), await first.get_or_compute("k", compute)]
+        # Another worker finds the reply in Mongo
+        other = LlmResponseCache(collection)
+        values.append(await other.get_or_compute("k", compute))
+        return values, compute.calls, first.snapshot(), other.snapshot()
+
+    values, calls, first, other = asyncio.run(run())
+    assert values == ["reply 1"] * 3 and calls == 1
+    assert (first["misses"], first["memory_hits"], other["shared_hits"]) == (1, 1, 1)
+
+
+def test_concurrent_misses_share_one_call():
+    async def run():
+        cache, compute = LlmResponseCache(), Compute()
+        callers = [asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        compute.release.set()
+        return await asyncio.gather(*callers), compute.calls, cache.snapshot()["coalesced"]
+
+    assert asyncio.run(run()) == (["reply 1"] * 3, 1, 2)
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def run():
+        cache, compute = LlmResponseCache(), Compute(error=ValueError("provider down"))
+        callers = [asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+        compute.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        compute.error = None
+        return results, await cache.get_or_compute("k", compute)
+
+    results, retried = asyncio.run(run())
+    assert [str(result) for result in results] == ["provider down"] * 2
+    assert retried == "reply 2"
+
+
+def test_a_waiter_takes_over_when_the_computing_caller_is_cancelled():
+    async def run():
+        cache, compute = LlmResponseCache(), Compute()
+        owner = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        compute.release.set()
+        return await asyncio.gather(*waiters), compute.calls
+
+    assert asyncio.run(run()) == (["reply 2", "reply 2"], 2)
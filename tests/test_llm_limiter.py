@@ -0,0 +1,54 @@
+"""Timeouts and cancellations while waiting for an LLM slot must never leak the slot"""
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from llm_limiter import LlmLimiter  # noqa: E402
+
+
+def limiter(**kwargs):
+    return LlmLimiter(**{"max_in_flight": 1, "requests_per_minute": 0, "max_queue": 4, **kwargs})
+
+
+def test_timeout_racing_the_grant_keeps_the_slot(monkeypatch):
+    async def granted_then_timed_out(aw, timeout):
+        await aw
+        raise asyncio.TimeoutError
+
+    async def run():
+        limits = limiter()
+        monkeypatch.setattr(asyncio, "wait_for", granted_then_timed_out)
+        await limits.acquire()
+        assert limits.in_flight == 1
+        limits.release(0.1)
+        monkeypatch.undo()
+        async with limits.slot():
+            pass
+        return limits
+
+    assert asyncio.run(run()).snapshot()["in_flight"] == 0
+
+
+def test_timed_out_and_cancelled_waiters_leave_the_slot_usable():
+    async def run():
+        limits = limiter(queue_timeout=0.05)
+        async with limits.slot():
+            with pytest.raises(HTTPException) as excinfo:
+                await limits.acquire()
+            assert excinfo.value.status_code == 429
+            waiter = asyncio.ensure_future(limits.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        await asyncio.wait_for(limits.acquire(), timeout=1)
+        return limits.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert (snapshot["in_flight"], snapshot["queue_depth"], snapshot["rejected"]) == (1, 0, 1)
@@ -0,0 +1,71 @@
+"""Metrics must render valid Prometheus text: cumulative buckets, escaped labels, route templates"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from metrics import HTTP_REQUEST_SECONDS, STAGE_ERRORS, MetricsMiddleware, MetricsRegistry, stage_timer  # noqa: E402
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "parse")
+
+    lines = registry.render().splitlines()
+    assert 'stage_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'stage_seconds_sum{stage="parse"} 6.05' in lines
+    assert 'stage_seconds_count{stage="parse"} 4' in lines
+    assert lines[:2] == ["# HELP stage_seconds Stage latency", "# TYPE stage_seconds histogram"]
+
+
+def test_counter_escapes_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Errors", ("reason",))
+    counter.inc('bad "quote"\n')
+    counter.inc('bad "quote"\n', amount=2)
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 3' in registry.render().splitlines()
+
+
+def test_duplicate_metric_names_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests")
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests")
+
+
+def test_stage_timer_counts_errors():
+    before = STAGE_ERRORS.value("test_stage")
+    with pytest.raises(RuntimeError):
+        with stage_timer("test_stage"):
+            raise RuntimeError("boom")
+    assert STAGE_ERRORS.value("test_stage") == before + 1
+
+
+def test_middleware_labels_by_route_template():
+    class Route:
+        path = "/api/items/{item_id}"
+
+    async def app(scope, receive, send):
+        await receive()
+        scope["route"] = Route()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"hello"})
+
+    async def receive():
+        return {"type": "http.request", "body": b"abc", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/api/items/42"}
+    before = HTTP_REQUEST_SECONDS.count("GET", "/api/items/{item_id}", "200")
+    asyncio.run(MetricsMiddleware(app)(scope, receive, send))
+    assert HTTP_REQUEST_SECONDS.count("GET", "/api/items/{item_id}", "200") == before + 1
@@ -0,0 +1,62 @@
+"""Only requests presenting the profile token are profiled, and their profile is stored by id"""
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from profiling import ProfilingMiddleware, RequestProfiler  # noqa: E402
+
+
+async def slow_app(scope, receive, send):
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(1000))  # Busy on the event loop, as blocking work would be
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(profiler, headers, path="/api/tailor-resume"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    asyncio.run(ProfilingMiddleware(slow_app, profiler)(scope, receive, send))
+    return dict(sent[0]["headers"])
+
+
+def test_token_request_is_profiled(tmp_path):
+    profiler = RequestProfiler(token="secret", profile_dir=str(tmp_path), interval_ms=1)
+    profile_id = call(profiler, [(b"x-profile-token", b"secret")])[b"x-profile-id"].decode()
+
+    profile = profiler.load(profile_id)
+    assert profile["status"] == 200 and profile["samples"] > 0
+    assert any(stack.startswith("[request]") and "slow_app" in stack for stack in profile["folded"])
+    assert "peak_kb" in profile["memory"]
+    assert [entry["id"] for entry in profiler.list_profiles()] == [profile_id]
+
+
+def test_wrong_token_and_admin_paths_are_not_profiled(tmp_path):
+    profiler = RequestProfiler(token="secret", profile_dir=str(tmp_path), interval_ms=1)
+    assert b"x-profile-id" not in call(profiler, [(b"x-profile-token", b"guess")])
+    assert b"x-profile-id" not in call(profiler, [(b"x-profile-token", b"secret")], path="/api/admin/profiles")
+    assert profiler.list_profiles() == []
+
+
+def test_non_ascii_tokens_are_rejected_not_errors(tmp_path):
+    profiler = RequestProfiler(token="secret", profile_dir=str(tmp_path), interval_ms=1)
+    assert not profiler.authorized("é")
+    assert b"x-profile-id" not in call(profiler, [(b"x-profile-token", "é".encode("latin-1"))])
+    assert RequestProfiler(token="sécret", profile_dir=str(tmp_path)).authorized("sécret")
+
+
+def test_profile_ids_cannot_escape_the_directory(tmp_path):
+    profiler = RequestProfiler(token="secret", profile_dir=str(tmp_path))
+    assert profiler.load("../../etc/passwd") is None
@@ -0,0 +1,89 @@
+"""Stored text must round-trip through the preset dictionary, and published dictionaries must never change"""
+import asyncio
+import base64
+import hashlib
+import os
+import sys
+import zlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import text_compression  # noqa: E402
+from local_mongo import LocalMongoClient  # noqa: E402
+from text_compression import (  # noqa: E402
+    DICTIONARIES, compress_fields, compress_text, decompress_fields, decompress_text,
+)
+
+RESUME = ("Jane Doe | Email: jane@gmail.com\nProfessional Summary\nSenior Software Engineer with 8 years "
+          "of experience\nProfessional Experience\n• Developed REST APIs in Python and Go\n"
+          "• Led a team of engineers, resulting in a 30% reduction in latency\n") * 3
+
+# A record written with dictionary version 1; it must decompress for as long as such records exist
+STORED_V1 = "WgF4+Y0FA7DDEbNoDkSUqUBjocU6yDr3fLjTEzFTMwBBvCHR"
+STORED_V1_TEXT = "Professional Experience\n• Developed REST APIs in Python and Go\n• Led a team of engineers"
+
+
+def test_published_dictionaries_are_unchanged():
+    assert hashlib.sha256(DICTIONARIES[1]).hexdigest() == \
+        "1cf189e92ce9f3144a89642c6e8840bd728ab1921beb3790d275e9c8473194c7"
+    assert decompress_text(base64.b64decode(STORED_V1)) == STORED_V1_TEXT
+
+
+def test_round_trip_with_the_preset_dictionary():
+    stored = compress_text(RESUME)
+    assert stored[:2] == b"Z\x01"
+    assert decompress_text(stored) == RESUME
+    assert len(stored) < len(zlib.compress(RESUME.encode("utf-8"), 9))
+    with pytest.raises(zlib.error):
+        zlib.decompress(stored[2:])  # Useless without the dictionary
+    with pytest.raises(ValueError):
+        decompress_text(b"Z\x09" + stored[2:])
+
+
+def test_short_and_non_text_fields_are_stored_as_is(monkeypatch):
+    doc = {"id": "a1", "original_text": "Jane Doe", "job_description": None, "tailored_resume": RESUME}
+    stored = compress_fields(doc)
+    assert stored["original_text"] == "Jane Doe" and stored["job_description"] is None
+    assert isinstance(stored["tailored_resume"], bytes)
+    assert doc["tailored_resume"] == RESUME  # The caller's document is not modified
+    monkeypatch.setenv("TEXT_COMPRESSION", "false")
+    assert compress_fields(doc) == doc
+
+
+def test_legacy_uncompressed_documents_decompress_unchanged():
+    legacy = {"id": "a1", "original_text": RESUME, "tailored_resume": "Jane Doe"}
+    assert decompress_fields(dict(legacy)) == legacy
+    assert decompress_fields(None) is None
+    mixed = {**legacy, "tailored_resume": compress_text(RESUME)}
+    assert decompress_fields(mixed, ("tailored_resume",))["tailored_resume"] == RESUME
+
+
+def test_migrate_cli_is_idempotent(monkeypatch, capsys):
+    client = LocalMongoClient()
+    db = client.career_assistant
+    docx = b"PK\x03\x04 resume"
+    asyncio.run(db.resume_analyses.insert_many([
+        {"id": "a1", "original_text": RESUME, "job_description": "Python", "tailored_resume": RESUME},
+        {"id": "a2", "original_text": "Jane Doe", "original_docx_content": base64.b64encode(docx).decode()},
+        compress_fields({"id": "a3", "original_text": RESUME}),
+    ]))
+    monkeypatch.setattr("motor.motor_asyncio.AsyncIOMotorClient", lambda *args, **kwargs: client)
+
+    assert text_compression.main(["migrate", "--batch-size", "1"]) == 0
+    first = capsys.readouterr().out
+    assert text_compression.main(["migrate"]) == 0
+    second = capsys.readouterr().out
+
+    assert first.startswith("scanned 2, updated 2;") and "moved 1 inline DOCX" in first
+    # Short text stays a string, so a re-run scans those records again but changes nothing
+    assert second.startswith("scanned 2, updated 0;") and "moved 0 inline DOCX" in second
+    docs = {doc["id"]: doc for doc in asyncio.run(db.resume_analyses.find({}).to_list(length=None))}
+    assert isinstance(docs["a1"]["original_text"], bytes) and docs["a1"]["job_description"] == "Python"
+    assert decompress_fields(docs["a1"])["tailored_resume"] == RESUME
+    assert "original_docx_content" not in docs["a2"]
+    blob = asyncio.run(db.resume_blobs.find_one({"_id": docs["a2"]["resume_id"]}))
+    assert bytes(blob["content"]) == docx
@@ -0,0 +1,151 @@
+"""Spans nest through awaits, continue the caller's traceparent and end up in the JSONL files"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from job_queue import InMemoryJobStore, JobQueue  # noqa: E402
+from tracing import (  # noqa: E402
+    NOOP_SPAN, JsonlSpanExporter, Tracer, TracingMiddleware, parse_traceparent, read_spans, slow_request_causes, span,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, record):
+        self.spans.append(record)
+
+    def shutdown(self):
+        pass
+
+
+def by_name(exporter):
+    return {record["name"]: record for record in exporter.spans}
+
+
+async def app(scope, receive, send):
+    with span("llm.call", stage="llm_tailor") as call_span:
+        await asyncio.sleep(0)
+        call_span.set(response_chars=42)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(tracer, headers):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/api/tailor-resume", "headers": headers}
+    asyncio.run(TracingMiddleware(app, tracer)(scope, receive, send))
+    return dict(sent[0]["headers"])
+
+
+@pytest.mark.parametrize("value", [None, "", "garbage", f"01-{TRACE_ID}-00f067aa0ba902b7-01",
+                                   f"00-{'0' * 32}-00f067aa0ba902b7-01", f"00-{TRACE_ID}-{'0' * 16}-01"])
+def test_invalid_traceparents_are_ignored(value):
+    assert parse_traceparent(value) is None
+
+
+def test_request_continues_incoming_trace():
+    exporter = ListExporter()
+    headers = call(Tracer(enabled=True, exporter=exporter), [(b"traceparent", TRACEPARENT.encode())])
+
+    spans = by_name(exporter)
+    root, child = spans["POST /api/tailor-resume"], spans["llm.call"]
+    assert root["trace_id"] == child["trace_id"] == TRACE_ID
+    assert root["parent_id"] == "00f067aa0ba902b7"
+    assert child["parent_id"] == root["span_id"]
+    assert child["attributes"] == {"stage": "llm_tailor", "response_chars": 42}
+    assert root["attributes"]["http.status_code"] == 200
+    assert headers[b"traceparent"].decode() == f"00-{TRACE_ID}-{root['span_id']}-01"
+
+
+def test_disabled_or_unsampled_requests_record_nothing():
+    exporter = ListExporter()
+    assert b"traceparent" not in call(Tracer(enabled=False, exporter=exporter), [])
+    call(Tracer(enabled=True, sample_rate=0.0, exporter=exporter), [])
+    assert exporter.spans == []
+
+
+def test_server_samples_regardless_of_the_callers_flag():
+    exporter = ListExporter()
+    # A client can't force tracing with flags 01...
+    call(Tracer(enabled=True, sample_rate=0.0, exporter=exporter), [(b"traceparent", TRACEPARENT.encode())])
+    assert exporter.spans == []
+    # ...and flags 00 (what the frontend sends) leave the decision to the server
+    call(Tracer(enabled=True, exporter=exporter), [(b"traceparent", TRACEPARENT[:-2].encode() + b"00")])
+    assert by_name(exporter)["POST /api/tailor-resume"]["trace_id"] == TRACE_ID
+
+
+def test_errors_are_recorded_and_raised():
+    exporter = ListExporter()
+    tracer = Tracer(enabled=True, exporter=exporter)
+    with pytest.raises(ValueError):
+        with tracer.start_trace("job"):
+            with span("docx.render"):
+                raise ValueError("bad docx")
+    assert [(record["name"], record["status"]) for record in exporter.spans] == [
+        ("docx.render", "error"), ("job", "error")
+    ]
+    assert exporter.spans[0]["error"] == "ValueError: bad docx"
+
+
+def test_span_outside_a_trace_is_a_noop():
+    with span("llm.call") as outside:
+        assert outside is NOOP_SPAN
+
+
+def test_job_runs_join_the_submitting_trace():
+    exporter = ListExporter()
+    seen = []
+
+    async def handler(payload):
+        with span("tailor.pipeline"):
+            seen.append(payload["resume_text"])
+
+    async def run():
+        # The job continues a trace this server sampled, whatever the sample rate
+        queue = JobQueue(InMemoryJobStore(), handler, kind="tailor_resume", concurrency=0,
+                         tracer=Tracer(enabled=True, sample_rate=0.0, exporter=exporter))
+        await queue.submit({"resume_text": "resume", "traceparent": TRACEPARENT})
+        await queue.run_next()
+
+    asyncio.run(run())
+    spans = by_name(exporter)
+    assert seen == ["resume"]
+    assert spans["job tailor_resume"]["trace_id"] == TRACE_ID
+    assert spans["job tailor_resume"]["attributes"]["job.attempts"] == 1
+    assert spans["tailor.pipeline"]["parent_id"] == spans["job tailor_resume"]["span_id"]
+
+
+def test_exporter_writes_jsonl_and_slow_requests_are_attributed(tmp_path):
+    exporter = JsonlSpanExporter(str(tmp_path), flush_seconds=0.01)
+    tracer = Tracer(enabled=True, exporter=exporter)
+    for stage in ("llm_tailor", "llm_ats"):
+        with tracer.start_trace("POST /api/tailor-resume"):
+            with span("ats.score"):
+                with span("llm.call", **{"llm.stage": stage}):
+                    pass
+    tracer.shutdown()
+
+    [path] = list(tmp_path.iterdir())
+    lines = path.read_text().splitlines()
+    assert len(lines) == 6 and all(json.loads(line)["trace_id"] for line in lines)
+    causes = slow_request_causes(read_spans([str(path)]), fraction=0.0)
+    assert sum(causes["POST /api/tailor-resume"].values()) == 2
+    assert set(causes["POST /api/tailor-resume"]) <= {"llm.call [llm_tailor]", "llm.call [llm_ats]"}